@@ -0,0 +1,410 @@
+"""
+bench_routes.py
+Benchmarks do gerador de rotas (pet_routes.py), sem planilha e sem rede.
+
+  python bench_routes.py pipeline [--rows 1000 100000 1000000] [--jobs N] [--json saida.json]
+      Grava uma matriz sintética de rotas (mesmas colunas da planilha) como
+      snapshot e roda o build() de verdade sobre ela, completo e depois
+      incremental, sem push: tempo por etapa (BuildMetrics), linhas/s, bytes
+      gerados e pico de RSS. Cada tamanho roda num processo separado; um
+      tamanho que não cabe no disco do TMPDIR é pulado com aviso.
+      --baseline arquivo.json compara com uma execução anterior.
+
+  python bench_routes.py records [--rows 200000]
+      Memória e custo de acesso para manter as rotas: dicts da planilha,
+      list[Route] e a RouteTable em colunas.
+
+  python bench_routes.py template [--rows 2000] [--rev e3c1187]
+      Compara o template pré-compilado (PageTemplate + write_buffers) com o
+      generate_html() em f-string da revisão --rev (lido do git): tempo e
+      pico de memória por página.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import contextlib
+import tempfile
+import itertools
+import tracemalloc
+import multiprocessing
+
+import pet_routes as gr
+
+# ══════════════════════════════════════════════════════════════════════════════
+# MATRIZ SINTÉTICA DE ROTAS
+# ══════════════════════════════════════════════════════════════════════════════
+COUNTRIES = [
+    "USA", "UK", "Brazil", "Portugal", "Spain", "Germany", "France", "Italy",
+    "Australia", "Canada", "Japan", "China", "UAE", "Argentina", "Chile",
+    "Uruguay", "Mexico", "Thailand", "New Zealand", "India",
+]
+ANIMALS = ["Dog", "Cat", "Bird", "Rabbit"]
+REQUIREMENTS = [
+    "Microchip ISO · Rabies vaccine · AHC certificate",
+    "Microchip ISO · FAVN test · Anti-tapeworm · APHA approval",
+    "Microchip ISO · Rabies 28+ days · FAVN test · CDC Form",
+    "Microchip ISO · FAVN test · 10-day quarantine",
+    "Rabies vaccine · Vet certificate · No quarantine",
+    "Microchip ISO · 2x Rabies · FAVN · 180-day wait",
+]
+
+def route_matrix(n: int):
+    """
+    Gera n linhas como as da planilha: origem × destino × animal para todos os
+    pares de COUNTRIES; passando do tamanho da matriz, repete com slugs "-vN".
+    É um gerador — 1M de linhas não ficam todas na memória ao mesmo tempo.
+    """
+    combos = [(o, d, a) for o in COUNTRIES for d in COUNTRIES if o != d for a in ANIMALS]
+    for i, (origin, dest, animal) in zip(range(n), itertools.cycle(combos)):
+        rnd = i // len(combos)
+        slug = gr.build_slug(origin, dest, animal)
+        yield {
+            "Origin": origin,
+            "Destination": dest,
+            "Animal": animal,
+            "Requirements (Breve)": REQUIREMENTS[i % len(REQUIREMENTS)],
+            "Detailed_Requirements": (
+                f"Book the vet visit at least {30 + i % 60} days before departure. "
+                f"Carry the original certificates for {dest} border control."
+            ),
+            "Slug": f"{slug}-v{rnd}" if rnd else slug,
+        }
+
+def synthetic_rows(n: int) -> list[dict]:
+    return list(route_matrix(n))
+
+# ══════════════════════════════════════════════════════════════════════════════
+# VERSÃO ANTIGA (F-STRING)
+# ══════════════════════════════════════════════════════════════════════════════
+# A linha de base é o generate_html() de verdade, lido do histórico do git:
+# a f-string que montava a página inteira a cada chamada (sem escape, com o
+# script do Tailwind) e a gravava com um open(..., "w").write(str).
+BASELINE_REV = "e3c1187"
+
+def load_baseline(rev: str = BASELINE_REV) -> dict:
+    """
+    Namespace do generate_routes.py da revisão `rev` (generate_html e os
+    helpers que ele usa). Os imports do Google ficam de fora: só o main()
+    antigo usava.
+    """
+    import subprocess
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        source = subprocess.run(["git", "show", f"{rev}:generate_routes.py"], cwd=here,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise SystemExit(f"❌ Não consegui ler a linha de base {rev} do git: {e}")
+    source = re.sub(r"^(import gspread|from google\.\S+ import .*)$", r"# \1", source, flags=re.M)
+    namespace = {"__name__": f"generate_routes_{rev}"}
+    exec(compile(source, f"{rev}:generate_routes.py", "exec"), namespace)
+    return namespace
+
+# As duas versões recebem as entradas já preparadas (fora do tempo medido):
+# a antiga, a linha + slug + links de afiliado que o main() antigo passava ao
+# generate_html(); a nova, o dict de page_values(). Assim o tempo é só o do
+# template (+ a gravação); a preparação é medida à parte.
+# path=None → só renderiza (mede o template sem o custo do disco)
+def baseline_renderer(rows: list[dict], rev: str = BASELINE_REV):
+    old = load_baseline(rev)
+    inputs = []
+    for row in rows:
+        origin, destination, animal = row["Origin"], row["Destination"], row["Animal"]
+        slug = row["Slug"] or old["build_slug"](origin, destination, animal)
+        inputs.append((row, slug, old["get_amazon_url"](origin, animal), old["get_booking_url"](destination)))
+    generate_html = old["generate_html"]
+
+    def render_fstring(args: tuple, path: str | None):
+        html = generate_html(*args)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(html)
+    return inputs, render_fstring
+
+def prepare_values(row: dict) -> dict:
+    route = gr.parse_route(row)
+    return gr.page_values(route, gr.get_amazon_url(route.origin, route.animal),
+                          gr.get_booking_url(route.destination))
+
+def template_renderer(rows: list[dict], hashed: bool = False):
+    inputs = [prepare_values(row) for row in rows]
+    render = gr.ROUTE_PAGE.render_hashed if hashed else gr.ROUTE_PAGE.render
+
+    def render_template(values: dict, path: str | None):
+        out = render(values)
+        if path:
+            gr.write_buffers(path, out[0] if hashed else out)
+    return inputs, render_template
+
+# ══════════════════════════════════════════════════════════════════════════════
+# MEDIÇÃO
+# ══════════════════════════════════════════════════════════════════════════════
+def _time_pass(fn, inputs, paths) -> float:
+    start = time.perf_counter()
+    for args, path in zip(inputs, paths):
+        fn(args, path)
+    return time.perf_counter() - start
+
+def bench_render(name: str, renderer, outdir: str, rounds: int = 3) -> dict:
+    inputs, fn = renderer
+    # Cada rodada escreve num diretório novo (sobrescrever arquivos custa mais)
+    render_only = min(_time_pass(fn, inputs, [None] * len(inputs)) for _ in range(rounds))
+    with_write = []
+    for i in range(rounds):
+        target = os.path.join(outdir, f"{name}-{i}".replace(" ", "_"))
+        os.makedirs(target)
+        with_write.append(_time_pass(fn, inputs, [os.path.join(target, f"{k}.html")
+                                                  for k in range(len(inputs))]))
+
+    # Pico de alocação de UMA página (média de algumas amostras)
+    peaks = []
+    for args in inputs[:50]:
+        tracemalloc.start()
+        fn(args, None)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    n = len(inputs)
+    return {
+        "name":      name,
+        "rows":      n,
+        "us_render": render_only / n * 1e6,
+        "us_write":  min(with_write) / n * 1e6,
+        "peak_kb":   sum(peaks) / len(peaks) / 1024,
+    }
+
+def _per_row_us(fn, rows: list[dict], rounds: int = 3) -> float:
+    best = min(_time_pass(lambda row, _: fn(row), rows, [None] * len(rows)) for _ in range(rounds))
+    return best / len(rows) * 1e6
+
+def bench_templates(n: int, rev: str = BASELINE_REV):
+    rows = list(route_matrix(n))
+    with tempfile.TemporaryDirectory() as outdir:
+        results = [bench_render(f"f-string {rev}", baseline_renderer(rows, rev), outdir),
+                   bench_render("PageTemplate", template_renderer(rows), outdir),
+                   bench_render("+ hash", template_renderer(rows, hashed=True), outdir)]
+
+    print(f"\n⏱️  {n} páginas (template: {len(gr.ROUTE_PAGE._parts)} buffers, "
+          f"{gr.ROUTE_PAGE.static_bytes} bytes estáticos) — melhor de 3 rodadas, entradas já preparadas")
+    print(f"   {'versão':<18}{'µs render':>11}{'µs render+disco':>17}{'pico KB/página':>16}")
+    for r in results:
+        print(f"   {r['name']:<18}{r['us_render']:>11.1f}{r['us_write']:>17.1f}{r['peak_kb']:>16.1f}")
+    base, new, hashed = results
+    print(f"   → render {base['us_render'] / new['us_render']:.2f}x, "
+          f"render+disco {base['us_write'] / new['us_write']:.2f}x, "
+          f"pico de memória {base['peak_kb'] / new['peak_kb']:.1f}x (>1 = PageTemplate melhor)")
+    print("   (as páginas não são idênticas: a antiga não escapa valores e ainda tem o script do Tailwind;")
+    print("    \"+ hash\" é o render_hashed() do build incremental, que a antiga não tinha)")
+
+    # Fora do template: o que o build faz por linha antes de renderizar
+    print("\n   preparação por linha (não entra nos tempos acima)")
+    for name, fn in [("row_hash",                    gr.row_hash),
+                     ("parse_route (com row_hash)",  gr.parse_route),
+                     ("+ page_values e links",       prepare_values)]:
+        print(f"   {name:<28}{_per_row_us(fn, rows):>8.1f} µs")
+    return results
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PIPELINE (O BUILD DE VERDADE SOBRE UM SNAPSHOT SINTÉTICO)
+# ══════════════════════════════════════════════════════════════════════════════
+# A matriz vira um snapshot .jsonl e o build() do gerador roda sobre ele como
+# na linha de comando (--source snapshot): os tempos por etapa são os do
+# próprio BuildMetrics. O push fica desligado no processo do benchmark — com
+# um GITHUB_TOKEN configurado, as páginas sintéticas iriam para o site. Depois
+# roda de novo sem mudança nenhuma, para medir o build incremental.
+PIPELINE_SIZES = [1_000, 100_000, 1_000_000]
+PAGE_DISK_BYTES = 16 * 1024   # estimativa por página por idioma, para conferir o espaço livre
+
+# etapa do build → contador de bytes do BuildMetrics
+STAGE_BYTES = {
+    "render":       "bytes.pages",
+    "routes_json":  "bytes.routes_json",
+    "sitemap":      "bytes.sitemap",
+    "search_index": "bytes.search",
+    "hubs":         "bytes.hubs",
+    "precompress":  "bytes.precompressed",
+    "assets":       "bytes.assets",
+}
+
+def peak_rss_mb() -> float | None:
+    """Pico de RSS do processo até agora (None onde não há o módulo resource)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _stage(name: str, rows: int, seconds: float, out_bytes: int) -> dict:
+    return {"stage": name, "rows": rows, "seconds": seconds,
+            "rows_per_sec": rows / seconds if seconds else 0.0,
+            "bytes": out_bytes, "peak_rss_mb": peak_rss_mb()}
+
+def write_snapshot(n: int, path: str) -> str:
+    """Grava a matriz de n linhas como snapshot do gerador. Retorna a revisão."""
+    writer = gr.SnapshotWriter(path, "bench_routes")
+    for row in route_matrix(n):
+        writer.add(row)
+    return writer.close()
+
+def run_build(argv: list[str]) -> "gr.BuildMetrics":
+    """Um build pela linha de comando do gerador, sem a saída no terminal."""
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        gr.main(argv)
+    return gr.METRICS   # build() troca o METRICS global a cada execução
+
+def _no_push(*args, **kwargs):
+    """No lugar de push_all_to_github() no processo do benchmark."""
+
+def _run_pipeline(n: int, jobs: int, queue):
+    # Roda num processo próprio: o pico de RSS medido é só deste tamanho, e
+    # desligar o push aqui não afeta quem importou o gerador
+    gr.GITHUB_TOKEN = ""
+    gr.GITHUB_API   = "http://127.0.0.1:9"   # porta discard: nada sai da máquina
+    gr.push_all_to_github = _no_push
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        write_snapshot(n, gr.SNAPSHOT_FILE)
+        argv = ["--source", "snapshot", "--jobs", str(jobs), "--report", os.devnull]
+
+        metrics = run_build(argv)
+        for name, st in metrics.stages.items():
+            if name == "push":
+                continue
+            results.append(_stage(name, n, st["wall_s"], metrics.counters.get(STAGE_BYTES.get(name), 0)))
+        results.append(_stage("total", n, sum(st["wall_s"] for st in metrics.stages.values()),
+                              sum(metrics.counters.get(key, 0) for key in STAGE_BYTES.values())))
+
+        metrics = run_build(argv)
+        results.append(_stage("incremental", n, sum(st["wall_s"] for st in metrics.stages.values()), 0))
+    queue.put(results)
+
+def bench_pipeline(sizes: list[int], max_write: int | None = None, jobs: int = 1) -> dict:
+    report = {}
+    for n in sizes:
+        if max_write is not None and n > max_write:
+            print(f"   ({n} linhas puladas por --max-write {max_write})")
+            continue
+        need = n * len(gr.LOCALES) * PAGE_DISK_BYTES
+        free = shutil.disk_usage(tempfile.gettempdir()).free
+        if need > free:
+            print(f"   ({n} linhas puladas: o build grava ~{need / 1e9:.1f} GB de páginas e "
+                  f"{tempfile.gettempdir()} tem {free / 1e9:.1f} GB livres; aponte TMPDIR para outro disco)")
+            continue
+        print(f"   {n} linhas (~{need / 1e9:.1f} GB em {tempfile.gettempdir()})...")
+        queue = multiprocessing.Queue()
+        proc = multiprocessing.Process(target=_run_pipeline, args=(n, jobs, queue))
+        proc.start()
+        report[str(n)] = queue.get()
+        proc.join()
+    return report
+
+def print_pipeline(report: dict, baseline: dict | None = None):
+    print("\n⏱️  build() sobre o snapshot sintético (etapas do BuildMetrics)")
+    header = f"   {'linhas':>9}  {'estágio':<16}{'linhas/s':>12}{'segundos':>10}{'MB gerados':>12}{'RSS pico MB':>13}"
+    if baseline:
+        header += f"{'vs base':>10}"
+    print(header)
+    for n, stages in report.items():
+        for st in stages:
+            rss = f"{st['peak_rss_mb']:.0f}" if st["peak_rss_mb"] is not None else "—"
+            line = (f"   {int(n):>9}  {st['stage']:<16}{st['rows_per_sec']:>12.0f}"
+                    f"{st['seconds']:>10.2f}{st['bytes'] / 1e6:>12.1f}{rss:>13}")
+            base = {b["stage"]: b for b in (baseline or {}).get(n, [])}.get(st["stage"])
+            if base and base["rows_per_sec"]:
+                line += f"{(st['rows_per_sec'] / base['rows_per_sec'] - 1) * 100:>+9.0f}%"
+            print(line)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# REGISTROS (DICT × ROUTE × ROUTETABLE)
+# ══════════════════════════════════════════════════════════════════════════════
+def _measure(build) -> int:
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+def bench_records(n: int):
+    """Memória para manter n rotas: dicts da planilha, list[Route] e RouteTable."""
+    rows = synthetic_rows(n)
+    routes = [gr.parse_route(row) for row in rows]
+
+    def table():
+        t = gr.RouteTable()
+        for route in routes:
+            t.append(route)
+        return t
+
+    # Cópias: cada variante paga pelas próprias estruturas, não pelas strings das linhas
+    results = [
+        ("list[dict]",  _measure(lambda: [dict(row) for row in rows])),
+        ("list[Route]", _measure(lambda: [gr.Route(*route) for route in routes])),
+        ("RouteTable",  _measure(table)),
+    ]
+    print(f"\n📦 {n} rotas mantidas em memória (sem contar as strings compartilhadas)")
+    print(f"   {'estrutura':<14}{'bytes/rota':>12}")
+    for name, size in results:
+        print(f"   {name:<14}{size / n:>12.0f}")
+
+    # Varredura de uma coluna: atributo × chave de dict × código da tabela
+    t = table()
+    for name, fn in [
+        ("row.get()",    lambda: sum(1 for row in rows if row.get("Animal") == "Dog")),
+        ("route.animal", lambda: sum(1 for route in routes if route.animal == "Dog")),
+        ("tabela",       lambda: t.codes["animal"].count(t.code("animal", "Dog"))),
+    ]:
+        start = time.perf_counter()
+        fn()
+        print(f"   varrer animal via {name:<13}{(time.perf_counter() - start) * 1000:>8.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do pet_routes.py")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_pipe = sub.add_parser("pipeline", help="build() completo e incremental, etapa por etapa")
+    p_pipe.add_argument("--rows", type=int, nargs="+", default=PIPELINE_SIZES,
+                        help=f"tamanhos da matriz (padrão: {' '.join(map(str, PIPELINE_SIZES))})")
+    p_pipe.add_argument("--max-write", type=int, metavar="LINHAS",
+                        help="pula os tamanhos acima deste (o build grava todas as páginas em disco)")
+    p_pipe.add_argument("--jobs", "-j", type=int, default=1, help="--jobs repassado ao build (padrão: 1)")
+    p_pipe.add_argument("--json", metavar="ARQUIVO", help="salva os resultados em JSON")
+    p_pipe.add_argument("--baseline", metavar="ARQUIVO", help="compara com um JSON salvo antes")
+
+    p_tpl = sub.add_parser("template", help="PageTemplate vs. f-string antiga")
+    p_tpl.add_argument("--rows", type=int, default=2000, help="linhas sintéticas (padrão: 2000)")
+    p_tpl.add_argument("--rev", default=BASELINE_REV,
+                       help=f"revisão do git com o generate_html() antigo (padrão: {BASELINE_REV})")
+
+    p_rec = sub.add_parser("records", help="memória de dicts × Route × RouteTable")
+    p_rec.add_argument("--rows", type=int, default=200_000, help="rotas sintéticas (padrão: 200000)")
+
+    args = parser.parse_args(argv)
+    if args.command == "template":
+        bench_templates(args.rows, args.rev)
+        return
+    if args.command == "records":
+        bench_records(args.rows)
+        return
+
+    report = bench_pipeline(args.rows, args.max_write, args.jobs)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_pipeline(report, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Resultados salvos em {args.json}")
+
+if __name__ == "__main__":
+    main()
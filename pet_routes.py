@@ -0,0 +1,3870 @@
+"""
+pet_routes.py
+Lê a planilha Pet-Travel e gera arquivos HTML individuais em ./routes/
+Também gera routes.json e sitemap.xml na raiz.
+Rode pelo generate_routes.py; este módulo é importável (testes, benchmarks)
+e fica em cache como .pyc, então o script só paga a importação.
+Requer: pip install google-auth  (só para ler direto da planilha — o token
+sai por urllib, sem o pacote requests; builds a partir de um snapshot local
+não precisam de rede nem dessa lib)
+Opcional: pip install fonttools brotli  (fontes auto-hospedadas, com os
+arquivos de fonts/ — sem eles as páginas usam o Google Fonts; .br)
+Com --watch fica rodando e só reconstrói quando a planilha muda.
+"""
+
+import os
+import re
+import csv
+import sys
+import glob
+import gzip
+import json
+import time
+import bisect
+import shutil
+import tempfile
+import string
+import filecmp
+import heapq
+import hashlib
+import functools
+import itertools
+import contextlib
+import argparse
+import unicodedata
+from array import array
+from typing import NamedTuple
+from datetime import date, datetime, timezone
+
+# ══════════════════════════════════════════════════════════════════════════════
+# CONFIGURAÇÕES — edite aqui antes de rodar
+# ══════════════════════════════════════════════════════════════════════════════
+SPREADSHEET_ID       = "1-f9NQ0sqBXA-tpKtRMG9h5aaSt5jK3Q-xoH7Bz8FXE0"
+SHEET_NAME           = "Página1"
+SERVICE_ACCOUNT_FILE = "pet-travel-pseo-a915ba0649b4.json"
+OUTPUT_DIR           = "routes"
+SITE_DOMAIN          = "https://pet.e-dolphin.info"   # usado no sitemap.xml
+BUILD_MANIFEST       = ".build-manifest.json"         # estado do build incremental
+SNAPSHOT_FILE        = "snapshot.jsonl"               # cópia local da planilha (.jsonl ou .csv)
+SEARCH_DIR           = "search"                       # índice de busca da home (JSON)
+SEARCH_TO_DIR        = "to"                           # shards por destino, dentro de SEARCH_DIR
+HUB_DIR              = "countries"                    # páginas hub por país
+ASSETS_DIR           = "assets"                       # CSS compartilhado (nome com hash)
+BUILD_REPORT         = "build-report.json"            # métricas da última execução
+PROFILE_DIR          = "profiles"                     # saída do --profile (.prof)
+SHARD_DIR            = "shards"                       # listas parciais do build em shards
+
+# ── Amazon Associates IDs ─────────────────────────────────────────────────────
+AMAZON_BR_TAG  = "petpassport04-20"    # Amazon.com.br
+AMAZON_US_TAG  = "petpasspor03c-20"    # Amazon.com  (fallback para outras origens)
+AMAZON_UK_TAG  = "petpassportuk-21"    # Amazon.co.uk
+
+# ── Booking.com ───────────────────────────────────────────────────────────────
+BOOKING_AID = "seu-aid-booking"        # ← troque pelo seu AID do Booking.com
+
+# ── Idiomas ───────────────────────────────────────────────────────────────────
+# pasta → código hreflang. O primeiro é o padrão: fica em routes/<slug>.html
+# (URLs de sempre); os outros vão para routes/<pasta>/<slug>.html.
+LOCALES = {
+    "en": "en",
+    "pt": "pt-BR",
+}
+
+# ── Fontes auto-hospedadas ────────────────────────────────────────────────────
+# Arquivos originais (as fontes variáveis do Google Fonts) em fonts/. O build
+# grava em assets/fonts/ um WOFF2 por peso realmente usado no CSS, só com os
+# caracteres latinos. Sem esses arquivos, ou sem os pacotes "fonttools" e
+# "brotli", as páginas continuam carregando do Google Fonts. fonts/ não vem no
+# repositório: baixe os dois arquivos abaixo do google/fonts (pastas ofl/).
+FONTS_DIR    = "fonts"
+FONT_SOURCES = {
+    "Playfair Display": "PlayfairDisplay[wght].ttf",
+    "DM Sans":          "DMSans[opsz,wght].ttf",
+}
+
+# ── Saída ─────────────────────────────────────────────────────────────────────
+MINIFY_HTML = False    # True (ou --minify): páginas sem indentação nem comentários
+PRECOMPRESS = False    # True (ou --precompress): grava .html.gz e .html.br ao lado
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DADOS DE APOIO
+# ══════════════════════════════════════════════════════════════════════════════
+FLAGS = {
+    "usa": "🇺🇸", "us": "🇺🇸", "united states": "🇺🇸", "united-states": "🇺🇸",
+    "uk": "🇬🇧", "united kingdom": "🇬🇧", "united-kingdom": "🇬🇧", "england": "🇬🇧",
+    "brazil": "🇧🇷", "brasil": "🇧🇷",
+    "portugal": "🇵🇹", "spain": "🇪🇸", "españa": "🇪🇸",
+    "germany": "🇩🇪", "france": "🇫🇷", "italy": "🇮🇹",
+    "australia": "🇦🇺", "canada": "🇨🇦",
+    "japan": "🇯🇵", "japão": "🇯🇵",
+    "china": "🇨🇳",
+    "uae": "🇦🇪", "dubai": "🇦🇪", "united arab emirates": "🇦🇪",
+    "argentina": "🇦🇷", "chile": "🇨🇱", "uruguay": "🇺🇾",
+    "mexico": "🇲🇽", "méxico": "🇲🇽",
+    "thailand": "🇹🇭", "new zealand": "🇳🇿",
+    "india": "🇮🇳",
+}
+
+ANIMAL_EMOJI = {"dog": "🐕", "cat": "🐈", "bird": "🦜", "rabbit": "🐇"}
+
+# ── Traduções ─────────────────────────────────────────────────────────────────
+# UI_STRINGS: trecho em inglês do template → tradução. Aplicado UMA vez ao
+# texto do template ao compilá-lo para o idioma; os últimos são dos fragmentos
+# montados em Python (bloco de relacionadas, detalhamento vazio).
+# Países por slug canônico e animais pela grafia minúscula; o que não estiver
+# aqui aparece como na planilha.
+UI_STRINGS = {
+    "pt": {
+        '<html lang="en">': '<html lang="pt-BR">',
+        "<title>Pet Travel: {origin} to {destination} ({animal}) — PetPassport</title>":
+            "<title>Viagem com pet: {de_origin} {para_destination} ({animal}) — PetPassport</title>",
+        "Official pet import requirements for traveling with your {animal_lower} from {origin} to {destination}. Microchip, vaccines, quarantine rules and more.":
+            "Requisitos oficiais para viajar com seu {animal_lower} {de_origin} {para_destination}. Microchip, vacinas, quarentena e mais.",
+        ">Home</a>": ">Início</a>",
+        "← Back to search": "← Voltar para a busca",
+        "<span>traveling</span>✈<span>with pet</span>": "<span>viajando</span>✈<span>com pet</span>",
+        "Bringing your {animal_lower} from {origin} to {destination}": "Levando seu {animal_lower} {de_origin} {para_destination}",
+        "🌍 International route": "🌍 Rota internacional",
+        "✅ Requirements verified": "✅ Requisitos verificados",
+        "Official import requirements": "Requisitos oficiais de entrada",
+        "What you need to enter {destination} with a {animal_lower}":
+            "O que você precisa para entrar {em_destination} com um {animal_lower}",
+        "📋 Detailed checklist": "📋 Checklist detalhado",
+        "Documentation & preparation": "Documentação e preparação",
+        "🏨 Accommodation": "🏨 Hospedagem",
+        "<h3>Where to Stay</h3>": "<h3>Onde ficar</h3>",
+        "Traveling to {destination}? Search thousands of Pet-Friendly hotels and find the perfect place for you and your {animal_lower}.":
+            "Vai {para_destination}? Pesquise milhares de hotéis pet friendly e encontre o lugar ideal para você e seu {animal_lower}.",
+        "🏨 Find Pet-Friendly Hotels in {destination}": "🏨 Hotéis pet friendly {em_destination}",
+        "🛡️ Health & Safety": "🛡️ Saúde e segurança",
+        "<h3>Travel Insurance</h3>": "<h3>Seguro viagem</h3>",
+        "Important: Travel insurance with pet coverage is required for this route. Make sure your {animal_lower} is covered before departure.":
+            "Importante: esta rota exige seguro viagem com cobertura para pets. Confirme que seu {animal_lower} está coberto antes do embarque.",
+        "🛡️ Get a Quote": "🛡️ Fazer cotação",
+        "🛒 Travel Essentials": "🛒 Itens de viagem",
+        "<h3>Shop for Your Trip</h3>": "<h3>Compras para a viagem</h3>",
+        "Carriers, crates, travel bowls, health accessories — everything your {animal_lower} needs, shipped from your local Amazon.":
+            "Caixas de transporte, comedouros de viagem, acessórios de saúde — tudo o que seu {animal_lower} precisa, entregue pela Amazon do seu país.",
+        "🛒 Shop on Amazon": "🛒 Comprar na Amazon",
+        "📄 Save this guide as PDF": "📄 Salvar este guia em PDF",
+        "⚠️ Requirements change frequently. Always verify current rules with the official veterinary authority of {destination} before traveling. This page is for informational purposes only.":
+            "⚠️ Os requisitos mudam com frequência. Confirme sempre as regras atuais com a autoridade veterinária oficial {de_destination} antes de viajar. Esta página é apenas informativa.",
+        "{origin} to {destination} · {animal} travel requirements</footer>":
+            "{origin} → {destination} · requisitos de viagem com {animal_lower}</footer>",
+        "🧭 Related routes": "🧭 Rotas relacionadas",
+        "Other pet travel guides": "Outros guias de viagem com pet",
+        "Please verify detailed requirements with the official veterinary authority of the destination country before traveling.":
+            "Confirme os requisitos detalhados com a autoridade veterinária oficial do país de destino antes de viajar.",
+    },
+}
+
+COUNTRY_NAMES = {
+    "pt": {
+        "usa": "Estados Unidos", "uk": "Reino Unido", "brazil": "Brasil",
+        "portugal": "Portugal", "spain": "Espanha", "germany": "Alemanha",
+        "france": "França", "italy": "Itália", "australia": "Austrália",
+        "canada": "Canadá", "japan": "Japão", "china": "China",
+        "uae": "Emirados Árabes Unidos", "argentina": "Argentina", "chile": "Chile",
+        "uruguay": "Uruguai", "mexico": "México", "thailand": "Tailândia",
+        "new-zealand": "Nova Zelândia", "india": "Índia", "south-korea": "Coreia do Sul",
+        "south-africa": "África do Sul", "saudi-arabia": "Arábia Saudita",
+    },
+}
+
+# Artigo de cada país, para as contrações: "do Brasil", "nos Estados Unidos",
+# "para a Espanha". Sem artigo (""): "de Portugal", "em Portugal". País fora
+# da lista fica sem artigo. Os templates usam os slots {de_origin},
+# {para_destination}, {em_destination} e {de_destination}.
+COUNTRY_ARTICLES = {
+    "pt": {
+        "usa": "os", "uk": "o", "brazil": "o", "portugal": "", "spain": "a",
+        "germany": "a", "france": "a", "italy": "a", "australia": "a", "canada": "o",
+        "japan": "o", "china": "a", "uae": "os", "argentina": "a", "chile": "o",
+        "uruguay": "o", "mexico": "o", "thailand": "a", "new-zealand": "a", "india": "a",
+        "south-korea": "a", "south-africa": "a", "saudi-arabia": "a",
+    },
+}
+
+CONTRACTIONS = {
+    "pt": {
+        "de":   {"o": "do", "a": "da", "os": "dos", "as": "das"},
+        "em":   {"o": "no", "a": "na", "os": "nos", "as": "nas"},
+        "para": {"o": "para o", "a": "para a", "os": "para os", "as": "para as"},
+    },
+}
+
+ANIMAL_NAMES = {
+    "pt": {"dog": "cachorro", "cat": "gato", "bird": "pássaro", "rabbit": "coelho"},
+}
+
+COUNTRY_SLUG = {
+    "united states": "usa", "united states of america": "usa", "us": "usa",
+    "united kingdom": "uk", "great britain": "uk", "england": "uk",
+    "united arab emirates": "uae", "emirates": "uae", "dubai": "uae",
+    "brasil": "brazil", "deutschland": "germany", "españa": "spain",
+    "japão": "japan", "méxico": "mexico", "tailândia": "thailand",
+    "new zealand": "new-zealand", "south korea": "south-korea",
+    "south africa": "south-africa", "saudi arabia": "saudi-arabia",
+}
+
+# ══════════════════════════════════════════════════════════════════════════════
+# FUNÇÕES UTILITÁRIAS
+# ══════════════════════════════════════════════════════════════════════════════
+def normalize_str(text):
+    text = unicodedata.normalize('NFD', text)
+    return ''.join(c for c in text if unicodedata.category(c) != 'Mn')
+
+def normalize_country(name):
+    key = normalize_str(name.lower().strip())
+    return COUNTRY_SLUG.get(key, key)
+
+def slugify(text):
+    text = normalize_str(text.lower().strip())
+    text = re.sub(r'[^a-z0-9\s-]', '', text)
+    text = re.sub(r'\s+', '-', text)
+    return text
+
+def build_slug(origin, destination, animal):
+    return f"{country(origin).slug}-to-{country(destination).slug}-{animal_info(animal).slug}"
+
+def get_flag(country_name):
+    return country(country_name).flag
+
+def get_animal_emoji(animal):
+    return animal_info(animal).emoji
+
+# ── Cache de fragmentos ──────────────────────────────────────────────────────
+# Milhares de rotas compartilham poucas dezenas de textos de requisitos; o HTML
+# do checklist e do detalhamento é cacheado pelo próprio texto (LRU limitado).
+FRAGMENT_CACHE_SIZE = 1024
+
+@functools.lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def build_checklist(req_text):
+    parts = re.split(r'[·\n]+', req_text)
+    items = [escape_html(p.strip()) for p in parts if len(p.strip()) > 6]
+    if not items:
+        return f'<li class="check-item"><span class="check-icon">✓</span>{escape_html(req_text)}</li>'
+    return "\n".join(
+        f'<li class="check-item"><span class="check-icon">✓</span>{item}</li>'
+        for item in items
+    )
+
+@functools.lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def detailed_fragment(detailed, lang=None):
+    if not detailed:
+        return ("<p style='opacity:.6;font-style:italic'>" + translate(
+            "Please verify detailed requirements with the official veterinary authority "
+            "of the destination country before traveling.", lang) + "</p>")
+    return f"<p>{escape_html(detailed)}</p>"
+
+_FRAGMENT_CACHES = {"checklist": build_checklist, "detailed": detailed_fragment}
+_pool_fragment_stats = {name: [0, 0] for name in _FRAGMENT_CACHES}   # hits/misses dos workers
+
+def _fragment_counters() -> dict[str, tuple[int, int]]:
+    return {name: fn.cache_info()[:2] for name, fn in _FRAGMENT_CACHES.items()}
+
+def fragment_cache_stats() -> dict:
+    """Hits/misses por cache, somando o processo principal e os processos do pool."""
+    stats = {}
+    for name, (hits, misses) in _fragment_counters().items():
+        pool_hits, pool_misses = _pool_fragment_stats[name]
+        stats[name] = {"hits": hits + pool_hits, "misses": misses + pool_misses}
+    return stats
+
+# ══════════════════════════════════════════════════════════════════════════════
+# LÓGICA DE AFILIADOS
+# ══════════════════════════════════════════════════════════════════════════════
+def amazon_store(origin_key: str) -> tuple[str, str]:
+    """
+    Redirecionamento inteligente por origem (chave já normalizada):
+    - Brazil  → amazon.com.br  + AMAZON_BR_TAG
+    - UK      → amazon.co.uk   + AMAZON_UK_TAG
+    - Qualquer outra → amazon.com + AMAZON_US_TAG
+    """
+    if origin_key in ("brazil", "brasil"):
+        return "amazon.com.br", AMAZON_BR_TAG
+    elif origin_key in ("uk", "united-kingdom", "united kingdom", "england"):
+        return "amazon.co.uk", AMAZON_UK_TAG
+    else:
+        return "amazon.com", AMAZON_US_TAG
+
+def get_amazon_url(origin: str, animal: str) -> str:
+    """Busca na Amazon da origem, com a tag de afiliado certa."""
+    c = country(origin)
+    return f"{c.amazon_prefix}{animal_info(animal).lower}{c.amazon_suffix}"
+
+def get_booking_url(destination: str) -> str:
+    """Booking.com com destino dinâmico."""
+    return country(destination).booking_url
+
+# ══════════════════════════════════════════════════════════════════════════════
+# REGISTRO DE PAÍSES E ANIMAIS
+# ══════════════════════════════════════════════════════════════════════════════
+# Normalização Unicode, slugify (regex) e lookups de bandeira/afiliados são
+# feitos uma vez por GRAFIA, não uma vez por linha: o registro é pré-populado
+# a partir de FLAGS, COUNTRY_SLUG e ANIMAL_EMOJI e memoriza grafias novas
+# na primeira vez que aparecem. Por linha sobra um acesso a dicionário.
+class Country(NamedTuple):
+    name: str            # grafia normalizada (minúscula, sem acento)
+    slug: str            # slug canônico da URL ("usa", "uk", "new-zealand")
+    flag: str
+    amazon_domain: str
+    amazon_tag: str
+    amazon_prefix: str   # URL de busca até o animal
+    amazon_suffix: str   # resto da URL, com a tag de afiliado
+    booking_label: str
+    booking_url: str
+
+class Animal(NamedTuple):
+    slug: str
+    lower: str
+    emoji: str
+
+_COUNTRIES: dict[str, Country] = {}
+_ANIMALS: dict[str, Animal] = {}
+
+def _build_country(raw: str) -> Country:
+    key = normalize_str(raw.lower().strip())
+    domain, tag = amazon_store(key)
+    label = f"petpassport-{slugify(raw)}"
+    return Country(
+        name=sys.intern(key),
+        slug=sys.intern(slugify(COUNTRY_SLUG.get(key, key))),
+        flag=FLAGS.get(key, "🌍"),
+        amazon_domain=domain,
+        amazon_tag=tag,
+        amazon_prefix=f"https://www.{domain}/s?k=pet+travel+",
+        amazon_suffix=f"+carrier+accessories&tag={tag}",
+        booking_label=sys.intern(label),
+        booking_url=(
+            f"https://www.booking.com/search.html"
+            f"?ss={raw.replace(' ', '+')}&aid={BOOKING_AID}"
+            f"&label={label}"
+        ),
+    )
+
+def country(raw: str) -> Country:
+    """Registro do país para esta grafia exata (memorizado)."""
+    try:
+        return _COUNTRIES[raw]
+    except KeyError:
+        info = _COUNTRIES[raw] = _build_country(raw)
+        return info
+
+def animal_info(raw: str) -> Animal:
+    """Registro do animal para esta grafia exata (memorizado)."""
+    try:
+        return _ANIMALS[raw]
+    except KeyError:
+        info = _ANIMALS[raw] = Animal(
+            slug=sys.intern(slugify(raw)),
+            lower=sys.intern(raw.lower()),
+            emoji=ANIMAL_EMOJI.get(raw.lower().strip(), "🐾"),
+        )
+        return info
+
+@functools.lru_cache(maxsize=None)
+def prefill_registry():
+    """
+    Registra de antemão as grafias conhecidas de países e animais. Chamado
+    pelo build antes do render (com -j, antes do fork: os processos herdam o
+    registro pronto) — não no import, para comandos que não renderizam.
+    """
+    names = {*FLAGS, *COUNTRY_SLUG, *COUNTRY_SLUG.values()}
+    for name in names:
+        for spelling in (name, name.title(), name.upper()):
+            country(spelling)
+    for name in ANIMAL_EMOJI:
+        for spelling in (name, name.title()):
+            animal_info(spelling)
+
+# ══════════════════════════════════════════════════════════════════════════════
+# REGISTROS DE ROTA
+# ══════════════════════════════════════════════════════════════════════════════
+# Cada linha da planilha é validada UMA vez na entrada (parse_route) e vira um
+# Route: tupla imutável, sem dict por instância, com os campos já limpos e
+# país/animal internados (milhões de rotas compartilham as mesmas poucas
+# strings). Daí em diante plano, render e índices só leem atributos — nada de
+# row.get("Requirements (Breve)") espalhado pelo código.
+class Route(NamedTuple):
+    slug: str
+    origin: str
+    destination: str
+    animal: str
+    requirements: str
+    detailed: str
+    row_hash: str        # hash da linha original (manifesto)
+    related: tuple = ()  # rotas relacionadas (slug, origem, destino, animal), via RouteIndex
+
+def _cell(row: dict, column: str, default: str = "") -> str:
+    return str(row.get(column, default)).strip()
+
+def row_slug(row: dict) -> str | None:
+    """Slug da linha (coluna Slug ou gerado); None se faltar origem ou destino."""
+    origin      = _cell(row, "Origin")
+    destination = _cell(row, "Destination")
+    if not origin or not destination:
+        return None
+    return (_cell(row, "Slug") or build_slug(origin, destination, _cell(row, "Animal"))).lower()
+
+def parse_route(row: dict, slug: str | None = None, hashed: bool = True) -> Route | None:
+    """
+    Linha da planilha → Route; None se faltar origem ou destino.
+    hashed=False pula o hash da linha (basta para montar o índice).
+    """
+    slug = slug or row_slug(row)
+    if slug is None:
+        return None
+    return Route(
+        slug=slug,
+        origin=sys.intern(_cell(row, "Origin")),
+        destination=sys.intern(_cell(row, "Destination")),
+        animal=sys.intern(_cell(row, "Animal")),
+        requirements=sys.intern(_cell(row, "Requirements (Breve)", "No requirements found.")),
+        detailed=_cell(row, "Detailed_Requirements"),
+        row_hash=row_hash(row) if hashed else "",
+    )
+
+class RouteTable:
+    """
+    Catálogo de rotas em colunas, para conjuntos grandes: slugs numa lista e
+    origem, destino, animal e requisitos como códigos (array de inteiros) num
+    vocabulário por coluna. Uma rota custa ~4 inteiros + o slug, em vez de
+    uma tupla com 7 referências; as colunas podem ser varridas sem montar
+    objetos. O texto detalhado não entra (só as páginas precisam dele).
+    """
+    COLUMNS = ("origin", "destination", "animal", "requirements")
+
+    def __init__(self):
+        self.slugs = []
+        self.codes = {name: array("I") for name in self.COLUMNS}
+        self.vocab = {name: [] for name in self.COLUMNS}     # código → valor
+        self._ids  = {name: {} for name in self.COLUMNS}     # valor → código
+
+    def __len__(self) -> int:
+        return len(self.slugs)
+
+    def code(self, column: str, value: str) -> int:
+        ids = self._ids[column]
+        if value not in ids:
+            ids[value] = len(self.vocab[column])
+            self.vocab[column].append(value)
+        return ids[value]
+
+    def append(self, route: Route) -> int:
+        """Adiciona a rota e devolve sua posição na tabela."""
+        for name in self.COLUMNS:
+            self.codes[name].append(self.code(name, getattr(route, name)))
+        self.slugs.append(route.slug)
+        return len(self.slugs) - 1
+
+    def value(self, column: str, i: int) -> str:
+        return self.vocab[column][self.codes[column][i]]
+
+    def row(self, i: int) -> tuple[str, str, str, str, str]:
+        """(slug, origem, destino, animal, requisitos) da posição i."""
+        return (self.slugs[i], *(self.value(name, i) for name in self.COLUMNS))
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self.slugs)))
+
+# ── Índice invertido ─────────────────────────────────────────────────────────
+# Montado numa passada sobre as linhas, antes do render: cada chave (país de
+# origem, país de destino, origem+animal, destino+animal, origem+destino)
+# aponta para as posições das rotas na RouteTable, na ordem da planilha.
+# "Rotas relacionadas" e as páginas hub saem de consultas O(RELATED_MAX) ou
+# O(rotas do país) — nunca de varrer a planilha inteira para cada página.
+RELATED_MAX = 6   # links no bloco "Related routes" de cada página
+
+class RouteIndex:
+    def __init__(self):
+        self.table     = RouteTable()
+        self.postings  = {}   # chave → array("I") de posições na tabela
+        self.countries = {}   # slug do país → primeira grafia vista
+
+    def _post(self, key: tuple, pos: int):
+        postings = self.postings.get(key)
+        if postings is None:
+            postings = self.postings[key] = array("I")
+        postings.append(pos)
+
+    def add(self, route: Route) -> int:
+        pos = self.table.append(route)
+        o = country(route.origin).slug
+        d = country(route.destination).slug
+        a = animal_info(route.animal).slug
+        self.countries.setdefault(o, route.origin)
+        self.countries.setdefault(d, route.destination)
+        self._post(("from", o), pos)
+        self._post(("to", d), pos)
+        self._post(("from+animal", o, a), pos)
+        self._post(("to+animal", d, a), pos)
+        self._post(("pair", o, d), pos)
+        return pos
+
+    def positions(self, *key) -> array:
+        return self.postings.get(key, array("I"))
+
+    def related(self, route: Route, limit: int = RELATED_MAX) -> tuple:
+        """
+        Até `limit` rotas (slug, origem, destino, animal) ligadas a esta: mesmo
+        animal saindo da mesma origem, mesmo animal chegando ao mesmo destino e,
+        por fim, o mesmo trajeto com outros animais. Cada grupo cede no máximo
+        metade dos links na primeira rodada, para o bloco não ficar monotemático.
+        """
+        o = country(route.origin).slug
+        d = country(route.destination).slug
+        a = animal_info(route.animal).slug
+        keys   = [("from+animal", o, a), ("to+animal", d, a), ("pair", o, d)]
+        picked = []
+        seen   = {route.slug}
+        for cap in (-(-limit // 2), limit):
+            for key in keys:
+                taken = 0
+                for pos in self.postings.get(key, ()):
+                    if len(picked) == limit or taken == cap:
+                        break
+                    slug = self.table.slugs[pos]
+                    if slug in seen:
+                        continue
+                    seen.add(slug)
+                    picked.append(self.table.row(pos)[:4])
+                    taken += 1
+        return tuple(picked)
+
+def related_signature(related: tuple) -> str:
+    """Hash do bloco de relacionadas: muda quando um link ou seu texto muda."""
+    if not related:
+        return ""
+    return content_hash("\x1f".join(map("\x1e".join, related)).encode("utf-8"))
+
+# ══════════════════════════════════════════════════════════════════════════════
+# FONTES DE DADOS (PLANILHA / SNAPSHOT LOCAL)
+# ══════════════════════════════════════════════════════════════════════════════
+# Toda fonte expõe iter_rows() → dicts um a um (mesmas colunas da planilha),
+# rows() → lista, e describe() para os logs. A planilha é lida em páginas de
+# SHEETS_PAGE_ROWS linhas, então o build nunca precisa da planilha inteira na
+# memória. Ela pode ser salva num snapshot local (JSONL ou CSV) com carimbo de
+# revisão; builds a partir do snapshot não usam rede, não precisam de
+# credenciais e começam em milissegundos.
+# version() é o sinal barato de mudança usado pelo --watch: para a planilha,
+# a versão do arquivo no Google Drive (uma requisição de poucos bytes, sem
+# ler nenhuma linha); para o snapshot, a revisão do cabeçalho (só a primeira
+# linha é lida), ou data e tamanho do arquivo se ele não tiver cabeçalho.
+# As duas APIs são chamadas direto (urllib), então um servidor local no lugar
+# de SHEETS_API/DRIVE_API basta para testar a leitura da planilha.
+SHEETS_PAGE_ROWS = 1000   # linhas por requisição ao ler a planilha
+SHEETS_API       = "https://sheets.googleapis.com/v4"      # troque por um servidor local para testar
+DRIVE_API        = "https://www.googleapis.com/drive/v3"   # idem
+
+def _update_revision(h, row):
+    h.update(json.dumps(row, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    h.update(b"\n")
+
+def rows_revision(rows) -> str:
+    """Carimbo de revisão: hash do conteúdo de todas as linhas, na ordem."""
+    h = hashlib.sha1()
+    for row in rows:
+        _update_revision(h, row)
+    return h.hexdigest()[:16]
+
+def _a1_column(col: int) -> str:
+    """1 → "A", 27 → "AA"."""
+    letters = ""
+    while col:
+        col, rest = divmod(col - 1, 26)
+        letters = chr(ord("A") + rest) + letters
+    return letters
+
+_NUMBER_START = frozenset("0123456789+-. ")
+
+def numericise(value):
+    """"12" → 12, "1.5" → 1.5; o resto fica como veio (como no get_all_records do gspread)."""
+    # Texto comum (a maioria das células) sai no primeiro caractere, sem exceção
+    if not isinstance(value, str) or not value or value[0] not in _NUMBER_START or "_" in value:
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+class AuthResponse(NamedTuple):
+    status:  int
+    headers: dict
+    data:    bytes
+
+class UrllibTransport:
+    """
+    Transporte do google-auth (troca do JWT da service account por um token)
+    sobre urllib. O google.auth.transport.requests precisaria do pacote
+    requests só para essa requisição.
+    """
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        import urllib.error
+        import urllib.request
+        from google.auth import exceptions
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        req = urllib.request.Request(url, data=body, headers=headers or {}, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout or 30) as res:
+                return AuthResponse(res.status, dict(res.headers), res.read())
+        except urllib.error.HTTPError as e:
+            return AuthResponse(e.code, dict(e.headers), e.read())
+        except (urllib.error.URLError, OSError) as e:
+            raise exceptions.TransportError(e) from e
+
+class SheetsSource:
+    """Lê as linhas direto do Google Sheets (API REST v4 + service account)."""
+
+    def __init__(self, spreadsheet_id: str = SPREADSHEET_ID, sheet_name: str = SHEET_NAME,
+                 credentials_file: str = SERVICE_ACCOUNT_FILE, page_rows: int = SHEETS_PAGE_ROWS):
+        self.spreadsheet_id   = spreadsheet_id
+        self.sheet_name       = sheet_name
+        self.credentials_file = credentials_file
+        self.page_rows        = page_rows
+
+    def describe(self) -> str:
+        return f"Google Sheets ({self.sheet_name})"
+
+    def _credentials(self):
+        from google.oauth2.service_account import Credentials
+        return Credentials.from_service_account_file(self.credentials_file, scopes=SCOPES)
+
+    def _access_token(self) -> str:
+        # GOOGLE_ACCESS_TOKEN pula a service account (CI, servidor de teste local)
+        token = os.environ.get("GOOGLE_ACCESS_TOKEN")
+        if token:
+            return token
+        creds = getattr(self, "_creds", None) or self._credentials()
+        if not creds.valid:
+            creds.refresh(UrllibTransport())
+        self._creds = creds
+        return creds.token
+
+    def _get(self, url: str) -> dict:
+        # Importado aqui: builds offline não carregam o stack de rede
+        import urllib.request
+        req = urllib.request.Request(url, headers={"Authorization": f"Bearer {self._access_token()}"})
+        with urllib.request.urlopen(req, timeout=30) as res:
+            return json.loads(res.read())
+
+    def version(self) -> str:
+        """Versão do arquivo no Drive: muda a cada edição da planilha."""
+        meta = self._get(f"{DRIVE_API}/files/{self.spreadsheet_id}"
+                         "?fields=version,modifiedTime&supportsAllDrives=true")
+        return str(meta.get("version") or meta["modifiedTime"])
+
+    def values(self, a1_range: str) -> list[list[str]]:
+        """Células do intervalo (ex.: "A2:F1001") da aba, já formatadas como na planilha."""
+        import urllib.parse
+        target = urllib.parse.quote(f"'{self.sheet_name.replace(chr(39), chr(39) * 2)}'!{a1_range}", safe="")
+        return self._get(f"{SHEETS_API}/spreadsheets/{self.spreadsheet_id}/values/{target}"
+                         "?majorDimension=ROWS").get("values", [])
+
+    def rows(self) -> list[dict]:
+        return list(self.iter_rows())
+
+    def iter_rows(self):
+        # Mesmo resultado de get_all_records() do gspread, mas página por página.
+        # A API corta as linhas em branco do fim de cada intervalo, então uma
+        # página curta não quer dizer fim da planilha (pode ser um trecho em
+        # branco cruzando a divisa das páginas): só uma página vazia encerra,
+        # e o branco cortado volta como linhas vazias se a planilha continuar.
+        header = (self.values("1:1") or [[]])[0]
+        first  = 2
+        blank  = 0   # linhas em branco cortadas do fim da página anterior
+        while header:
+            last   = first + self.page_rows - 1
+            values = self.values(f"A{first}:{_a1_column(len(header))}{last}")
+            if not values:
+                return
+            for values_row in [[]] * blank + values:
+                values_row = values_row + [""] * (len(header) - len(values_row))
+                yield dict(zip(header, map(numericise, values_row)))
+            blank = self.page_rows - len(values)
+            first = last + 1
+
+class SnapshotSource:
+    """
+    Lê as linhas de um snapshot local (.jsonl ou .csv) salvo por save_snapshot().
+    As células do CSV voltam numericizadas, iguais às que a planilha devolve.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_FILE):
+        self.path = path
+        self.meta = {}
+
+    def _read_meta(self) -> dict:
+        """Cabeçalho do snapshot (revisão, fetched_at...) lendo só a primeira linha."""
+        try:
+            with open(self.path, encoding="utf-8", newline="") as f:
+                first = f.readline()
+        except FileNotFoundError:
+            return {}
+        self.meta = self._parse_meta(first) or {}
+        return self.meta
+
+    def _parse_meta(self, line: str):
+        if self.path.endswith(".csv"):
+            if line.startswith("#"):
+                # "# revision=... fetched_at=... rows=..."
+                return dict(kv.split("=", 1) for kv in line[1:].split())
+            return None
+        if line.startswith('{"_snapshot"'):
+            return json.loads(line)["_snapshot"]
+        return None
+
+    def describe(self) -> str:
+        rev = self._read_meta().get("revision")
+        return f"snapshot {self.path}" + (f" (revisão {rev})" if rev else "")
+
+    def version(self) -> str:
+        # Snapshot com cabeçalho: a revisão (conteúdo); sem cabeçalho (escrito
+        # à mão): data e tamanho do arquivo
+        rev = self._read_meta().get("revision")
+        if rev:
+            return rev
+        st = os.stat(self.path)
+        return f"{st.st_mtime_ns}-{st.st_size}"
+
+    def rows(self) -> list[dict]:
+        return list(self.iter_rows())
+
+    def iter_rows(self):
+        if self.path.endswith(".csv"):
+            return self._read_csv()
+        return self._read_jsonl()
+
+    def _read_jsonl(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "_snapshot" in record:
+                    self.meta = record["_snapshot"]
+                    continue
+                yield record
+
+    def _read_csv(self):
+        with open(self.path, encoding="utf-8", newline="") as f:
+            meta = self._parse_meta(f.readline())
+            if meta is None:
+                f.seek(0)
+            else:
+                self.meta = meta
+            for row in csv.DictReader(f):
+                yield {k: numericise(v) for k, v in row.items()}
+
+class SnapshotWriter:
+    """
+    Grava um snapshot linha a linha. A revisão (hash de todas as linhas) só é
+    conhecida no fim, então o corpo vai para um arquivo temporário e o
+    cabeçalho é escrito no close().
+    """
+
+    def __init__(self, path: str = SNAPSHOT_FILE, source: str = ""):
+        self.path   = path
+        self.source = source
+        self.count  = 0
+        self._hash  = hashlib.sha1()
+        self._body  = open(path + ".body", "w+", encoding="utf-8", newline="")
+        self._csv   = None
+
+    def add(self, row: dict):
+        _update_revision(self._hash, row)
+        if self.path.endswith(".csv"):
+            if self._csv is None:
+                # Linhas da planilha têm todas as mesmas colunas: usa as da primeira
+                self._csv = csv.DictWriter(self._body, fieldnames=list(row))
+                self._csv.writeheader()
+            self._csv.writerow(row)
+        else:
+            self._body.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def tee(self, rows):
+        """Repassa as linhas adiante gravando cada uma no snapshot."""
+        for row in rows:
+            self.add(row)
+            yield row
+
+    def close(self) -> str:
+        """Escreve o snapshot final (cabeçalho + corpo). Retorna a revisão."""
+        revision = self._hash.hexdigest()[:16]
+        meta = {
+            "revision":   revision,
+            "fetched_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "rows":       self.count,
+        }
+        if self.source:
+            meta["source"] = self.source
+
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            if self.path.endswith(".csv"):
+                f.write("# " + " ".join(f"{k}={meta[k]}" for k in ("revision", "fetched_at", "rows")) + "\n")
+            else:
+                f.write(json.dumps({"_snapshot": meta}, ensure_ascii=False) + "\n")
+            self._body.seek(0)
+            shutil.copyfileobj(self._body, f)
+        self._body.close()
+        os.remove(self.path + ".body")
+        os.replace(tmp, self.path)
+        return revision
+
+def save_snapshot(rows, path: str = SNAPSHOT_FILE, source: str = "") -> str:
+    """Grava as linhas num snapshot local (formato pela extensão). Retorna a revisão."""
+    writer = SnapshotWriter(path, source)
+    for row in rows:
+        writer.add(row)
+    return writer.close()
+
+class RowSpool:
+    """
+    Cópia temporária (.jsonl) das linhas lidas, para uma segunda passada sem
+    voltar à rede: o build lê a planilha uma vez para o índice invertido e
+    renderiza relendo o spool.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile("w+", encoding="utf-8")
+
+    def tee(self, rows):
+        for row in rows:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+            yield row
+
+    def iter_rows(self):
+        self._file.seek(0)
+        for line in self._file:
+            yield json.loads(line)
+
+    def close(self):
+        self._file.close()
+
+def open_source(kind: str, snapshot_path: str = SNAPSHOT_FILE):
+    """Fábrica das fontes de dados: "sheets" ou "snapshot"."""
+    if kind == "sheets":
+        return SheetsSource()
+    if kind == "snapshot":
+        # Mesmo aviso em todo comando que lê o snapshot (render, index, build, --watch)
+        if not os.path.exists(snapshot_path):
+            raise SystemExit(f"❌ {snapshot_path} não existe — rode o fetch antes (ou use --source sheets).")
+        return SnapshotSource(snapshot_path)
+    raise ValueError(f"Fonte de dados desconhecida: {kind!r}")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# GERADOR DE HTML
+# ══════════════════════════════════════════════════════════════════════════════
+# O template é texto puro com campos no estilo str.format ({{ }} = chave literal).
+# Tipos de slot: {campo} → texto escapado; {campo:html} → fragmento HTML já
+# pronto; {campo:raw} → URL montada pelo próprio script, inserida como está.
+# ── Folha de estilo compartilhada ────────────────────────────────────────────
+# Só o CSS crítico (nav + hero, o que aparece na primeira dobra) fica inline no
+# <style> da página. O resto vai para UM arquivo assets/route.<hash>.css, igual
+# para todas as rotas e idiomas: o navegador baixa uma vez e reaproveita do
+# cache. O nome muda junto com o conteúdo, então o arquivo pode ser servido
+# com cache longo ("immutable") sem risco de CSS velho.
+ROUTE_CSS = """/* CONTENT */
+.content { position:relative; z-index:1; max-width:900px; margin:0 auto; padding:4rem 3rem; }
+.card { background:white; border-radius:24px; padding:2.5rem; box-shadow:0 4px 40px rgba(28,58,43,0.08); margin-bottom:2rem; }
+.card-label { font-size:0.7rem; font-weight:500; text-transform:uppercase; letter-spacing:0.12em; color:var(--sage); margin-bottom:1rem; }
+.card h2 { font-family:'Playfair Display',serif; font-size:1.4rem; font-weight:700; margin-bottom:1.5rem; }
+
+/* CHECKLIST */
+.check-list { list-style:none; display:flex; flex-direction:column; gap:0.85rem; }
+.check-item { display:flex; align-items:flex-start; gap:0.85rem; font-size:0.95rem; line-height:1.5; padding-bottom:0.85rem; border-bottom:1px solid rgba(74,124,89,0.08); }
+.check-item:last-child { border-bottom:none; padding-bottom:0; }
+.check-icon { flex-shrink:0; width:22px; height:22px; background:var(--mist); color:var(--sage); border-radius:50%; display:flex; align-items:center; justify-content:center; font-size:0.7rem; font-weight:700; margin-top:0.1rem; }
+
+/* CTA CARD */
+.cta-card { background:var(--forest); border-radius:24px; padding:2.5rem; margin-bottom:2rem; }
+.cta-card h3 { font-family:'Playfair Display',serif; font-size:1.6rem; font-weight:700; color:var(--cream); margin-bottom:0.5rem; }
+.cta-card p { font-size:0.9rem; color:rgba(245,240,232,0.6); line-height:1.6; margin-bottom:1.5rem; }
+.btn-row { display:flex; gap:1rem; flex-wrap:wrap; }
+
+/* BOTÃO AMAZON — laranja */
+.btn-amazon {
+  background: #FF9900; color: #111; font-family:'DM Sans',sans-serif;
+  font-size:0.95rem; font-weight:700; padding:0.9rem 1.75rem; border-radius:14px;
+  text-decoration:none; display:inline-flex; align-items:center; gap:0.5rem;
+  transition:transform .15s, box-shadow .15s; flex-shrink:0;
+}
+.btn-amazon:hover { transform:translateY(-2px); box-shadow:0 8px 24px rgba(255,153,0,0.4); }
+
+/* BOTÃO BOOKING — azul */
+.btn-booking {
+  background: #003580; color: white; font-family:'DM Sans',sans-serif;
+  font-size:0.95rem; font-weight:700; padding:0.9rem 1.75rem; border-radius:14px;
+  text-decoration:none; display:inline-flex; align-items:center; gap:0.5rem;
+  transition:transform .15s, box-shadow .15s; flex-shrink:0;
+}
+.btn-booking:hover { transform:translateY(-2px); box-shadow:0 8px 24px rgba(0,53,128,0.4); }
+
+/* BOTÃO PDF — ghost */
+.btn-ghost {
+  background:rgba(245,240,232,0.1); color:var(--cream); font-family:'DM Sans',sans-serif;
+  font-size:0.95rem; font-weight:500; padding:0.9rem 1.75rem; border-radius:14px;
+  border:1px solid rgba(245,240,232,0.2); cursor:pointer; display:inline-flex; align-items:center; gap:0.5rem;
+  transition:background .2s; flex-shrink:0;
+}
+.btn-ghost:hover { background:rgba(245,240,232,0.18); }
+
+/* CARD DE HOTEL — azul escuro */
+.hotel-card {
+  background: #003580; border-radius:24px; padding:2.5rem; margin-bottom:2rem;
+  display:flex; align-items:center; justify-content:space-between; gap:2rem; flex-wrap:wrap;
+}
+.hotel-card h3 { font-family:'Playfair Display',serif; font-size:1.4rem; font-weight:700; color:white; margin-bottom:0.5rem; }
+.hotel-card p { font-size:0.9rem; color:rgba(255,255,255,0.65); line-height:1.6; max-width:420px; }
+
+/* CARD DE SEGURO — âmbar/ouro */
+.insurance-card {
+  background: linear-gradient(135deg, #92400e, #b45309);
+  border-radius:24px; padding:2.5rem; margin-bottom:2rem;
+  display:flex; align-items:center; justify-content:space-between; gap:2rem; flex-wrap:wrap;
+}
+.insurance-card h3 { font-family:'Playfair Display',serif; font-size:1.4rem; font-weight:700; color:white; margin-bottom:0.5rem; }
+.insurance-card p { font-size:0.9rem; color:rgba(255,255,255,0.75); line-height:1.6; max-width:420px; }
+
+/* CARD AMAZON */
+.amazon-card {
+  background: #131921; border-radius:24px; padding:2.5rem; margin-bottom:2rem;
+  display:flex; align-items:center; justify-content:space-between; gap:2rem; flex-wrap:wrap;
+}
+.amazon-card h3 { font-family:'Playfair Display',serif; font-size:1.4rem; font-weight:700; color:white; margin-bottom:0.5rem; }
+.amazon-card p { font-size:0.9rem; color:rgba(255,255,255,0.6); line-height:1.6; max-width:420px; }
+
+/* BOTÃO SEGURO */
+.btn-insurance {
+  background: white; color: #92400e; font-family:'DM Sans',sans-serif;
+  font-size:0.95rem; font-weight:700; padding:0.9rem 1.75rem; border-radius:14px;
+  text-decoration:none; display:inline-flex; align-items:center; gap:0.5rem;
+  transition:transform .15s, box-shadow .15s; flex-shrink:0; white-space:nowrap;
+}
+.btn-insurance:hover { transform:translateY(-2px); box-shadow:0 8px 24px rgba(0,0,0,0.2); }
+
+/* ROTAS RELACIONADAS */
+.related-list { list-style:none; display:grid; grid-template-columns:repeat(auto-fill,minmax(240px,1fr)); gap:0.75rem; }
+.related-list a { display:block; padding:0.85rem 1rem; border-radius:14px; background:var(--mist); color:var(--forest); text-decoration:none; font-size:0.9rem; transition:background .2s; }
+.related-list a:hover { background:rgba(74,124,89,0.18); }
+.disclaimer { margin-top:2rem; font-size:0.78rem; opacity:0.45; line-height:1.6; text-align:center; }
+footer { z-index:1; position:relative; border-top:1px solid rgba(74,124,89,0.15); padding:2rem 3rem; text-align:center; font-size:0.78rem; opacity:0.45; }
+
+@media print {
+  .no-print { display:none !important; }
+  .content { padding:1rem; }
+}
+@media (max-width:640px) {
+  .content { padding:2rem 1.5rem; }
+  .btn-row { flex-direction:column; }
+}
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8"/>
+  <meta name="viewport" content="width=device-width, initial-scale=1.0"/>
+  <title>Pet Travel: {origin} to {destination} ({animal}) — PetPassport</title>
+  <meta name="description" content="Official pet import requirements for traveling with your {animal_lower} from {origin} to {destination}. Microchip, vaccines, quarantine rules and more."/>{alternates_html:html}{fonts_html:html}
+  <link rel="stylesheet" href="../{assets_dir:raw}/{base_stylesheet:raw}"/>
+  <style>
+    :root {{
+      --cream: #F5F0E8; --forest: #1C3A2B;
+      --sage: #4A7C59;  --gold: #C9A84C;
+      --mist: #E8EFE9;  --orange: #E07B2A;
+      --blue: #2563EB;
+    }}
+    * {{ box-sizing: border-box; margin: 0; padding: 0; }}
+    body {{ font-family: 'DM Sans', sans-serif; background: var(--cream); color: var(--forest); }}
+    body::before {{
+      content: ''; position: fixed; inset: 0; pointer-events: none; z-index: 0;
+      background-image: url("data:image/svg+xml,%3Csvg viewBox='0 0 256 256' xmlns='http://www.w3.org/2000/svg'%3E%3Cfilter id='noise'%3E%3CfeTurbulence type='fractalNoise' baseFrequency='0.9' numOctaves='4' stitchTiles='stitch'/%3E%3C/filter%3E%3Crect width='100%25' height='100%25' filter='url(%23noise)' opacity='0.04'/%3E%3C/svg%3E");
+    }}
+    nav {{
+      position: fixed; top: 0; left: 0; right: 0; z-index: 100;
+      display: flex; align-items: center; justify-content: space-between;
+      padding: 1.25rem 3rem;
+      background: rgba(245,240,232,0.88); backdrop-filter: blur(12px);
+      border-bottom: 1px solid rgba(74,124,89,0.15);
+    }}
+    .logo {{ font-family:'Playfair Display',serif; font-size:1.4rem; font-weight:900; color:var(--forest); text-decoration:none; }}
+    .logo span {{ color: var(--sage); }}
+    .breadcrumb {{ font-size:0.78rem; opacity:0.55; display:flex; align-items:center; gap:0.4rem; }}
+    .breadcrumb a {{ color:var(--forest); text-decoration:none; }}
+
+    /* HERO */
+    .hero {{ position:relative; z-index:1; background:var(--forest); padding:9rem 3rem 5rem; overflow:hidden; }}
+    .blob {{ position:absolute; border-radius:50%; filter:blur(80px); opacity:0.2; pointer-events:none; }}
+    .blob-1 {{ width:500px; height:500px; background:var(--sage); top:-150px; right:-100px; }}
+    .blob-2 {{ width:300px; height:300px; background:var(--gold); bottom:-80px; left:5%; }}
+    .hero-inner {{ max-width:900px; margin:0 auto; position:relative; z-index:2; }}
+    .back-link {{ display:inline-flex; align-items:center; gap:0.4rem; margin-bottom:2rem; font-size:0.85rem; color:var(--cream); opacity:0.6; text-decoration:none; transition:opacity .2s; }}
+    .back-link:hover {{ opacity:1; }}
+    .route-display {{ display:flex; align-items:center; gap:2rem; margin-bottom:2rem; }}
+    .country-block {{ text-align:center; }}
+    .country-flag {{ font-size:4rem; line-height:1; display:block; margin-bottom:0.5rem; }}
+    .country-name {{ font-size:0.75rem; font-weight:500; text-transform:uppercase; letter-spacing:0.1em; color:rgba(245,240,232,0.6); }}
+    .route-arrow {{ font-size:2rem; color:var(--gold); display:flex; flex-direction:column; align-items:center; gap:0.25rem; }}
+    .route-arrow span {{ font-size:0.65rem; opacity:0.5; text-transform:uppercase; letter-spacing:0.08em; color:var(--cream); }}
+    .hero h1 {{ font-family:'Playfair Display',serif; font-weight:900; color:var(--cream); font-size:clamp(2rem,5vw,3.5rem); line-height:1.1; letter-spacing:-0.02em; margin-bottom:1rem; }}
+    .meta-chip {{ display:inline-flex; align-items:center; gap:0.4rem; margin-right:0.5rem; margin-top:0.5rem; background:rgba(245,240,232,0.1); border:1px solid rgba(245,240,232,0.2); color:var(--cream); font-size:0.8rem; padding:0.35rem 0.85rem; border-radius:100px; }}
+
+    @media print {{
+      nav {{ display:none; }}
+      .hero {{ padding:2rem; }}
+      body::before {{ display:none; }}
+    }}
+    @media (max-width:640px) {{
+      nav {{ padding:1rem 1.5rem; }}
+      .hero {{ padding:7rem 1.5rem 3rem; }}
+      .route-display {{ gap:1rem; }}
+      .country-flag {{ font-size:2.5rem; }}
+    }}
+  </style>
+  <link rel="stylesheet" href="../{assets_dir:raw}/{stylesheet:raw}" media="print" onload="this.media='all'"/>
+  <noscript><link rel="stylesheet" href="../{assets_dir:raw}/{stylesheet:raw}"/></noscript>
+</head>
+<body>
+
+<nav class="no-print">
+  <a href="../index.html" class="logo">Pet<span>Passport</span></a>
+  <div class="breadcrumb">
+    <a href="../index.html">Home</a> /
+    <a href="../{hub_dir:raw}/{origin_hub:raw}.html">{origin}</a> /
+    <span>{origin} → {destination}</span>
+  </div>
+</nav>
+
+<section class="hero">
+  <div class="blob blob-1"></div>
+  <div class="blob blob-2"></div>
+  <div class="hero-inner">
+    <a href="../index.html" class="back-link no-print">← Back to search</a>
+    <div class="route-display">
+      <div class="country-block">
+        <span class="country-flag">{origin_flag}</span>
+        <span class="country-name">{origin}</span>
+      </div>
+      <div class="route-arrow"><span>traveling</span>✈<span>with pet</span></div>
+      <div class="country-block">
+        <span class="country-flag">{dest_flag}</span>
+        <span class="country-name">{destination}</span>
+      </div>
+    </div>
+    <h1>Bringing your {animal_lower} from {origin} to {destination} {animal_emoji}</h1>
+    <div>
+      <span class="meta-chip">🐾 {animal}</span>
+      <span class="meta-chip">🌍 International route</span>
+      <span class="meta-chip">✅ Requirements verified</span>
+    </div>
+  </div>
+</section>
+
+<main class="content">
+
+  <!-- Requirements card -->
+  <div class="card">
+    <p class="card-label">Official import requirements</p>
+    <h2>What you need to enter {destination} with a {animal_lower}</h2>
+    <ul class="check-list">
+      {checklist:html}
+    </ul>
+  </div>
+
+  <!-- Detailed checklist -->
+  <div class="card">
+    <p class="card-label">📋 Detailed checklist</p>
+    <h2>Documentation & preparation</h2>
+    <div style="font-size:0.95rem; line-height:1.7; color:#374151;">
+      {detailed_html:html}
+    </div>
+  </div>
+
+  <!-- Related routes (índice invertido) -->
+  {related_html:html}
+
+  <!-- WHERE TO STAY — Booking.com -->
+  <div class="hotel-card no-print">
+    <div>
+      <p class="card-label" style="color:rgba(255,255,255,0.5);">🏨 Accommodation</p>
+      <h3>Where to Stay</h3>
+      <p>Traveling to {destination}? Search thousands of Pet-Friendly hotels and find the perfect place for you and your {animal_lower}.</p>
+    </div>
+    <a href="{booking_url:raw}" class="btn-booking" target="_blank" rel="noopener sponsored">
+      🏨 Find Pet-Friendly Hotels in {destination}
+    </a>
+  </div>
+
+  <!-- HEALTH & SAFETY — Insurance placeholder -->
+  <div class="insurance-card no-print">
+    <div>
+      <p class="card-label" style="color:rgba(255,255,255,0.5);">🛡️ Health & Safety</p>
+      <h3>Travel Insurance</h3>
+      <p>Important: Travel insurance with pet coverage is required for this route. Make sure your {animal_lower} is covered before departure.</p>
+    </div>
+    <a href="#" class="btn-insurance" target="_blank" rel="noopener sponsored">
+      🛡️ Get a Quote
+    </a>
+  </div>
+
+  <!-- SHOP ON AMAZON -->
+  <div class="amazon-card no-print">
+    <div>
+      <p class="card-label" style="color:rgba(255,255,255,0.4);">🛒 Travel Essentials</p>
+      <h3>Shop for Your Trip</h3>
+      <p>Carriers, crates, travel bowls, health accessories — everything your {animal_lower} needs, shipped from your local Amazon.</p>
+    </div>
+    <a href="{amazon_url:raw}" class="btn-amazon" target="_blank" rel="noopener sponsored">
+      🛒 Shop on Amazon
+    </a>
+  </div>
+
+  <!-- PDF -->
+  <div style="text-align:center; margin-bottom:2rem;" class="no-print">
+    <button onclick="window.print()" class="btn-ghost" style="background:var(--forest); border:none; cursor:pointer;">
+      📄 Save this guide as PDF
+    </button>
+  </div>
+
+  <p class="disclaimer">
+    ⚠️ Requirements change frequently. Always verify current rules with the official veterinary authority of {destination} before traveling. This page is for informational purposes only.
+  </p>
+</main>
+
+<footer>© 2025 PetPassport · {origin} to {destination} · {animal} travel requirements</footer>
+</body>
+</html>"""
+
+_NEEDS_ESCAPE = re.compile(r'[&<>"]')
+
+def escape_html(text) -> str:
+    """Escapa & < > " (mantém apóstrofos, ex.: "Côte d'Ivoire")."""
+    text = str(text)
+    if not _NEEDS_ESCAPE.search(text):
+        return text
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+class PageTemplate:
+    """
+    Template pré-compilado: o texto é quebrado UMA vez em segmentos estáticos,
+    já codificados em UTF-8, e slots tipados. render() devolve a página como
+    lista de buffers (segmentos compartilhados + valores), sem montar a string
+    inteira; cada campo é escapado e codificado uma única vez, mesmo que
+    apareça várias vezes na página.
+    """
+    KINDS = {"text": escape_html, "html": str, "raw": str}
+
+    def __init__(self, source: str, minify: bool = False):
+        self.minify = minify
+        self.fields = {}    # nome → tipo
+        self._parts = []    # bytes estáticos ou None (posição de um slot)
+        self._slots = []    # (índice em _parts, nome)
+        literal = []
+        for text, name, spec, _ in string.Formatter().parse(source):
+            literal.append(text)
+            if name is None:
+                continue
+            kind = spec or "text"
+            if kind not in self.KINDS:
+                raise ValueError(f"Tipo de slot desconhecido: {name}:{kind}")
+            if self.fields.setdefault(name, kind) != kind:
+                raise ValueError(f"Slot {name!r} usado com tipos diferentes")
+            if any(literal):
+                self._parts.append(self._static("".join(literal)))
+            literal = []
+            self._slots.append((len(self._parts), name))
+            self._parts.append(None)
+        if any(literal):
+            self._parts.append(self._static("".join(literal)))
+        self.static_bytes = sum(len(p) for p in self._parts if p is not None)
+        self.signature    = hashlib.sha1(source.encode("utf-8") + (b"\0min" if minify else b"")).digest()
+
+    def _static(self, text: str) -> bytes:
+        # Minificar os segmentos estáticos uma vez equivale a minificar cada
+        # página: os slots só inserem texto, nunca abrem <style>/<pre>/comentários
+        return (minify_html(text) if self.minify else text).encode("utf-8")
+
+    def _encode(self, values: dict) -> dict:
+        kinds = self.KINDS
+        return {name: kinds[kind](values[name]).encode("utf-8")
+                for name, kind in self.fields.items()}
+
+    def _assemble(self, encoded: dict) -> list[bytes]:
+        out = self._parts.copy()
+        for i, name in self._slots:
+            out[i] = encoded[name]
+        return out
+
+    def render(self, values: dict) -> list[bytes]:
+        return self._assemble(self._encode(values))
+
+    def render_hashed(self, values: dict) -> tuple[list[bytes], str]:
+        """
+        Como render(), mais um hash do conteúdo da página calculado sobre a
+        assinatura do template + valores dos slots (~1 KB) em vez dos ~20 KB
+        da página: mesma página ⇔ mesmo hash, sem reler os buffers.
+        """
+        encoded = self._encode(values)
+        h = hashlib.sha1(self.signature)
+        h.update(b"\0".join(encoded.values()))
+        return self._assemble(encoded), h.hexdigest()
+
+ROUTE_PAGE = PageTemplate(PAGE_TEMPLATE)
+
+@functools.lru_cache(maxsize=None)
+def route_page(minify: bool = False, lang: str | None = None) -> PageTemplate:
+    """
+    Template da rota no idioma; cada variante (idioma × minificação) é
+    compilada na primeira vez que é pedida.
+    """
+    if lang in (None, DEFAULT_LOCALE) and not minify:
+        return ROUTE_PAGE
+    return PageTemplate(localize(PAGE_TEMPLATE, lang), minify=minify)
+
+@functools.lru_cache(maxsize=None)
+def route_stylesheet() -> tuple[str, bytes]:
+    """(nome do arquivo, conteúdo) do CSS compartilhado: route.<hash>.css, já minificado."""
+    data = minify_css(ROUTE_CSS).encode("utf-8")
+    return f"route.{content_hash(data)[:12]}.css", data
+
+# ── Base do Tailwind (preflight) ─────────────────────────────────────────────
+# O script da CDN do Tailwind compilava CSS no navegador de cada visitante,
+# mas nenhuma página usa classes utilitárias: o único efeito era o preflight
+# (reset de base). No lugar dele vai um CSS estático em assets/ com só a parte
+# do preflight cujos elementos aparecem no markup, com hash no nome (cache
+# longo). É carregado antes do CSS inline: line-height e afins mexem no
+# layout da primeira dobra.
+PREFLIGHT = [
+    ("*,::before,::after",           "border-width:0;border-style:solid;border-color:#e5e7eb"),
+    ("html",                         "line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4;"
+                                     "font-family:ui-sans-serif,system-ui,sans-serif"),
+    ("body",                         "margin:0;line-height:inherit"),
+    ("hr",                           "height:0;color:inherit;border-top-width:1px"),
+    ("h1,h2,h3,h4,h5,h6",            "font-size:inherit;font-weight:inherit"),
+    ("a",                            "color:inherit;text-decoration:inherit"),
+    ("b,strong",                     "font-weight:bolder"),
+    ("small",                        "font-size:80%"),
+    ("table",                        "text-indent:0;border-color:inherit;border-collapse:collapse"),
+    ("button,input,select,textarea", "font-family:inherit;font-size:100%;font-weight:inherit;"
+                                     "line-height:inherit;color:inherit;margin:0;padding:0"),
+    ("button,select",                "text-transform:none"),
+    ("button",                       "-webkit-appearance:button;background-color:transparent;"
+                                     "background-image:none;cursor:pointer"),
+    ("blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre", "margin:0"),
+    ("ol,ul,menu",                   "list-style:none;margin:0;padding:0"),
+    ("textarea",                     "resize:vertical"),
+    ("input::placeholder,textarea::placeholder", "opacity:1;color:#9ca3af"),
+    ("img,svg,video,canvas,audio,iframe,embed,object", "display:block;vertical-align:middle"),
+    ("img,video",                    "max-width:100%;height:auto"),
+]
+
+_TAG        = re.compile(r"<([a-zA-Z][a-zA-Z0-9]*)")
+_CLASS_ATTR = re.compile(r'class="([^"{}]*)"')
+_CSS_CLASS  = re.compile(r"\.([A-Za-z_][\w-]*)")
+_STYLE_TAG  = re.compile(r"<style>(.*?)</style>", re.S)
+
+def template_css(source: str) -> str:
+    """CSS dos blocos <style> de um template (sem o escape {{ }} do format)."""
+    return "\n".join(_STYLE_TAG.findall(source)).replace("{{", "{").replace("}}", "}")
+
+def purge_preflight(markup: str) -> str:
+    """Regras do PREFLIGHT que valem para algum elemento presente no markup."""
+    tags  = {tag.lower() for tag in _TAG.findall(markup)}
+    rules = []
+    for selectors, declarations in PREFLIGHT:
+        keep = [sel for sel in selectors.split(",")
+                if sel.startswith(("*", ":")) or sel.split(":")[0] in tags]
+        if keep:
+            rules.append(f"{','.join(keep)}{{{declarations}}}")
+    return "\n".join(rules)
+
+def undefined_classes(markup: str, css: str) -> list[str]:
+    """Classes usadas no markup sem nenhuma regra no CSS (utilitários que o Tailwind gerava)."""
+    used = {name for attr in _CLASS_ATTR.findall(markup) for name in attr.split()}
+    return sorted(used - set(_CSS_CLASS.findall(css)))
+
+def page_markup() -> str:
+    """Markup de uma página de rota: o template e os fragmentos que os slots inserem."""
+    return (PAGE_TEMPLATE + build_checklist("Probe · Probe") + detailed_fragment("")
+            + related_fragment((("probe", "UK", "USA", "Dog"),)))
+
+def preflight_stylesheet(kind: str, markup: str) -> tuple[str, bytes]:
+    """(nome do arquivo, conteúdo) do preflight purgado para o markup: <kind>.<hash>.css."""
+    data = (purge_preflight(markup) + "\n").encode("utf-8")
+    return f"{kind}.{content_hash(data)[:12]}.css", data
+
+@functools.lru_cache(maxsize=None)
+def base_stylesheet() -> tuple[str, bytes]:
+    """Preflight das páginas de rota (base.<hash>.css)."""
+    return preflight_stylesheet("base", page_markup())
+
+# A home (index.html) é escrita à mão e o build não mexe nela: o preflight
+# dos elementos que ela usa (inclusive os que o script monta) vai para
+# assets/home.<hash>.css, e o <link> do index.html é conferido a cada build.
+# Se o nome mudou, o build avisa qual colocar e mantém o arquivo antigo
+# enquanto o index.html ainda apontar para ele.
+INDEX_HTML  = "index.html"
+_HOME_LINK  = re.compile(r'href="/?(' + re.escape(ASSETS_DIR) + r'/home\.[0-9a-f]+\.css)"')
+
+def home_stylesheet(path: str = INDEX_HTML) -> tuple[str, bytes] | None:
+    """Preflight da home (home.<hash>.css); None sem index.html."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return preflight_stylesheet("home", f.read())
+
+def index_stylesheet_link(path: str = INDEX_HTML) -> str | None:
+    """assets/home.<hash>.css para onde o index.html aponta hoje (None se nenhum)."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        m = _HOME_LINK.search(f.read())
+    return m.group(1) if m else None
+
+# ── Fontes ───────────────────────────────────────────────────────────────────
+# Os pesos saem do próprio CSS dos templates; os pesos do CSS inline (primeira
+# dobra) ganham <link rel="preload">. Os @font-face ficam inline na página e
+# apontam para assets/fonts/<família>-<peso>.<hash>.woff2.
+GOOGLE_FONTS_CSS    = "https://fonts.googleapis.com/css2"
+GOOGLE_FONTS_ORIGIN = "https://fonts.gstatic.com"
+FONT_UNICODES       = ("U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,"
+                       "U+2000-206F,U+2074,U+20AC,U+2122,U+2191,U+2193,U+2212,U+2215,U+FEFF,U+FFFD")
+
+_CSS_RULE    = re.compile(r"([^{}]*)\{([^{}]*)\}")
+_FONT_FAMILY = re.compile(r"font-family:\s*['\"]?([^'\",;]+)")
+_FONT_WEIGHT = re.compile(r"font-weight:\s*(\d+|normal|bold)\b")
+
+class FontFace(NamedTuple):
+    family: str
+    weight: int
+    source: str   # arquivo original em fonts/
+    name:   str   # <família>-<peso>.<hash>.woff2 em assets/fonts/
+
+def font_weights(css: str) -> frozenset[tuple[str, int]]:
+    """
+    (família, peso) de FONT_SOURCES usados pelo CSS. Regra com peso e sem
+    família herda a família do body; regra com família e sem peso usa 400.
+    """
+    rules = _CSS_RULE.findall(css)
+    body  = next((m.group(1).strip() for sel, decls in rules
+                  if sel.strip() == "body" and (m := _FONT_FAMILY.search(decls))), None)
+    used  = {(body, 400)}
+    for _, decls in rules:
+        family, weight = _FONT_FAMILY.search(decls), _FONT_WEIGHT.search(decls)
+        if family or weight:
+            w = weight.group(1) if weight else "400"
+            used.add((family.group(1).strip() if family else body,
+                      {"normal": 400, "bold": 700}.get(w) or int(w)))
+    return frozenset((family, weight) for family, weight in used if family in FONT_SOURCES)
+
+@functools.lru_cache(maxsize=None)
+def template_fonts(kind: str) -> tuple[frozenset, frozenset]:
+    """(pesos usados, pesos do CSS inline) do template "route" ou "hub"."""
+    inline = template_css(PAGE_TEMPLATE if kind == "route" else HUB_TEMPLATE)
+    shared = ROUTE_CSS if kind == "route" else ""
+    return font_weights(inline + shared), font_weights(inline)
+
+@functools.lru_cache(maxsize=None)
+def _font_tools():
+    try:
+        from fontTools import subset
+        import brotli   # noqa: F401 — o fontTools precisa dele para gravar WOFF2
+    except ImportError:
+        return None
+    return subset
+
+@functools.lru_cache(maxsize=None)
+def font_faces() -> tuple[FontFace, ...]:
+    """
+    WOFF2 auto-hospedados para todos os pesos usados por rotas e hubs; vazio
+    (→ Google Fonts) se faltar o fonttools/brotli ou algum arquivo em fonts/.
+    """
+    used    = template_fonts("route")[0] | template_fonts("hub")[0]
+    sources = {family: os.path.join(FONTS_DIR, FONT_SOURCES[family]) for family, _ in used}
+    if _font_tools() is None or not all(map(os.path.exists, sources.values())):
+        return ()
+    digests = {}
+    for family, path in sources.items():
+        with open(path, "rb") as f:
+            digests[family] = content_hash(f.read() + FONT_UNICODES.encode("ascii"))
+    return tuple(FontFace(family, weight, sources[family],
+                          f"{slugify(family)}-{weight}.{digests[family][:12]}.woff2")
+                 for family, weight in sorted(used))
+
+@functools.lru_cache(maxsize=None)
+def fonts_fragment(kind: str, prefix: str = "../") -> str:
+    """<head> das fontes do template: preload + @font-face, ou o link do Google Fonts."""
+    used, critical = template_fonts(kind)
+    faces = [face for face in font_faces() if (face.family, face.weight) in used]
+    if not faces:
+        families = "&".join(
+            f"family={family.replace(' ', '+')}:wght@" + ";".join(str(w) for f, w in sorted(used) if f == family)
+            for family in sorted({family for family, _ in used}))
+        if not used:
+            return ""
+        # Sem bloquear a renderização: o texto aparece na fonte do sistema e
+        # troca quando o CSS do Google chegar (display=swap)
+        href = escape_html(f"{GOOGLE_FONTS_CSS}?{families}&display=swap")
+        return (f'\n  <link rel="preconnect" href="{GOOGLE_FONTS_ORIGIN}" crossorigin/>'
+                f'\n  <link href="{href}" rel="stylesheet" media="print" onload="this.media=\'all\'"/>'
+                f'\n  <noscript><link href="{href}" rel="stylesheet"/></noscript>')
+    urls     = {face: f"{prefix}{ASSETS_DIR}/fonts/{face.name}" for face in faces}
+    preload  = "".join(f'\n  <link rel="preload" href="{urls[face]}" as="font" type="font/woff2" crossorigin/>'
+                       for face in faces if (face.family, face.weight) in critical)
+    rules    = "".join(f"    @font-face{{font-family:'{face.family}';font-style:normal;font-weight:{face.weight};"
+                       f"font-display:swap;src:url({urls[face]}) format('woff2')}}\n" for face in faces)
+    return f"{preload}\n  <style>\n{rules}  </style>"
+
+def subset_font(face: FontFace) -> bytes:
+    """WOFF2 de um peso da fonte, só com FONT_UNICODES (fontes variáveis são fixadas no peso)."""
+    import io
+    from fontTools.ttLib import TTFont
+    subset = _font_tools()
+    font   = TTFont(face.source)
+    if "fvar" in font:
+        from fontTools.varLib import instancer
+        axes = {axis.axisTag: axis.defaultValue for axis in font["fvar"].axes}
+        axes["wght"] = face.weight
+        font = instancer.instantiateVariableFont(font, axes)
+    options = subset.Options()
+    options.flavor = "woff2"
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=subset.parse_unicodes(FONT_UNICODES))
+    subsetter.subset(font)
+    font.flavor = "woff2"
+    buf = io.BytesIO()
+    font.save(buf)
+    return buf.getvalue()
+
+# ── Idiomas ──────────────────────────────────────────────────────────────────
+# Cada linha é lida, normalizada e vira Route uma vez só; o fan-out por idioma
+# acontece no render, que preenche o template de cada idioma com os mesmos
+# fragmentos (checklist, detalhamento) já cacheados. Um idioma a mais custa
+# só a montagem da página.
+DEFAULT_LOCALE = next(iter(LOCALES))
+
+def translate(text: str, lang: str | None) -> str:
+    return UI_STRINGS.get(lang, {}).get(text, text)
+
+def localize(source: str, lang: str | None) -> str:
+    """
+    Texto do template no idioma. Fora do idioma padrão as páginas ficam um
+    nível abaixo (routes/<pasta>/), então os links relativos sobem mais um.
+    Texto de UI_STRINGS que não aparece nem no template nem nos fragmentos
+    (page_markup) é erro: o template mudou e a tradução ficou para trás.
+    """
+    if lang in (None, DEFAULT_LOCALE):
+        return source
+    for text, translated in UI_STRINGS.get(lang, {}).items():
+        if text in source:
+            source = source.replace(text, translated)
+        elif text not in page_markup():
+            raise ValueError(f"UI_STRINGS[{lang!r}]: texto não encontrado no template: {text[:60]!r}")
+    return source.replace('href="../', 'href="../../')
+
+def country_name(raw: str, lang: str | None) -> str:
+    if lang in (None, DEFAULT_LOCALE):
+        return raw
+    return COUNTRY_NAMES.get(lang, {}).get(country(raw).slug, raw)
+
+def country_phrase(raw: str, lang: str | None, preposition: str) -> str:
+    """Preposição + país com a contração do idioma: ("USA", "pt", "em") → "nos Estados Unidos"."""
+    name    = country_name(raw, lang)
+    article = COUNTRY_ARTICLES.get(lang, {}).get(country(raw).slug)
+    if not article:
+        return f"{preposition} {name}"
+    return f"{CONTRACTIONS[lang][preposition][article]} {name}"
+
+def animal_name(raw: str, lang: str | None) -> str:
+    if lang in (None, DEFAULT_LOCALE):
+        return raw
+    name = ANIMAL_NAMES.get(lang, {}).get(animal_info(raw).lower.strip())
+    return name.capitalize() if name else raw
+
+def locale_dir(lang: str | None) -> str:
+    return OUTPUT_DIR if lang in (None, DEFAULT_LOCALE) else os.path.join(OUTPUT_DIR, lang)
+
+def route_file(slug: str, lang: str | None = None) -> str:
+    """Caminho local da página da rota no idioma."""
+    return os.path.join(locale_dir(lang), f"{slug}.html")
+
+def route_files(slug: str) -> list[str]:
+    """As páginas da rota em todos os idiomas (a do idioma padrão primeiro)."""
+    return [route_file(slug, lang) for lang in LOCALES]
+
+def route_repo_path(slug: str, lang: str | None = None) -> str:
+    if lang in (None, DEFAULT_LOCALE):
+        return f"routes/{slug}.html"
+    return f"routes/{lang}/{slug}.html"
+
+def route_alternates(slug: str) -> list[tuple[str, str]]:
+    """(hreflang, URL) de cada idioma + x-default; vazio com um idioma só."""
+    if len(LOCALES) < 2:
+        return []
+    urls = [(code, f"{SITE_DOMAIN}/{route_repo_path(slug, lang)}") for lang, code in LOCALES.items()]
+    return urls + [("x-default", urls[0][1])]
+
+def make_output_dirs():
+    for lang in LOCALES:
+        os.makedirs(locale_dir(lang), exist_ok=True)
+
+# ── Páginas hub por país ─────────────────────────────────────────────────────
+# countries/<país>.html: todas as rotas que saem e que chegam ao país, na
+# ordem da planilha. O breadcrumb de cada página de rota aponta para o hub
+# da origem.
+HUB_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8"/>
+  <meta name="viewport" content="width=device-width, initial-scale=1.0"/>
+  <title>Pet Travel to and from {country} — PetPassport</title>
+  <meta name="description" content="Pet import and export requirements for {country}: {route_count} routes for dogs, cats and other pets traveling from and to {country}."/>{fonts_html:html}
+  <style>
+    :root {{
+      --cream: #F5F0E8; --forest: #1C3A2B;
+      --sage: #4A7C59;  --gold: #C9A84C;
+      --mist: #E8EFE9;
+    }}
+    * {{ box-sizing: border-box; margin: 0; padding: 0; }}
+    body {{ font-family: 'DM Sans', sans-serif; background: var(--cream); color: var(--forest); }}
+    nav {{
+      position: fixed; top: 0; left: 0; right: 0; z-index: 100;
+      display: flex; align-items: center; justify-content: space-between;
+      padding: 1.25rem 3rem;
+      background: rgba(245,240,232,0.88); backdrop-filter: blur(12px);
+      border-bottom: 1px solid rgba(74,124,89,0.15);
+    }}
+    .logo {{ font-family:'Playfair Display',serif; font-size:1.4rem; font-weight:900; color:var(--forest); text-decoration:none; }}
+    .logo span {{ color: var(--sage); }}
+    .breadcrumb {{ font-size:0.78rem; opacity:0.55; display:flex; align-items:center; gap:0.4rem; }}
+    .breadcrumb a {{ color:var(--forest); text-decoration:none; }}
+
+    /* HERO */
+    .hero {{ background:var(--forest); padding:9rem 3rem 4rem; }}
+    .hero-inner {{ max-width:900px; margin:0 auto; }}
+    .country-flag {{ font-size:4rem; line-height:1; display:block; margin-bottom:1rem; }}
+    .hero h1 {{ font-family:'Playfair Display',serif; font-weight:900; color:var(--cream); font-size:clamp(2rem,5vw,3.5rem); line-height:1.1; letter-spacing:-0.02em; margin-bottom:1rem; }}
+    .hero p {{ color:rgba(245,240,232,0.6); font-size:0.95rem; }}
+
+    /* CONTENT */
+    .content {{ max-width:900px; margin:0 auto; padding:4rem 3rem; }}
+    .card {{ background:white; border-radius:24px; padding:2.5rem; box-shadow:0 4px 40px rgba(28,58,43,0.08); margin-bottom:2rem; }}
+    .card-label {{ font-size:0.7rem; font-weight:500; text-transform:uppercase; letter-spacing:0.12em; color:var(--sage); margin-bottom:1rem; }}
+    .card h2 {{ font-family:'Playfair Display',serif; font-size:1.4rem; font-weight:700; margin-bottom:1.5rem; }}
+    .related-list {{ list-style:none; display:grid; grid-template-columns:repeat(auto-fill,minmax(240px,1fr)); gap:0.75rem; }}
+    .related-list a {{ display:block; padding:0.85rem 1rem; border-radius:14px; background:var(--mist); color:var(--forest); text-decoration:none; font-size:0.9rem; transition:background .2s; }}
+    .related-list a:hover {{ background:rgba(74,124,89,0.18); }}
+    footer {{ border-top:1px solid rgba(74,124,89,0.15); padding:2rem 3rem; text-align:center; font-size:0.78rem; opacity:0.45; }}
+
+    @media (max-width:640px) {{
+      nav {{ padding:1rem 1.5rem; }}
+      .hero {{ padding:7rem 1.5rem 3rem; }}
+      .content {{ padding:2rem 1.5rem; }}
+    }}
+  </style>
+</head>
+<body>
+
+<nav>
+  <a href="../index.html" class="logo">Pet<span>Passport</span></a>
+  <div class="breadcrumb">
+    <a href="../index.html">Home</a> /
+    <span>{country}</span>
+  </div>
+</nav>
+
+<section class="hero">
+  <div class="hero-inner">
+    <span class="country-flag">{flag}</span>
+    <h1>Traveling with pets to and from {country}</h1>
+    <p>{route_count} pet travel guides · updated from official sources</p>
+  </div>
+</section>
+
+<div class="content">
+  {from_html:html}
+  {to_html:html}
+</div>
+
+<footer>© 2025 PetPassport · {country} pet travel requirements</footer>
+</body>
+</html>"""
+
+@functools.lru_cache(maxsize=None)
+def hub_page(minify: bool = False) -> PageTemplate:
+    return PageTemplate(HUB_TEMPLATE, minify=minify)
+
+def hub_list_fragment(label: str, title: str, routes) -> str:
+    """Card com links para as páginas de rota; routes = (slug, origem, destino, animal)."""
+    items = "\n".join(f'      <li><a href="../{OUTPUT_DIR}/{slug}.html">{route_label(o, d, a)}</a></li>'
+                      for slug, o, d, a in routes)
+    if not items:
+        return ""
+    return ('<div class="card">\n'
+            f'    <p class="card-label">{label}</p>\n'
+            f'    <h2>{escape_html(title)}</h2>\n'
+            '    <ul class="related-list">\n'
+            f'{items}\n'
+            '    </ul>\n'
+            '  </div>')
+
+def hub_values(index: "RouteIndex", slug: str) -> dict:
+    """Valores dos slots do hub de um país, direto das listas do índice invertido."""
+    name     = index.countries[slug]
+    table    = index.table
+    leaving  = [table.row(pos)[:4] for pos in index.positions("from", slug)]
+    arriving = [table.row(pos)[:4] for pos in index.positions("to", slug)]
+    return {
+        "country":     name,
+        "flag":        get_flag(name),
+        "fonts_html":  fonts_fragment("hub"),
+        "route_count": len(leaving) + len(arriving),
+        "from_html":   hub_list_fragment("🛫 Leaving", f"Traveling from {name}", leaving),
+        "to_html":     hub_list_fragment("🛬 Arriving", f"Traveling to {name}", arriving),
+    }
+
+def route_label(origin: str, destination: str, animal: str, lang: str | None = None) -> str:
+    """"🇧🇷 Brazil → 🇵🇹 Portugal · 🐕 Dog", já escapado para HTML."""
+    return (f"{get_flag(origin)} {escape_html(country_name(origin, lang))} → {get_flag(destination)} "
+            f"{escape_html(country_name(destination, lang))} · {get_animal_emoji(animal)} "
+            f"{escape_html(animal_name(animal, lang))}")
+
+def related_fragment(related: tuple, lang: str | None = None) -> str:
+    if not related:
+        return ""
+    items = "\n".join(f'      <li><a href="{slug}.html">{route_label(o, d, a, lang)}</a></li>'
+                      for slug, o, d, a in related)
+    return ('<div class="card no-print">\n'
+            f'    <p class="card-label">{translate("🧭 Related routes", lang)}</p>\n'
+            f'    <h2>{translate("Other pet travel guides", lang)}</h2>\n'
+            '    <ul class="related-list">\n'
+            f'{items}\n'
+            '    </ul>\n'
+            '  </div>')
+
+def alternates_fragment(slug: str) -> str:
+    return "".join(f'\n  <link rel="alternate" hreflang="{code}" href="{escape_html(url)}"/>'
+                   for code, url in route_alternates(slug))
+
+def page_values(route: Route, amazon_url, booking_url, lang: str | None = None) -> dict:
+    """Valores dos slots de route_page(…, lang) para uma rota."""
+    animal = animal_info(route.animal)
+    name   = animal_name(route.animal, lang)
+    values = {
+        "origin":          country_name(route.origin, lang),
+        "destination":     country_name(route.destination, lang),
+        "animal":          name,
+        "animal_lower":    animal.lower if name is route.animal else name.lower(),
+        "origin_flag":     get_flag(route.origin),
+        "dest_flag":       get_flag(route.destination),
+        "animal_emoji":    animal.emoji,
+        "alternates_html": alternates_fragment(route.slug),
+        "checklist":       build_checklist(route.requirements),
+        "detailed_html":   detailed_fragment(route.detailed, lang),
+        "related_html":    related_fragment(route.related, lang),
+        "hub_dir":         HUB_DIR,
+        "assets_dir":      ASSETS_DIR,
+        "stylesheet":      route_stylesheet()[0],
+        "fonts_html":      fonts_fragment("route", "../" if lang in (None, DEFAULT_LOCALE) else "../../"),
+        "base_stylesheet": base_stylesheet()[0],
+        "origin_hub":      country(route.origin).slug,
+        "booking_url":     booking_url,
+        "amazon_url":      amazon_url,
+    }
+    if lang in COUNTRY_ARTICLES:
+        values.update(de_origin=country_phrase(route.origin, lang, "de"),
+                      para_destination=country_phrase(route.destination, lang, "para"),
+                      em_destination=country_phrase(route.destination, lang, "em"),
+                      de_destination=country_phrase(route.destination, lang, "de"))
+    return values
+
+def render_page(route: Route, amazon_url, booking_url, minify: bool = False,
+                lang: str | None = None) -> list[bytes]:
+    """Página da rota como lista de buffers UTF-8, pronta para write_buffers()."""
+    return route_page(minify, lang).render(page_values(route, amazon_url, booking_url, lang))
+
+def generate_html(route: Route, amazon_url, booking_url, minify: bool = False,
+                  lang: str | None = None) -> str:
+    return b"".join(render_page(route, amazon_url, booking_url, minify, lang)).decode("utf-8")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# MINIFICAÇÃO E PRÉ-COMPRESSÃO
+# ══════════════════════════════════════════════════════════════════════════════
+# A minificação só colapsa espaços (como o navegador já faz), remove
+# comentários e compacta o CSS; conteúdo de <script>/<pre>/<textarea> e
+# strings do CSS ficam intactos. A pré-compressão grava .gz (sempre) e .br
+# (se o pacote "brotli" estiver instalado) para o host servir direto.
+_HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_RAW_BLOCK    = re.compile(r"(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)", re.S | re.I)
+_CSS_SKIP     = re.compile(r"""/\*.*?\*/|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'""", re.S)
+_WHITESPACE   = re.compile(r"\s+")
+_CSS_PUNCT    = re.compile(r" ?([{};,>]) ?|(:) ")
+
+def _squeeze_css(chunk: str) -> str:
+    chunk = _CSS_PUNCT.sub(lambda m: m.group(1) or m.group(2), _WHITESPACE.sub(" ", chunk))
+    return chunk.replace(";}", "}")
+
+def minify_css(css: str) -> str:
+    out, pos = [], 0
+    for m in _CSS_SKIP.finditer(css):
+        out.append(_squeeze_css(css[pos:m.start()]))
+        if not m.group().startswith("/*"):
+            out.append(m.group())   # strings ficam como estão
+        pos = m.end()
+    out.append(_squeeze_css(css[pos:]))
+    return "".join(out).strip()
+
+def minify_html(html: str) -> str:
+    html = _HTML_COMMENT.sub("", html)
+    out, pos = [], 0
+    for m in _RAW_BLOCK.finditer(html):
+        out.append(_WHITESPACE.sub(" ", html[pos:m.start()]))
+        open_tag, tag, body, close = m.groups()
+        out.append(_WHITESPACE.sub(" ", open_tag))
+        out.append(minify_css(body) if tag.lower() == "style" else body)
+        out.append(close)
+        pos = m.end()
+    out.append(_WHITESPACE.sub(" ", html[pos:]))
+    return "".join(out)
+
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+@functools.lru_cache(maxsize=None)
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        print("⚠️  Pacote 'brotli' não instalado (pip install brotli): gerando só .gz.")
+        return None
+    return brotli
+
+def needs_precompress(path: str) -> bool:
+    """True se o .gz não existe ou é mais antigo que o arquivo original."""
+    try:
+        return os.stat(path + ".gz").st_mtime_ns < os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return True
+
+def precompress_file(path: str) -> int:
+    """Grava path.gz (e path.br). Retorna o tamanho do .gz."""
+    with open(path, "rb") as f:
+        data = f.read()
+    # mtime=0 → bytes determinísticos (o git não vê mudança quando o conteúdo é igual)
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(path + ".gz", "wb") as f:
+        f.write(gz)
+    brotli = _brotli()
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+    return len(gz)
+
+def drop_precompressed(paths) -> list[str]:
+    """Apaga os .gz/.br destes arquivos. Retorna os caminhos apagados."""
+    dropped = []
+    for path in paths:
+        for ext in COMPRESSED_SUFFIXES:
+            if os.path.exists(path + ext):
+                os.remove(path + ext)
+                dropped.append((path + ext).replace(os.sep, "/"))
+    return dropped
+
+def _precompress_chunk(paths: list[str]) -> int:
+    return sum(precompress_file(p) for p in paths)
+
+def precompress_files(paths: list[str], jobs: int = 1) -> int:
+    """Pré-comprime os arquivos, em paralelo se jobs > 1. Retorna bytes .gz gerados."""
+    if jobs <= 1 or len(paths) < 2:
+        return _precompress_chunk(paths)
+    from concurrent.futures import ProcessPoolExecutor
+    size   = max(1, min(RENDER_CHUNK_MAX, len(paths) // (jobs * 4)))
+    chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+    _brotli()   # avisa uma vez só, no processo principal
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return sum(pool.map(_precompress_chunk, chunks))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# GERADOR DE SITEMAP
+# ══════════════════════════════════════════════════════════════════════════════
+SITEMAP_MAX_URLS  = 50_000              # limite do protocolo por arquivo
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024    # 50 MB (descomprimido)
+ROBOTS_TXT        = "robots.txt"        # lista o sitemap de cada idioma
+
+_URLSET_OPEN  = (b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                 b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+                 b'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n')
+_URLSET_CLOSE = b"</urlset>"
+
+def xml_escape(text: str) -> str:
+    """Mesmo que xml.sax.saxutils.escape(), sem importar urllib/http.client (~40 ms)."""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+class SitemapWriter:
+    """
+    Escreve o sitemap em streaming, URL por URL, sem montar o XML em memória.
+    Até SITEMAP_MAX_URLS URLs gera um único <name>.xml; acima disso grava
+    shards <name>-N.xml.gz e transforma <name>.xml em um índice.
+    """
+
+    def __init__(self, directory: str = ".", name: str = "sitemap"):
+        self.directory = directory
+        self.name      = name
+        self.shards    = []     # [nome do shard, maior lastmod]
+        self.count     = 0
+        self._file     = None
+        self._urls     = 0
+        self._bytes    = 0
+
+    def _open_shard(self):
+        self._close_shard()
+        name = f"{self.name}-{len(self.shards) + 1}.xml.gz"
+        raw  = open(os.path.join(self.directory, name), "wb")
+        # mtime=0 → mesmo conteúdo gera os mesmos bytes (hash estável no manifesto)
+        self._file = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+        self._raw  = raw
+        self._file.write(_URLSET_OPEN)
+        self._urls, self._bytes = 0, len(_URLSET_OPEN) + len(_URLSET_CLOSE)
+        self.shards.append([name, ""])
+
+    def _close_shard(self):
+        if self._file is not None:
+            self._file.write(_URLSET_CLOSE)
+            self._file.close()
+            self._raw.close()
+            self._file = None
+
+    def add(self, loc: str, lastmod: str, changefreq: str | None = None, priority: str | None = None,
+            alternates: list[tuple[str, str]] = ()):
+        entry = f"  <url>\n    <loc>{xml_escape(loc)}</loc>\n"
+        for code, url in alternates:
+            entry += f'    <xhtml:link rel="alternate" hreflang="{code}" href="{xml_escape(url)}"/>\n'
+        entry += f"    <lastmod>{lastmod}</lastmod>\n"
+        if changefreq:
+            entry += f"    <changefreq>{changefreq}</changefreq>\n"
+        if priority:
+            entry += f"    <priority>{priority}</priority>\n"
+        data = (entry + "  </url>\n").encode("utf-8")
+
+        if (self._file is None or self._urls >= SITEMAP_MAX_URLS
+                or self._bytes + len(data) > SITEMAP_MAX_BYTES):
+            self._open_shard()
+        self._file.write(data)
+        self._urls  += 1
+        self._bytes += len(data)
+        self.count  += 1
+        shard = self.shards[-1]
+        shard[1] = max(shard[1], lastmod)
+
+    def close(self) -> list[str]:
+        """Fecha o último shard, escreve <name>.xml e retorna os arquivos gerados."""
+        self._close_shard()
+        index = os.path.join(self.directory, f"{self.name}.xml")
+
+        if len(self.shards) <= 1:
+            # Cabe em um arquivo só: sitemap.xml simples, sem shards
+            with open(index, "wb") as out:
+                if self.shards:
+                    shard = os.path.join(self.directory, self.shards[0][0])
+                    with gzip.open(shard, "rb") as src:
+                        shutil.copyfileobj(src, out)
+                    os.remove(shard)
+                else:
+                    out.write(_URLSET_OPEN + _URLSET_CLOSE)
+            written = [f"{self.name}.xml"]
+        else:
+            with open(index, "w", encoding="utf-8") as out:
+                out.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                          '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+                for name, lastmod in self.shards:
+                    out.write(f"  <sitemap>\n    <loc>{SITE_DOMAIN}/{name}</loc>\n"
+                              f"    <lastmod>{lastmod}</lastmod>\n  </sitemap>\n")
+                out.write("</sitemapindex>")
+            written = [f"{self.name}.xml"] + [name for name, _ in self.shards]
+
+        # Shards de execuções anteriores que não existem mais
+        for stale in glob.glob(os.path.join(self.directory, f"{self.name}-[0-9]*.xml.gz")):
+            if os.path.basename(stale) not in written:
+                os.remove(stale)
+        return written
+
+class RouteSitemap(SitemapWriter):
+    """
+    Sitemap de um idioma: no padrão (sitemap.xml) a home primeiro, depois as
+    rotas na ordem em que chegam; nos outros (sitemap-<idioma>.xml) só as
+    rotas. Cada rota lista as versões nos demais idiomas (hreflang).
+    `home_lastmod` vem do manifesto (record_home); sem ele, hoje.
+    """
+
+    def __init__(self, directory: str = ".", lang: str | None = None, home_lastmod: str | None = None):
+        default = lang in (None, DEFAULT_LOCALE)
+        super().__init__(directory, "sitemap" if default else f"sitemap-{lang}")
+        self.lang  = lang
+        self.today = date.today().isoformat()
+        if default:
+            self.add(f"{SITE_DOMAIN}/", home_lastmod or self.today, priority="1.0")
+
+    def add_route(self, slug: str, lastmod: str | None = None):
+        self.add(f"{SITE_DOMAIN}/{route_repo_path(slug, self.lang)}", lastmod or self.today,
+                 changefreq="monthly", priority="0.8", alternates=route_alternates(slug))
+
+    def add_hub(self, slug: str, lastmod: str | None = None):
+        self.add(f"{SITE_DOMAIN}/{HUB_DIR}/{slug}.html", lastmod or self.today,
+                 changefreq="weekly", priority="0.9")
+
+    def close(self) -> list[str]:
+        written = super().close()
+        if len(written) == 1:
+            print(f"🗺️  {self.name}.xml gerado com {self.count} URLs.")
+        else:
+            print(f"🗺️  {self.name}.xml (índice) gerado com {self.count} URLs em {len(written) - 1} shards.")
+        return written
+
+def write_robots(sitemaps: list[str], directory: str = ".") -> str:
+    """robots.txt apontando para o sitemap de cada idioma. Retorna o nome do arquivo."""
+    lines = ["User-agent: *", "Allow: /", ""] + [f"Sitemap: {SITE_DOMAIN}/{name}" for name in sitemaps]
+    write_if_changed(os.path.join(directory, ROBOTS_TXT), "\n".join(lines) + "\n")
+    return ROBOTS_TXT
+
+class LocaleSitemaps:
+    """
+    Um RouteSitemap por idioma de LOCALES; hubs só no do idioma padrão. O
+    robots.txt lista todos, senão os buscadores só acham o sitemap.xml.
+    """
+
+    def __init__(self, directory: str = ".", home_lastmod: str | None = None):
+        self.directory = directory
+        self.sitemaps  = [RouteSitemap(directory, lang, home_lastmod) for lang in LOCALES]
+
+    def add_route(self, slug: str, lastmod: str | None = None):
+        for sitemap in self.sitemaps:
+            sitemap.add_route(slug, lastmod)
+
+    def add_hub(self, slug: str, lastmod: str | None = None):
+        self.sitemaps[0].add_hub(slug, lastmod)
+
+    def close(self) -> list[str]:
+        written = [path for sitemap in self.sitemaps for path in sitemap.close()]
+        robots  = write_robots([f"{sitemap.name}.xml" for sitemap in self.sitemaps], self.directory)
+        return written + [robots]
+
+def generate_sitemap(slugs, lastmods: dict | None = None, hubs: dict | None = None,
+                     home_lastmod: str | None = None) -> list[str]:
+    """
+    Gera o sitemap a partir dos slugs. `lastmods` mapeia slug → data ISO da
+    última mudança de conteúdo da página (vinda do manifesto); sem ela, usa hoje.
+    `hubs` mapeia país → lastmod dos hubs, listados depois das rotas.
+    Retorna a lista de arquivos escritos (sitemap.xml, sitemap-<idioma>.xml,
+    eventuais shards e o robots.txt).
+    """
+    lastmods = lastmods or {}
+    writer = LocaleSitemaps(home_lastmod=home_lastmod)
+    for slug in slugs:
+        writer.add_route(slug, lastmods.get(slug))
+    for slug in sorted(hubs or ()):
+        writer.add_hub(slug, hubs[slug])
+    return writer.close()
+
+# ── routes.json em streaming ─────────────────────────────────────────────────
+class RoutesJsonWriter:
+    """Escreve routes.json slug a slug; o resultado é idêntico a json.dump(..., indent=2)."""
+
+    def __init__(self, path: str = "routes.json"):
+        self.path  = path
+        self.count = 0
+        self._file = open(path + ".tmp", "w", encoding="utf-8")
+        self._file.write("[")
+
+    def add(self, slug: str):
+        self._file.write(("," if self.count else "") + "\n  " + json.dumps(slug, ensure_ascii=False))
+        self.count += 1
+
+    def close(self):
+        self._file.write("\n]" if self.count else "]")
+        self._file.close()
+        os.replace(self.path + ".tmp", self.path)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ÍNDICE DE BUSCA DA HOME
+# ══════════════════════════════════════════════════════════════════════════════
+# A home carrega só search/index.json (origens, destinos, animais e as rotas
+# populares) no primeiro paint; o shard de uma origem — search/<origem>.json —
+# é baixado quando o visitante escolhe essa origem. O peso inicial não cresce
+# com o número de rotas, só com o número de países.
+SEARCH_POPULAR = 12   # rotas mostradas em "Popular Routes"
+
+def write_if_changed(path: str, text: str) -> bool:
+    """Só reescreve o arquivo se o conteúdo mudou (preserva mtime e evita I/O)."""
+    data = text.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
+
+def _compact_json(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+def replace_if_changed(tmp: str, path: str) -> bool:
+    """Move tmp → path só se o conteúdo mudou (preserva mtime); senão apaga tmp."""
+    if os.path.exists(path) and filecmp.cmp(tmp, path, shallow=False):
+        os.remove(tmp)
+        return False
+    os.replace(tmp, path)
+    return True
+
+class SearchIndexWriter:
+    """
+    Monta o índice de busca em streaming, a partir de (slug, origem, destino,
+    animal, requisitos) na ordem de routes.json. Cada rota vai para o shard da
+    origem (search/<origem>.json) e para o do destino (search/to/<destino>.json),
+    escritos direto em arquivos temporários — há no máximo um arquivo aberto por
+    país e lado — e só destinos, animais e as rotas populares ficam na memória.
+    Com a origem "Any" a home baixa só o shard do destino escolhido.
+    Cada shard guarda as rotas como arrays [slug, outro país, animal, bandeira
+    do outro país, requisitos] para ficar compacto.
+    """
+
+    def __init__(self, directory: str = SEARCH_DIR):
+        os.makedirs(os.path.join(directory, SEARCH_TO_DIR), exist_ok=True)
+        self.directory = directory
+        self.shards    = {}   # slug da origem → {"name", "flag", "count", "file"}
+        self.dests     = {}   # slug do destino → idem, em search/to/
+        self.animals   = set()
+        self.popular   = []
+
+    def _shard(self, shards: dict, subdir: str, side: str, name: str) -> dict:
+        key = country(name).slug
+        shard = shards.get(key)
+        if shard is None:
+            flag = get_flag(name)
+            f = open(os.path.join(self.directory, subdir, f"{key}.json.tmp"), "w", encoding="utf-8")
+            f.write(f'{{"{side}":{_compact_json(name)},"flag":{_compact_json(flag)},"routes":[')
+            shard = shards[key] = {"name": name, "flag": flag, "count": 0, "file": f}
+        return shard
+
+    @staticmethod
+    def _append(shard: dict, route: list):
+        shard["file"].write(("," if shard["count"] else "") + _compact_json(route))
+        shard["count"] += 1
+
+    def add(self, slug: str, origin: str, destination: str, animal: str, req: str):
+        src = self._shard(self.shards, "", "origin", origin)
+        dst = self._shard(self.dests, SEARCH_TO_DIR, "destination", destination)
+        self._append(src, [slug, destination, animal, dst["flag"], req])
+        self._append(dst, [slug, origin, animal, src["flag"], req])
+        self.animals.add(animal)
+        if len(self.popular) < SEARCH_POPULAR:
+            self.popular.append({"slug": slug, "origin": origin, "dest": destination, "animal": animal,
+                                 "of": src["flag"], "df": dst["flag"], "req": req})
+
+    def _close_shards(self, shards: dict, subdir: str) -> list[dict]:
+        """Fecha os shards de um lado e retorna as entradas do index.json, em ordem alfabética."""
+        entries = []
+        for key, shard in shards.items():
+            shard["file"].write("]}")
+            shard["file"].close()
+            tmp = os.path.join(self.directory, subdir, f"{key}.json.tmp")
+            replace_if_changed(tmp, tmp[:-len(".tmp")])
+            entries.append({"name": shard["name"], "flag": shard["flag"],
+                            "shard": "/".join(filter(None, (SEARCH_DIR, subdir, f"{key}.json"))),
+                            "count": shard["count"]})
+        return sorted(entries, key=lambda o: o["name"].lower())
+
+    def close(self) -> list[str]:
+        """Fecha os shards, grava index.json e retorna os caminhos de todos os arquivos."""
+        origins      = self._close_shards(self.shards, "")
+        destinations = self._close_shards(self.dests, SEARCH_TO_DIR)
+        written      = [o["shard"] for o in origins + destinations]
+
+        total = sum(o["count"] for o in origins)
+        index = {
+            "total":        total,
+            "origins":      origins,
+            "destinations": destinations,
+            "animals":      sorted(self.animals, key=str.lower),
+            "popular":      self.popular,
+        }
+        write_if_changed(os.path.join(self.directory, "index.json"), _compact_json(index))
+        written.append(f"{SEARCH_DIR}/index.json")
+
+        # Shards de países que não existem mais
+        for subdir in ("", SEARCH_TO_DIR):
+            for stale in glob.glob(os.path.join(self.directory, subdir, "*.json")):
+                if "/".join(filter(None, (SEARCH_DIR, subdir, os.path.basename(stale)))) not in written:
+                    os.remove(stale)
+
+        print(f"🔎 Índice de busca gerado: {len(origins)} origens, {len(destinations)} destinos, {total} rotas.")
+        return written
+
+def generate_search_index(entries) -> list[str]:
+    """Gera o índice de busca de uma vez a partir de (slug, origem, destino, animal, requisitos)."""
+    writer = SearchIndexWriter()
+    for entry in entries:
+        writer.add(*entry)
+    return writer.close()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# BUILD INCREMENTAL (MANIFESTO)
+# ══════════════════════════════════════════════════════════════════════════════
+# O manifesto guarda, por slug, o hash da linha da planilha, a versão do
+# template e o hash do HTML gerado. Linhas inalteradas não são renderizadas
+# de novo; slugs que sumiram da planilha têm o HTML apagado.
+# O campo "published" guarda o último hash enviado ao GitHub, então o push
+# só considera o que realmente mudou desde o último envio bem-sucedido;
+# "lastmod" é a data em que o HTML da rota mudou pela última vez (sitemap).
+# "deleted" lista caminhos do repo removidos localmente e ainda não no GitHub.
+MANIFEST_VERSION = 2
+
+_TEMPLATE_PROBES = [
+    {"Origin": "Brazil", "Destination": "Portugal", "Animal": "Dog",
+     "Requirements (Breve)": "Microchip ISO · Rabies vaccine · EU Passport",
+     "Detailed_Requirements": "Probe"},
+    {"Origin": "UK", "Destination": "USA", "Animal": "Cat"},
+    # Espaços nas células: cobre a limpeza feita por parse_route()
+    {"Origin": " Japan ", "Destination": "Canada ", "Animal": " bird",
+     "Requirements (Breve)": " Microchip ISO · Rabies vaccine "},
+]
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+def row_hash(row) -> str:
+    """
+    Hash estável do conteúdo de uma linha (independe da ordem das colunas).
+    As fontes já entregam as células normalizadas (números como int/float,
+    inclusive no snapshot CSV), então a linha vai direto para o hash.
+    """
+    payload = json.dumps(row, sort_keys=True, ensure_ascii=False, default=str)
+    return content_hash(payload.encode("utf-8"))
+
+def template_version(minify: bool = False) -> str:
+    """
+    Impressão digital do template: renderiza linhas-sonda e faz hash do HTML.
+    Qualquer mudança em generate_html(), no CSS, nos links de afiliados,
+    nas tabelas de bandeiras/países ou na minificação força a regeneração.
+    """
+    h = hashlib.sha1()
+    h.update(json.dumps([FLAGS, COUNTRY_SLUG, ANIMAL_EMOJI, LOCALES, UI_STRINGS, COUNTRY_NAMES, ANIMAL_NAMES,
+                         COUNTRY_ARTICLES, CONTRACTIONS],
+                        sort_keys=True).encode("utf-8"))
+    probes = list(map(parse_route, _TEMPLATE_PROBES))
+    # A primeira sonda ganha uma relacionada: cobre o bloco "Related routes"
+    probes[0] = probes[0]._replace(related=(probes[1][:4],))
+    for route in probes:
+        for lang in LOCALES:
+            html = generate_html(
+                route,
+                get_amazon_url(route.origin, route.animal),
+                get_booking_url(route.destination),
+                minify,
+                lang,
+            )
+            h.update(html.encode("utf-8"))
+    return h.hexdigest()
+
+def load_manifest(path: str = BUILD_MANIFEST) -> dict:
+    """Lê o manifesto; se não existir (ou for de outra versão) começa do zero."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION, "routes": {}, "files": {}, "deleted": []}
+    return manifest
+
+def save_manifest(manifest: dict, path: str = BUILD_MANIFEST):
+    """Grava o manifesto de forma atômica (arquivo temporário + rename)."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    os.replace(tmp, path)
+
+def is_up_to_date(manifest: dict, slug: str, rhash: str, template: str, related: str = "") -> bool:
+    entry = manifest["routes"].get(slug)
+    return (
+        entry is not None
+        and entry["row"] == rhash
+        and entry["template"] == template
+        and entry.get("related", "") == related
+        and all(map(os.path.exists, route_files(slug)))
+    )
+
+def record_route(manifest: dict, slug: str, rhash: str, template: str, html_hash: str,
+                 related: str = ""):
+    entry = manifest["routes"].get(slug) or {"published": None, "hash": None}
+    if entry["hash"] != html_hash:
+        entry["lastmod"] = date.today().isoformat()
+    entry.update(row=rhash, template=template, hash=html_hash, related=related)
+    manifest["routes"][slug] = entry
+
+def record_file(manifest: dict, path: str):
+    """Registra o hash atual de um arquivo da raiz (routes.json, sitemap.xml)."""
+    with open(path, "rb") as f:
+        h = content_hash(f.read())
+    entry = manifest["files"].get(path) or {"published": None}
+    entry["hash"] = h
+    manifest["files"][path] = entry
+    if path in manifest["deleted"]:
+        manifest["deleted"].remove(path)
+
+def record_home(manifest: dict, path: str = INDEX_HTML) -> str | None:
+    """
+    lastmod da home no sitemap: a data em que o conteúdo do index.html mudou
+    pela última vez (hash em manifest["home"]). O mtime não serve: muda a
+    cada checkout.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        h = content_hash(f.read())
+    entry = manifest.get("home")
+    if not entry or entry["hash"] != h:
+        entry = manifest["home"] = {"hash": h, "lastmod": date.today().isoformat()}
+    return entry["lastmod"]
+
+def forget_file(manifest: dict, path: str):
+    """Tira do manifesto um arquivo da raiz que deixou de ser gerado."""
+    if manifest["files"].pop(path, None) is not None and path not in manifest["deleted"]:
+        manifest["deleted"].append(path)
+
+def record_outputs(manifest: dict, written: list[str], prefix: str):
+    """Registra os arquivos gerados com este prefixo e esquece os que deixaram de ser."""
+    for path in written:
+        record_file(manifest, path)
+    for path in [p for p in manifest["files"] if p.startswith(prefix) and p not in written]:
+        forget_file(manifest, path)
+
+def _route_slug(repo_path: str) -> str | None:
+    """"routes/[<idioma>/]<slug>.html[.gz|.br]" → slug; None para arquivos da raiz."""
+    if not repo_path.startswith("routes/"):
+        return None
+    return repo_path.rsplit("/", 1)[1].split(".html")[0]
+
+def remove_stale_routes(manifest: dict, current: set[str]) -> list[str]:
+    """Apaga o HTML de slugs que não estão mais na planilha."""
+    removed = []
+    for slug in list(manifest["routes"]):
+        if slug in current:
+            continue
+        del manifest["routes"][slug]
+        for filepath in route_files(slug):
+            for path in [filepath] + [filepath + ext for ext in COMPRESSED_SUFFIXES]:
+                if os.path.exists(path):
+                    os.remove(path)
+        removed.append(slug)
+    # "deleted" acumula remoções ainda não propagadas para o GitHub; de uma rota
+    # que voltou para a planilha só ficam as que não existem mais em disco
+    # (as variantes .gz/.br de um build sem --precompress)
+    deleted = set(manifest["deleted"]) | {route_repo_path(slug, lang) + ext for slug in removed
+                                          for lang in LOCALES
+                                          for ext in ("",) + COMPRESSED_SUFFIXES}
+    manifest["deleted"] = sorted(p for p in deleted
+                                 if _route_slug(p) not in current or not os.path.exists(p))
+    return removed
+
+def sync_precompressed(manifest: dict, precompress: bool, jobs: int = 1) -> tuple[int, int, int]:
+    """
+    Deixa os .gz/.br das páginas de acordo com o HTML. Com precompress, comprime
+    de novo toda página mais nova que o seu .gz (as reescritas neste build);
+    sem, apaga as variantes que sobraram de builds anteriores e as marca para
+    remoção no GitHub — um .gz antigo ao lado de um HTML novo serviria a
+    versão velha da página.
+    Retorna (páginas comprimidas, bytes .gz, variantes apagadas).
+    """
+    if not precompress:
+        # Uma listagem por pasta de idioma em vez de dois stat() por página
+        dropped = []
+        for lang in LOCALES:
+            with os.scandir(locale_dir(lang)) as entries:
+                dropped += [entry.path for entry in entries
+                            if entry.name.endswith(tuple(".html" + ext for ext in COMPRESSED_SUFFIXES))]
+        for path in dropped:
+            os.remove(path)
+        dropped = [path.replace(os.sep, "/") for path in dropped]
+        manifest["deleted"] = sorted(set(manifest["deleted"]) | set(dropped))
+        return 0, 0, len(dropped)
+    stale = []
+    for slug, entry in manifest["routes"].items():
+        paths = [path for path in route_files(slug) if needs_precompress(path)]
+        if paths:
+            stale += paths
+            # Variantes novas de uma página já publicada também precisam subir
+            entry["published"] = None
+    if not stale:
+        return 0, 0, 0
+    gz_bytes = precompress_files(stale, jobs)
+    created  = {(path + ext).replace(os.sep, "/") for path in stale for ext in COMPRESSED_SUFFIXES}
+    manifest["deleted"] = [path for path in manifest["deleted"] if path not in created]
+    METRICS.count("bytes.precompressed", files_size(path + ext for path in stale for ext in COMPRESSED_SUFFIXES))
+    return len(stale), gz_bytes, 0
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# MÉTRICAS DO BUILD (RELATÓRIO JSON + CPROFILE)
+# ══════════════════════════════════════════════════════════════════════════════
+# Cada etapa do main() roda dentro de METRICS.stage("nome") — ou, no pipeline
+# em streaming, METRICS.timed("nome", iterável) conta cada next(). O tempo é
+# exclusivo: etapas aninhadas (fetch dentro de plan dentro de render) não
+# contam em dobro. Há ainda contadores (bytes gravados, chamadas HTTP, CPU dos
+# processos do pool) e um histograma do tempo de render por página. No fim
+# tudo vai para build-report.json.
+RENDER_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100)
+
+class Histogram:
+    """Histograma de tamanho fixo (ms): não cresce com o número de páginas."""
+
+    def __init__(self, bounds=RENDER_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # último balde = acima do maior limite
+        self.total  = 0.0
+        self.max    = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def merge(self, other: "Histogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float | None:
+        """Limite superior do balde onde cai o quantil q (aproximação)."""
+        n = sum(self.counts)
+        if not n:
+            return None
+        seen = 0
+        for bound, count in zip(self.bounds + (self.max,), self.counts):
+            seen += count
+            if seen >= q * n:
+                return round(min(bound, self.max), 4)
+        return round(self.max, 4)
+
+    def to_dict(self) -> dict:
+        n = sum(self.counts)
+        labels = [f"<={b}" for b in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count":   n,
+            "mean_ms": round(self.total / n, 4) if n else None,
+            "p50_ms":  self.quantile(0.50),
+            "p95_ms":  self.quantile(0.95),
+            "p99_ms":  self.quantile(0.99),
+            "max_ms":  round(self.max, 4),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+_END = object()
+
+class BuildMetrics:
+    def __init__(self):
+        self.stages     = {}
+        self.counters   = {}
+        self.render     = Histogram()
+        self.profile    = set()   # etapas a perfilar com cProfile ("all" = todas)
+        self._profilers = {}
+        self._current   = None
+        self._mark      = (0.0, 0.0)
+
+    def count(self, name: str, n: int | float = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other: "BuildMetrics"):
+        """Soma as métricas de um bloco renderizado num processo do pool."""
+        for name, n in other.counters.items():
+            self.count(name, n)
+        self.render.merge(other.render)
+
+    def _switch(self, name: str | None):
+        # O tempo desde a última troca vai para a etapa que estava ativa
+        now = (time.perf_counter(), time.process_time())
+        if self._current is not None:
+            st = self.stages.setdefault(self._current, {"wall_s": 0.0, "cpu_s": 0.0})
+            st["wall_s"] += now[0] - self._mark[0]
+            st["cpu_s"]  += now[1] - self._mark[1]
+            if self._current in self._profilers:
+                self._profilers[self._current].disable()
+        self._current, self._mark = name, now
+        if name is not None and (name in self.profile or "all" in self.profile):
+            if name not in self._profilers:
+                import cProfile
+                self._profilers[name] = cProfile.Profile()
+            self._profilers[name].enable()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        previous = self._current
+        self._switch(name)
+        try:
+            yield
+        finally:
+            self._switch(previous)
+
+    def timed(self, name: str, iterable):
+        """Repassa os itens de `iterable`, contando o tempo de cada next() na etapa `name`."""
+        it = iter(iterable)
+        while True:
+            previous = self._current
+            self._switch(name)
+            try:
+                item = next(it, _END)
+            finally:
+                self._switch(previous)
+            if item is _END:
+                return
+            yield item
+
+    def save_profiles(self):
+        for name, profiler in self._profilers.items():
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, f"{name}.prof")
+            profiler.dump_stats(path)
+            print(f"🔬 Perfil de '{name}' salvo em {path}  (python -m pstats {path})")
+
+    def report(self, **extra) -> dict:
+        stages = {name: {k: round(v, 4) for k, v in st.items()} for name, st in self.stages.items()}
+        if "cpu.pool_s" in self.counters and "render" in stages:
+            # CPU gasta pelos processos do pool (--jobs > 1) ao renderizar
+            stages["render"]["pool_cpu_s"] = round(self.counters["cpu.pool_s"], 4)
+        return {
+            **extra,
+            "stages":        stages,
+            "total_wall_s":  round(sum(st["wall_s"] for st in self.stages.values()), 4),
+            "render":        self.render.to_dict(),
+            "bytes_written": {k.split(".", 1)[1]: v for k, v in sorted(self.counters.items())
+                              if k.startswith("bytes.")},
+            "http": {
+                "calls":   self.counters.get("http.calls", 0),
+                "errors":  self.counters.get("http.errors", 0),
+                "retries": self.counters.get("http.retries", 0),
+                "seconds": round(self.counters.get("http.seconds", 0.0), 4),
+                "by_method": {k.split(".", 2)[2]: v for k, v in sorted(self.counters.items())
+                              if k.startswith("http.method.")},
+            },
+        }
+
+    def summary(self) -> str:
+        return " · ".join(f"{name} {st['wall_s']:.2f}s" for name, st in self.stages.items())
+
+METRICS = BuildMetrics()
+
+def save_report(report: dict, path: str = BUILD_REPORT):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+def files_size(paths) -> int:
+    return sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# AUTO-PUSH PARA O GITHUB
+# ══════════════════════════════════════════════════════════════════════════════
+# http.client/base64 são importados dentro das funções: só o push usa rede, e
+# http.client (ssl, email) sozinho custa ~40 ms de startup.
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ⚠️  COLE SEU NOVO TOKEN AQUI — nunca compartilhe com ninguém
+GITHUB_TOKEN = "cole-seu-novo-token-aqui"
+GITHUB_REPO  = "JsilvaM7/pet-travel-guide"    # usuário/repositório
+GITHUB_BRANCH = "main"
+GITHUB_API    = "https://api.github.com"        # troque por um servidor local para testar
+# "tree"     → um único commit por execução via Git Data API (blobs + tree + commit)
+# "contents" → um commit por arquivo via Contents API (modo antigo)
+GITHUB_PUBLISH_MODE = "tree"
+# Cliente HTTP do push (GitHubClient)
+GITHUB_CONCURRENCY    = 8     # requisições simultâneas (e conexões keep-alive) no push
+GITHUB_RETRIES        = 5     # novas tentativas por requisição (erro de rede, 5xx, rate limit)
+GITHUB_TIMEOUT        = 30    # segundos por requisição
+GITHUB_MAX_WAIT       = 900   # espera máxima por um rate limit antes de desistir (s)
+GITHUB_FAILURES_SHOWN = 10    # falhas listadas no resumo do push
+# ─────────────────────────────────────────────────────────────────────────────
+
+class GitHubClient:
+    """
+    Cliente HTTP da GitHub API para o push. Reaproveita conexões keep-alive
+    (no máximo `concurrency` abertas, e no máximo `concurrency` requisições
+    em paralelo) e repete o que vale repetir:
+      • rate limit (429, ou 403 com X-RateLimit-Remaining: 0 ou mensagem de
+        "secondary rate limit") → espera o Retry-After / X-RateLimit-Reset,
+        e todas as threads pausam juntas; vale para qualquer método, porque
+        o GitHub recusou a requisição sem executá-la;
+      • erro de rede e 5xx → backoff exponencial (ou o Retry-After do 5xx),
+        só em requisições idempotentes: um POST git/trees ou git/commits
+        que deu 503 pode ter sido aplicado.
+    O que falhar de vez fica em `failures` para o resumo no fim do push.
+    `http.seconds` é o tempo de relógio com alguma requisição em voo (não a
+    soma das threads).
+    GITHUB_API pode apontar para um servidor local (http://) nos testes.
+    """
+    IDEMPOTENT   = {"GET", "HEAD", "PUT", "DELETE"}
+    RETRY_STATUS = {500, 502, 503, 504}
+
+    def __init__(self, api: str = GITHUB_API, token: str = GITHUB_TOKEN,
+                 concurrency: int = GITHUB_CONCURRENCY, retries: int = GITHUB_RETRIES,
+                 timeout: float = GITHUB_TIMEOUT, sleep=time.sleep):
+        import threading
+        import urllib.parse
+        url = urllib.parse.urlsplit(api)
+        self.https       = url.scheme == "https"
+        self.host        = url.netloc
+        self.prefix      = url.path.rstrip("/")
+        self.token       = token
+        self.concurrency = concurrency
+        self.retries     = retries
+        self.timeout     = timeout
+        self.sleep       = sleep
+        self.failures    = []   # (método, caminho, status, mensagem)
+        self._idle       = []   # conexões livres (keep-alive)
+        self._slots      = threading.BoundedSemaphore(concurrency)
+        self._lock       = threading.Lock()
+        self._paused     = 0.0  # time.time() até quando ninguém envia (rate limit)
+        self._active     = 0    # requisições em voo, para medir o tempo de relógio
+        self._since      = 0.0
+
+    def _count(self, counters: dict):
+        # METRICS não é thread-safe: as threads do push contam sob o lock
+        with self._lock:
+            for name, n in counters.items():
+                METRICS.count(name, n)
+
+    def _send(self, method: str, path: str, data: bytes | None):
+        """Uma tentativa numa conexão do pool; conexão que deu erro é descartada."""
+        import http.client
+        with self._slots:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                cls  = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+                conn = cls(self.host, timeout=self.timeout)
+            headers = {
+                "Authorization": f"token {self.token}",
+                "Accept":        "application/vnd.github+json",
+                "Content-Type":  "application/json",
+                "User-Agent":    "generate-routes",
+            }
+            try:
+                conn.request(method, self.prefix + path, body=data, headers=headers)
+                res  = conn.getresponse()
+                body = res.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise ConnectionError(str(e) or type(e).__name__) from e
+            if res.will_close:
+                conn.close()
+            else:
+                with self._lock:
+                    self._idle.append(conn)
+            return res.status, res.headers, body
+
+    def _backoff(self, attempt: int) -> float:
+        import random
+        return min(2 ** attempt, 60) + random.uniform(0, 1)
+
+    def _is_rate_limit(self, status: int | None, headers, message: str) -> bool:
+        """429, ou 403 de rate limit primário (cota zerada) ou secundário."""
+        if status == 429:
+            return True
+        return status == 403 and (headers.get("X-RateLimit-Remaining") == "0"
+                                  or "rate limit" in message.lower())
+
+    def _retry_wait(self, status: int, headers) -> float | None:
+        """Segundos pedidos pelo servidor (Retry-After ou X-RateLimit-Reset), se houver."""
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            if retry_after.isdigit():
+                return float(retry_after)
+            from email.utils import parsedate_to_datetime
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        if status in (403, 429) and headers.get("X-RateLimit-Remaining") == "0":
+            return max(0.0, int(headers.get("X-RateLimit-Reset", 0)) - time.time()) + 1
+        return None
+
+    def _in_flight(self, delta: int):
+        # Conta em http.seconds só o tempo com pelo menos uma requisição em voo
+        with self._lock:
+            now = time.perf_counter()
+            if self._active == 0:
+                self._since = now
+            self._active += delta
+            if self._active == 0:
+                METRICS.count("http.seconds", now - self._since)
+
+    def _pause(self, seconds: float):
+        with self._lock:
+            self._paused = max(self._paused, time.time() + seconds)
+
+    def _wait_pause(self):
+        with self._lock:
+            wait = self._paused - time.time()
+        if wait > 0:
+            self.sleep(wait)
+
+    def _fail(self, method: str, path: str, status, message: str) -> dict:
+        with self._lock:
+            self.failures.append((method, path, status, message))
+            METRICS.count("http.failures")
+        return {"message": message, "status": status}
+
+    def request(self, method: str, path: str, body: dict | None = None,
+                idempotent: bool | None = None, allow=()) -> dict:
+        """
+        Chama a API e devolve o JSON da resposta (como antes: em erro, o JSON
+        de erro do GitHub). `allow` são status de erro esperados, que não
+        entram em `failures` (ex.: 404 ao procurar um arquivo).
+        """
+        data = json.dumps(body).encode() if body else None
+        if idempotent is None:
+            idempotent = method in self.IDEMPOTENT
+        self._count({"http.calls": 1, f"http.method.{method}": 1, "bytes.http_sent": len(data or b"")})
+        self._in_flight(+1)
+        try:
+            return self._attempts(method, path, data, idempotent, allow)
+        finally:
+            self._in_flight(-1)
+
+    def _attempts(self, method: str, path: str, data: bytes | None, idempotent: bool, allow) -> dict:
+        for attempt in range(self.retries + 1):
+            self._wait_pause()
+            try:
+                status, headers, raw = self._send(method, path, data)
+            except ConnectionError as e:
+                status, headers, raw = None, {}, None
+                result = {"message": f"erro de conexão: {e}"}
+            if status is not None:
+                try:
+                    result = json.loads(raw) if raw else {}
+                except ValueError:
+                    result = {"message": raw[:200].decode("utf-8", "replace")}
+                if status < 400 or status in allow:
+                    return result
+            self._count({"http.errors": 1})
+            message = result.get("message", str(result))
+
+            # Rate limit: a requisição foi recusada, então repetir vale para qualquer
+            # método. Sem Retry-After, o GitHub pede ao menos 1 min no limite secundário.
+            limited = self._is_rate_limit(status, headers, message)
+            wait    = self._retry_wait(status, headers) if status is not None else None
+            if limited and wait is None:
+                wait = self._backoff(attempt) if status == 429 else 60.0
+            if limited and wait > GITHUB_MAX_WAIT:
+                return self._fail(method, path, status, f"rate limit (liberado em {wait / 60:.0f} min)")
+            retryable = limited or (idempotent and (status is None or status in self.RETRY_STATUS))
+            if not retryable:
+                return self._fail(method, path, status, message)
+            if attempt == self.retries:
+                return self._fail(method, path, status, f"{message} (após {self.retries} novas tentativas)")
+            self._count({"http.retries": 1})
+            if limited:
+                self._pause(wait)   # todas as threads esperam o rate limit
+            else:
+                self.sleep(min(wait, GITHUB_MAX_WAIT) if wait is not None else self._backoff(attempt))
+
+    def map(self, fn, items):
+        """fn(item) para cada item, com até `concurrency` em paralelo; resultados na ordem."""
+        items = list(items)
+        if self.concurrency <= 1 or len(items) < 2:
+            return [fn(item) for item in items]
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            return list(pool.map(fn, items))
+
+    def take_failures(self) -> list[tuple]:
+        with self._lock:
+            failures, self.failures = self.failures, []
+        return failures
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+@functools.lru_cache(maxsize=None)
+def _gh_client(api: str, token: str) -> GitHubClient:
+    return GitHubClient(api, token)
+
+def github_client() -> GitHubClient:
+    """Cliente compartilhado: um pool de conexões para a API/token configurados."""
+    return _gh_client(GITHUB_API, GITHUB_TOKEN)
+
+def _gh_request(method: str, path: str, body: dict | None = None, **options) -> dict:
+    """Faz uma chamada à GitHub API no repositório GITHUB_REPO."""
+    return github_client().request(method, f"/repos/{GITHUB_REPO}/{path}", body, **options)
+
+def _get_sha(filepath_in_repo: str) -> str | None:
+    """Retorna o SHA do arquivo no GitHub (necessário para atualizar)."""
+    res = _gh_request("GET", f"contents/{filepath_in_repo}?ref={GITHUB_BRANCH}", allow=(404,))
+    return res.get("sha")
+
+def push_file(local_path: str, repo_path: str, commit_msg: str) -> bool:
+    """Envia um arquivo local para o GitHub (cria ou atualiza)."""
+    import base64
+    with open(local_path, "rb") as f:
+        content_b64 = base64.b64encode(f.read()).decode()
+
+    sha = _get_sha(repo_path)  # None se arquivo não existe ainda
+
+    body = {
+        "message": commit_msg,
+        "content": content_b64,
+        "branch":  GITHUB_BRANCH,
+    }
+    if sha:
+        body["sha"] = sha
+
+    res = _gh_request("PUT", f"contents/{repo_path}", body)
+
+    if "content" in res:
+        print(f"  ✅ GitHub: {repo_path}")
+        return True
+    print(f"  ⚠️  Erro em {repo_path}: {res.get('message', res)}")
+    return False
+
+def delete_file(repo_path: str, commit_msg: str) -> bool:
+    """Remove um arquivo do GitHub (usado para rotas apagadas da planilha)."""
+    sha = _get_sha(repo_path)
+    if not sha:
+        return True  # já não existe no repositório
+    res = _gh_request("DELETE", f"contents/{repo_path}", {
+        "message": commit_msg,
+        "sha":     sha,
+        "branch":  GITHUB_BRANCH,
+    })
+    if "commit" in res:
+        print(f"  🗑️  GitHub: {repo_path}")
+        return True
+    print(f"  ⚠️  Erro ao remover {repo_path}: {res.get('message', res)}")
+    return False
+
+# ── Git Data API: um commit só por execução ──────────────────────────────────
+def git_blob_sha(data: bytes) -> str:
+    """SHA do blob exatamente como o git calcula: sha1("blob <tamanho>\\0" + conteúdo)."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+def _gh_expect(res: dict, key: str, what: str) -> bool:
+    if key in res:
+        return True
+    print(f"  ⚠️  Erro em {what}: {res.get('message', res)}")
+    return False
+
+def _remote_dirs(base_tree: str, dirs: set[str]) -> tuple[dict, set[str]]:
+    """
+    Lista as pastas `dirs` do repositório uma a uma, sem recursão — para
+    quando a árvore recursiva volta truncada. Retorna (caminho → sha dos
+    blobs encontrados, pastas listadas por completo). Uma pasta que não
+    existe no repositório conta como listada (vazia).
+    """
+    listings = {}   # pasta → resposta de git/trees (None = desconhecida)
+
+    def listing(directory: str) -> dict | None:
+        if directory in listings:
+            return listings[directory]
+        if not directory:
+            sha = base_tree
+        else:
+            parent, _, name = directory.rpartition("/")
+            up = listing(parent)
+            if up is None:
+                sha = None
+            else:
+                sha = next((e["sha"] for e in up["tree"] if e["path"] == name and e["type"] == "tree"), "")
+                if not sha and up.get("truncated"):
+                    sha = None   # pode estar na parte que não veio
+        if sha == "":
+            res = {"tree": [], "truncated": False}
+        elif sha is None:
+            res = None
+        else:
+            res = _gh_request("GET", f"git/trees/{sha}")
+            res = res if "tree" in res else None
+        listings[directory] = res
+        return res
+
+    blobs, complete = {}, set()
+    for directory in sorted(dirs):
+        res = listing(directory)
+        if res is None:
+            continue
+        prefix = f"{directory}/" if directory else ""
+        blobs.update((prefix + e["path"], e["sha"]) for e in res["tree"] if e["type"] == "blob")
+        if not res.get("truncated"):
+            complete.add(directory)
+    return blobs, complete
+
+def publish_tree(files: list[tuple[str, str]], deletions: list[str], commit_msg: str) -> list[str] | None:
+    """
+    Publica tudo em um único commit via Git Data API:
+    1. lê a ref, o commit e a árvore remota uma vez só;
+    2. calcula localmente o SHA git de cada arquivo e sobe só os blobs diferentes;
+    3. cria uma tree (sobre a árvore base), um commit e move a branch.
+    `files` é uma lista de (caminho local, caminho no repo).
+    Retorna as remoções resolvidas (enviadas na tree ou confirmadas como
+    ausentes no GitHub), ou None se o push falhou. As outras continuam
+    pendentes no manifesto.
+    """
+    import base64
+    ref = _gh_request("GET", f"git/ref/heads/{GITHUB_BRANCH}")
+    if not _gh_expect(ref, "object", f"ref {GITHUB_BRANCH}"):
+        return None
+    head = ref["object"]["sha"]
+    commit = _gh_request("GET", f"git/commits/{head}")
+    if not _gh_expect(commit, "tree", f"commit {head[:7]}"):
+        return None
+    base_tree = commit["tree"]["sha"]
+    tree = _gh_request("GET", f"git/trees/{base_tree}?recursive=1")
+    if not _gh_expect(tree, "tree", f"tree {base_tree[:7]}"):
+        return None
+    remote   = {e["path"]: e["sha"] for e in tree["tree"] if e["type"] == "blob"}
+    complete = None   # None = a árvore inteira veio na listagem
+    if tree.get("truncated"):
+        # Árvore grande demais para uma listagem só: lista sem recursão as
+        # pastas que este push toca (routes/, routes/pt/, ...)
+        dirs = {path.rpartition("/")[0] for path in [repo for _, repo in files] + deletions}
+        listed, complete = _remote_dirs(base_tree, dirs)
+        remote.update(listed)
+        print(f"  ⚠️  Árvore remota truncada: {len(dirs)} pastas listadas uma a uma.")
+
+    def absent(path: str) -> bool:
+        """True se o arquivo com certeza não está no GitHub."""
+        return path not in remote and (complete is None or path.rpartition("/")[0] in complete)
+
+    # Blobs em paralelo (até GITHUB_CONCURRENCY); o primeiro erro cancela os que faltam
+    import threading
+    aborted = threading.Event()
+
+    def upload(item: tuple[str, str]) -> dict | None:
+        local, repo_path = item
+        if aborted.is_set():
+            return None
+        with open(local, "rb") as f:
+            data = f.read()
+        if remote.get(repo_path) == git_blob_sha(data):
+            return {}  # conteúdo idêntico ao que já está no GitHub
+        # O blob é endereçado pelo conteúdo: repetir o POST é seguro
+        blob = _gh_request("POST", "git/blobs", {
+            "content":  base64.b64encode(data).decode(),
+            "encoding": "base64",
+        }, idempotent=True)
+        if not _gh_expect(blob, "sha", repo_path):
+            aborted.set()
+            return None
+        return {"path": repo_path, "mode": "100644", "type": "blob", "sha": blob["sha"]}
+
+    results = github_client().map(upload, files)
+    if aborted.is_set():
+        return None
+    entries  = [entry for entry in results if entry]
+    uploaded = len(entries)
+    settled  = [path for path in deletions if absent(path)]
+    for repo_path in deletions:
+        if repo_path in remote:
+            entries.append({"path": repo_path, "mode": "100644", "type": "blob", "sha": None})
+            settled.append(repo_path)
+
+    if not entries:
+        print("  ✔️  GitHub já está idêntico aos arquivos locais.")
+        return settled
+
+    new_tree = _gh_request("POST", "git/trees", {"base_tree": base_tree, "tree": entries})
+    if not _gh_expect(new_tree, "sha", "criação da tree"):
+        return None
+    new_commit = _gh_request("POST", "git/commits", {
+        "message": commit_msg,
+        "tree":    new_tree["sha"],
+        "parents": [head],
+    })
+    if not _gh_expect(new_commit, "sha", "criação do commit"):
+        return None
+    moved = _gh_request("PATCH", f"git/refs/heads/{GITHUB_BRANCH}", {"sha": new_commit["sha"]})
+    if not _gh_expect(moved, "object", f"atualização de {GITHUB_BRANCH}"):
+        return None
+
+    print(f"  ✅ GitHub: commit {new_commit['sha'][:7]} · {uploaded} blobs enviados, "
+          f"{len(entries) - uploaded} removidos")
+    return settled
+
+def push_all_to_github(generated, manifest: dict | None = None,
+                       mode: str = GITHUB_PUBLISH_MODE):
+    """
+    Faz push dos arquivos gerados para o GitHub.
+    Com manifesto, envia só o que mudou desde o último push bem-sucedido
+    e remove do repositório as rotas apagadas da planilha.
+    `generated` são os slugs atuais (lista ou as chaves de manifest["routes"]).
+    """
+    if GITHUB_TOKEN == "cole-seu-novo-token-aqui":
+        print("\n⚠️  Token do GitHub não configurado. Pulando auto-push.")
+        print("   Edite a linha GITHUB_TOKEN nas CONFIGURAÇÕES de pet_routes.py e rode novamente.")
+        return
+
+    today = date.today().isoformat()
+    commit = f"pSEO auto-update: {len(generated)} routes · {today}"
+
+    # (caminho local, caminho no repo, entrada do manifesto)
+    if manifest is None:
+        files = [(f, f, None) for f in ["routes.json", "sitemap.xml"] if os.path.exists(f)]
+        files += [(route_file(slug, lang), route_repo_path(slug, lang), None)
+                  for slug in generated for lang in LOCALES]
+        deleted = []
+    else:
+        files = [(f, f, e) for f, e in manifest["files"].items() if e["hash"] != e["published"]]
+        for slug in generated:
+            entry = manifest["routes"][slug]
+            if entry["hash"] != entry["published"]:
+                for lang in LOCALES:
+                    for ext in ("",) + COMPRESSED_SUFFIXES:
+                        files.append((route_file(slug, lang) + ext,
+                                      route_repo_path(slug, lang) + ext, entry))
+        deleted = list(manifest["deleted"])
+    files = [f for f in files if os.path.exists(f[0])]
+
+    if not (files or deleted):
+        print("\n✔️  Nada mudou desde o último push. Pulando GitHub.")
+        return
+
+    print(f"\n🚀 Enviando arquivos para GitHub ({GITHUB_REPO})...")
+    try:
+        _push_files(files, deleted, manifest, commit, mode)
+    finally:
+        github_client().close()
+
+    failures = github_client().take_failures()
+    if not failures:
+        print(f"\n🎉 Push concluído! Acesse: https://{SITE_DOMAIN.replace('https://', '')}")
+        return
+    print(f"\n⚠️  Chamadas à GitHub API que falharam ({len(failures)}):")
+    for method, path, status, message in failures[:GITHUB_FAILURES_SHOWN]:
+        print(f"   {method} {path.split('?')[0]} → {status or 'sem resposta'}: {message}")
+    if len(failures) > GITHUB_FAILURES_SHOWN:
+        print(f"   … e mais {len(failures) - GITHUB_FAILURES_SHOWN}")
+    print("   O que não subiu continua pendente no manifesto e vai no próximo push.")
+
+def _push_files(files: list[tuple], deleted: list[str], manifest: dict | None,
+                commit: str, mode: str):
+    if mode == "tree":
+        settled = publish_tree([(local, repo) for local, repo, _ in files], deleted, commit)
+        if settled is None:
+            print("\n⚠️  Push abortado; nada foi alterado no GitHub.")
+            return
+        for _, _, entry in files:
+            if entry is not None:
+                entry["published"] = entry["hash"]
+        if manifest is not None:
+            # Só sai da lista o que foi removido de fato (ou confirmado ausente)
+            settled = set(settled)
+            manifest["deleted"] = [path for path in manifest["deleted"] if path not in settled]
+            if manifest["deleted"]:
+                print(f"  ⚠️  {len(manifest['deleted'])} remoções não confirmadas ficam para o próximo push.")
+    else:
+        # Contents API: cada PUT é um commit na branch, então um por vez
+        # (em paralelo eles conflitam); a conexão keep-alive é reaproveitada.
+        # Uma rota só conta como publicada se a página e as variantes subiram
+        failed = set()
+        for local, repo, entry in files:
+            if not push_file(local, repo, commit):
+                failed.add(id(entry))
+        for _, _, entry in files:
+            if entry is not None and id(entry) not in failed:
+                entry["published"] = entry["hash"]
+        # Rotas removidas da planilha e shards de sitemap que sumiram
+        for repo_path in deleted:
+            if delete_file(repo_path, commit):
+                manifest["deleted"].remove(repo_path)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# RENDERIZAÇÃO (SEQUENCIAL OU EM PARALELO)
+# ══════════════════════════════════════════════════════════════════════════════
+RENDER_CHUNK_MAX = 500   # linhas por tarefa enviada a cada processo
+RENDER_BLOCK     = 500   # linhas por bloco no pipeline em streaming
+
+def index_routes(rows) -> RouteIndex:
+    """Primeira passada: todas as linhas → índice invertido (sem hash, sem render)."""
+    routes_index = RouteIndex()
+    for block in METRICS.timed("fetch", _batched(rows, RENDER_BLOCK)):
+        with METRICS.stage("index"):
+            for row in block:
+                slug = row_slug(row)
+                if slug is not None:
+                    routes_index.add(parse_route(row, slug, hashed=False))
+    return routes_index
+
+def plan_routes(rows: list[dict], manifest: dict, template: str, stats: dict,
+                shard: tuple[int, int] | None = None, routes_index: RouteIndex | None = None) -> list[tuple]:
+    """
+    Um bloco de linhas da planilha → tarefas (route, renderizar?, índice) para
+    render_routes(). renderizar é False quando linha e template não mudaram e
+    o HTML em disco já está correto; índice é a posição da rota na planilha
+    (a ordem de routes.json). Com shard = (i, N), só as rotas do shard i.
+    Com o índice invertido, cada Route já sai com suas rotas relacionadas.
+    Conta linhas lidas e rotas vistas em stats["rows"] e stats["routes"].
+    """
+    tasks = []
+    stats["rows"] += len(rows)
+    for row in rows:
+        slug = row_slug(row)
+        if slug is None:
+            continue
+        index = stats["routes"]
+        stats["routes"] += 1
+        # Só o slug decide o shard: linhas de outros shards nem viram Route
+        if shard and shard_of(slug, shard[1]) != shard[0]:
+            continue
+        route = parse_route(row, slug)
+        if routes_index is not None:
+            route = route._replace(related=routes_index.related(route))
+        stale = not is_up_to_date(manifest, route.slug, route.row_hash, template,
+                                  related_signature(route.related))
+        tasks.append((route, stale, index))
+    return tasks
+
+def render_route(route: Route, minify: bool = False) -> tuple[str, str]:
+    """
+    Renderiza e grava as páginas da rota em todos os idiomas, a partir da
+    mesma Route. Retorna (hash do HTML, URL da Amazon); com mais de um
+    idioma o hash cobre todas as páginas.
+    """
+    amazon_url  = get_amazon_url(route.origin, route.animal)
+    booking_url = get_booking_url(route.destination)
+
+    hashes = []
+    for lang in LOCALES:
+        start = time.perf_counter()
+        buffers, page_hash = route_page(minify, lang).render_hashed(
+            page_values(route, amazon_url, booking_url, lang))
+        METRICS.render.observe((time.perf_counter() - start) * 1000)
+        write_buffers(route_file(route.slug, lang), buffers)
+        hashes.append(page_hash)
+    if len(hashes) == 1:
+        return hashes[0], amazon_url
+    return content_hash("".join(hashes).encode("ascii")), amazon_url
+
+def write_buffers(path: str, buffers: list[bytes]):
+    """Grava a página com um write() só: os ~85 fragmentos juntados em bytes."""
+    data = b"".join(buffers)
+    with open(path, "wb") as f:
+        f.write(data)
+    METRICS.count("bytes.pages", len(data))
+
+def _render_chunk(chunk: list[Route], minify: bool = False):
+    # Executado dentro de cada processo do pool; devolve também quanto os
+    # caches de fragmentos deste processo acertaram/erraram neste bloco
+    # e as métricas (histograma, bytes) só deste bloco
+    global METRICS
+    METRICS = BuildMetrics()
+    cpu     = time.process_time()
+    before  = _fragment_counters()
+    results = [render_route(route, minify) for route in chunk]
+    after   = _fragment_counters()
+    delta   = {name: (after[name][0] - before[name][0], after[name][1] - before[name][1])
+               for name in after}
+    METRICS.count("cpu.pool_s", time.process_time() - cpu)
+    return results, delta, METRICS
+
+def _batched(iterable, size: int):
+    it = iter(iterable)
+    while block := list(itertools.islice(it, size)):
+        yield block
+
+def render_routes(blocks, jobs: int = 1, minify: bool = False):
+    """
+    Renderiza um fluxo de blocos de tarefas (route, renderizar?, ...) e devolve,
+    bloco a bloco e NA MESMA ORDEM, pares (tarefa, resultado). Tarefas com
+    renderizar = False passam adiante sem renderizar (resultado None).
+    Com jobs > 1 as tarefas que mudaram vão para um ProcessPoolExecutor; no
+    máximo três blocos ficam em voo, então a memória não cresce com o número
+    de linhas. A saída em disco é idêntica à do modo sequencial.
+    """
+    if jobs <= 1:
+        for block in blocks:
+            yield [(task, render_route(task[0], minify) if task[1] else None)
+                   for task in block]
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    pending = deque()   # (bloco, futures dos pedaços enviados ao pool)
+
+    def collect(block, futures):
+        results = []
+        for future in futures:
+            chunk_results, delta, metrics = future.result()
+            for name, (hits, misses) in delta.items():
+                _pool_fragment_stats[name][0] += hits
+                _pool_fragment_stats[name][1] += misses
+            METRICS.merge(metrics)
+            results.extend(chunk_results)
+        results = iter(results)
+        return [(task, next(results) if task[1] else None) for task in block]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for block in blocks:
+            todo = [task[0] for task in block if task[1]]
+            size = max(1, min(RENDER_CHUNK_MAX, -(-len(todo) // jobs)))
+            futures = [pool.submit(_render_chunk, todo[i:i + size], minify)
+                       for i in range(0, len(todo), size)]
+            pending.append((block, futures))
+            if len(pending) > 2:
+                yield collect(*pending.popleft())
+        while pending:
+            yield collect(*pending.popleft())
+
+def build_blocks(rows, manifest: dict, template: str, stats: dict, seen: set,
+                 jobs: int = 1, minify: bool = False, shard: tuple[int, int] | None = None,
+                 routes_index: RouteIndex | None = None):
+    """
+    Pipeline em streaming: linhas → plano → render, em blocos de RENDER_BLOCK
+    linhas. Atualiza o manifesto e devolve blocos de itens
+    (índice, slug, origem, destino, animal, requisitos, entrada do manifesto)
+    prontos para RouteOutputs / ShardPartWriter.
+    """
+    row_blocks  = METRICS.timed("fetch", _batched(rows, RENDER_BLOCK))
+    task_blocks = METRICS.timed("plan", (plan_routes(block, manifest, template, stats, shard, routes_index)
+                                         for block in row_blocks))
+    for block in METRICS.timed("render", render_routes(task_blocks, jobs, minify)):
+        items = []
+        with METRICS.stage("render"):
+            for (route, _, index), result in block:
+                seen.add(route.slug)
+                if result is not None:
+                    html_hash, amazon_url = result
+                    record_route(manifest, route.slug, route.row_hash, template, html_hash,
+                                 related_signature(route.related))
+                    stats["rendered"] += 1
+                    print(f"✅ {route_file(route.slug)}  |  Amazon: {amazon_url[:50]}...")
+                items.append((index, route.slug, route.origin, route.destination, route.animal,
+                              route.requirements, manifest["routes"][route.slug]))
+        yield items
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SAÍDAS DO BUILD E BUILD EM SHARDS
+# ══════════════════════════════════════════════════════════════════════════════
+# Build normal: os itens vão direto para routes.json, sitemap e índice de busca
+# (RouteOutputs). Com --shard i/N cada máquina renderiza só as rotas cujo hash
+# do slug cai no shard i e grava uma lista parcial em shards/ (ShardPartWriter).
+# O --merge N junta as N listas na ordem da planilha e gera routes.json,
+# sitemap, índice e manifesto exatamente como um build numa máquina só, sem
+# renderizar nada — as páginas vêm dos artefatos de cada shard em routes/.
+class RouteOutputs:
+    """
+    routes.json, sitemap, índice de busca e hubs por país, alimentados bloco a
+    bloco. Sem o índice invertido da primeira passada (--merge), monta o seu
+    a partir dos próprios itens.
+    """
+
+    def __init__(self, routes_index: RouteIndex | None = None, minify: bool = False,
+                 sitemap: bool = True, search: bool = True, home_lastmod: str | None = None,
+                 precompress: bool = False):
+        self.routes  = RoutesJsonWriter()
+        self.sitemap = LocaleSitemaps(home_lastmod=home_lastmod) if sitemap else None
+        self.search  = SearchIndexWriter() if search else None
+        self.minify  = minify
+        self.precompress = precompress
+        self.index   = routes_index
+        self._collect = routes_index is None
+        if self._collect:
+            self.index = RouteIndex()
+
+    @property
+    def count(self) -> int:
+        return self.routes.count
+
+    def add_block(self, items: list[tuple]):
+        with METRICS.stage("routes_json"):
+            for item in items:
+                self.routes.add(item[1])
+        if self.sitemap:
+            with METRICS.stage("sitemap"):
+                for item in items:
+                    self.sitemap.add_route(item[1], item[6].get("lastmod"))
+        if self.search:
+            with METRICS.stage("search_index"):
+                for _, slug, origin, destination, animal, req, _ in items:
+                    self.search.add(slug, origin, destination, animal, req)
+        if self._collect:
+            with METRICS.stage("index"):
+                for _, slug, origin, destination, animal, req, _ in items:
+                    self.index.add(Route(slug, origin, destination, animal, req, "", ""))
+
+    def close(self, manifest: dict, stats: dict):
+        # countries/*.html (antes do sitemap, que lista os hubs)
+        with METRICS.stage("hubs"):
+            hubs, rebuilt, removed = write_hubs(self.index, manifest, self.minify)
+            for slug in hubs if self.sitemap else ():
+                self.sitemap.add_hub(slug, manifest["hubs"][slug]["lastmod"])
+        print(f"\n🌍 {len(hubs)} hubs de país em ./{HUB_DIR}/ ({rebuilt} regenerados, {removed} removidos)")
+        with METRICS.stage("precompress"):
+            compressed, dropped = sync_hub_precompressed(manifest, hubs, self.precompress)
+        if compressed:
+            print(f"🗜️  {compressed} hubs pré-comprimidos")
+        if dropped:
+            print(f"🗑️  {dropped} variantes .gz/.br de hubs apagadas")
+
+        # routes.json
+        with METRICS.stage("routes_json"):
+            self.routes.close()
+            record_file(manifest, "routes.json")
+            METRICS.count("bytes.routes_json", os.path.getsize("routes.json"))
+        print(f"\n📄 routes.json gerado com {self.count} rotas.")
+
+        # sitemap.xml (+ shards .xml.gz quando passar do limite do protocolo)
+        if self.sitemap:
+            with METRICS.stage("sitemap"):
+                written = self.sitemap.close()
+                record_outputs(manifest, written, "sitemap")
+                METRICS.count("bytes.sitemap", files_size(written))
+
+        # search/*.json (índice da home, por origem)
+        if self.search:
+            with METRICS.stage("search_index"):
+                written = self.search.close()
+                record_outputs(manifest, written, f"{SEARCH_DIR}/")
+                METRICS.count("bytes.search", files_size(written))
+
+def write_hubs(routes_index: RouteIndex, manifest: dict, minify: bool = False) -> tuple[list, int, int]:
+    """
+    Gera countries/<país>.html para cada país do índice. O hash do hub
+    (template + lista de rotas) fica em manifest["hubs"]: o arquivo só é
+    reescrito — e publicado — quando o conjunto de rotas do país muda.
+    Retorna (slugs dos hubs, quantos foram regenerados, quantos removidos).
+    """
+    os.makedirs(HUB_DIR, exist_ok=True)
+    entries  = manifest.setdefault("hubs", {})
+    template = hub_page(minify)
+    today    = date.today().isoformat()
+    slugs    = sorted(routes_index.countries)
+    rebuilt  = 0
+    for slug in slugs:
+        buffers, page_hash = template.render_hashed(hub_values(routes_index, slug))
+        path  = f"{HUB_DIR}/{slug}.html"
+        entry = entries.get(slug)
+        if entry and entry["hash"] == page_hash and os.path.exists(path):
+            continue
+        data = b"".join(buffers)
+        with open(path, "wb") as f:
+            f.write(data)
+        METRICS.count("bytes.hubs", len(data))
+        record_file(manifest, path)
+        entries[slug] = {"hash": page_hash, "lastmod": today}
+        rebuilt += 1
+
+    # Países que sumiram da planilha
+    current = set(slugs)
+    stale   = [slug for slug in entries if slug not in current]
+    for slug in stale:
+        del entries[slug]
+        path = f"{HUB_DIR}/{slug}.html"
+        if os.path.exists(path):
+            os.remove(path)
+        forget_file(manifest, path)
+    return slugs, rebuilt, len(stale)
+
+def sync_hub_precompressed(manifest: dict, slugs: list[str], precompress: bool) -> tuple[int, int]:
+    """
+    sync_precompressed() dos hubs: com precompress, comprime os hubs mais
+    novos que o seu .gz; as variantes de hubs removidos (ou todas, sem
+    precompress) são apagadas e marcadas para remoção no GitHub. Os hubs
+    entram no manifesto como arquivos soltos, então cada variante também.
+    Retorna (hubs comprimidos, variantes apagadas).
+    """
+    pages = [f"{HUB_DIR}/{slug}.html" for slug in slugs]
+    with os.scandir(HUB_DIR) as entries:
+        existing = {f"{HUB_DIR}/{entry.name}" for entry in entries
+                    if entry.name.endswith(tuple(".html" + ext for ext in COMPRESSED_SUFFIXES))}
+    wanted = {page + ext for page in pages for ext in COMPRESSED_SUFFIXES} if precompress else set()
+    dropped = sorted(existing - wanted)
+    for path in dropped:
+        os.remove(path)
+        forget_file(manifest, path)
+    stale = [page for page in pages if needs_precompress(page)] if precompress else []
+    if stale:
+        precompress_files(stale)
+        created = [page + ext for page in stale for ext in COMPRESSED_SUFFIXES if os.path.exists(page + ext)]
+        for path in created:
+            record_file(manifest, path)
+        METRICS.count("bytes.precompressed", files_size(created))
+    return len(stale), len(dropped)
+
+def write_assets(manifest: dict, precompress: bool = False) -> list[str]:
+    """
+    Grava em assets/ o CSS compartilhado (route.<hash>.css), os preflights
+    (base.<hash>.css, home.<hash>.css) e os WOFF2 de font_faces() que ainda
+    não existem e apaga as versões antigas. Mudar o CSS ou uma fonte gera um
+    arquivo novo; as páginas só trocam o nome no <link>. O home.*.css para
+    onde o index.html ainda aponta fica. Retorna os arquivos gravados agora.
+    """
+    os.makedirs(f"{ASSETS_DIR}/fonts", exist_ok=True)
+    sheets  = [route_stylesheet(), base_stylesheet()] + [sheet for sheet in [home_stylesheet()] if sheet]
+    outputs = [(f"{ASSETS_DIR}/{name}", functools.partial(bytes, data)) for name, data in sheets]
+    css     = [path for path, _ in outputs]
+    outputs += [(f"{ASSETS_DIR}/fonts/{face.name}", functools.partial(subset_font, face))
+                for face in font_faces()]
+    created = []
+    for path, content in outputs:
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(content())
+            created.append(path)
+    # WOFF2 já é comprimido: .gz/.br só para o CSS (e sem --precompress, nenhum)
+    if not precompress:
+        drop_precompressed(css)
+    else:
+        for css_path in css:
+            if needs_precompress(css_path):
+                precompress_file(css_path)
+    linked  = index_stylesheet_link()
+    keep    = [path for path, _ in outputs] + ([linked] if linked and os.path.exists(linked) else [])
+    written = [p for path in dict.fromkeys(keep) for p in [path] + [path + ext for ext in COMPRESSED_SUFFIXES]
+               if os.path.exists(p)]
+    # Só versões antigas do que este build grava; o resto de assets/ não é nosso
+    ours = [path for kind in ("route", "base", "home") for path in glob.glob(f"{ASSETS_DIR}/{kind}.*.css*")]
+    ours += glob.glob(f"{ASSETS_DIR}/fonts/*.woff2")
+    for stale in ours:
+        if stale.replace(os.sep, "/") not in written:
+            os.remove(stale)
+    record_outputs(manifest, written, f"{ASSETS_DIR}/")
+    return created
+
+def shard_of(slug: str, count: int) -> int:
+    """Shard (1..count) de um slug. sha1, não hash(): igual em qualquer máquina."""
+    return int(hashlib.sha1(slug.encode("utf-8")).hexdigest()[:8], 16) % count + 1
+
+def parse_shard(text: str) -> tuple[int, int]:
+    """"2/4" → (2, 4). Usado como type= do argparse."""
+    try:
+        index, count = (int(x) for x in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard inválido: {text!r} (use i/N, ex.: 2/4)")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard inválido: {text!r} (i precisa estar entre 1 e N)")
+    return index, count
+
+def shard_part_path(index: int, count: int) -> str:
+    return f"{SHARD_DIR}/routes-{index}-of-{count}.jsonl"
+
+def shard_manifest_path(index: int, count: int) -> str:
+    """Cada shard tem seu próprio manifesto (várias máquinas, ou vários shards na mesma pasta)."""
+    root, ext = os.path.splitext(BUILD_MANIFEST)
+    return f"{root}.{index}-of-{count}{ext}"
+
+class ShardPartWriter:
+    """
+    Lista parcial de um shard: uma linha JSON por rota,
+    [índice, slug, origem, destino, animal, requisitos, entrada do manifesto],
+    precedida de um cabeçalho {"_shard": {...}} que o --merge confere.
+    """
+
+    def __init__(self, index: int, count: int, template: str):
+        os.makedirs(SHARD_DIR, exist_ok=True)
+        self.index    = index
+        self.total    = count
+        self.template = template
+        self.path     = shard_part_path(index, count)
+        self.count    = 0
+        self._body    = open(self.path + ".body", "w+", encoding="utf-8")
+
+    def add_block(self, items: list[tuple]):
+        with METRICS.stage("shard_part"):
+            for *fields, entry in items:
+                entry = {k: entry.get(k) for k in ("row", "template", "hash", "related", "lastmod")}
+                self._body.write(_compact_json([*fields, entry]) + "\n")
+            self.count += len(items)
+
+    def close(self, manifest: dict, stats: dict):
+        with METRICS.stage("shard_part"):
+            header = {"index": self.index, "count": self.total, "template": self.template,
+                      "routes": stats["routes"], "entries": self.count}
+            with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(_compact_json({"_shard": header}) + "\n")
+                self._body.seek(0)
+                shutil.copyfileobj(self._body, f)
+            self._body.close()
+            os.remove(self.path + ".body")
+            os.replace(self.path + ".tmp", self.path)
+            METRICS.count("bytes.shard_part", os.path.getsize(self.path))
+        print(f"\n🧩 Shard {self.index}/{self.total}: {self.count} de {stats['routes']} rotas → {self.path}")
+
+def open_shard_parts(count: int, template: str) -> list:
+    """Abre as N listas parciais e confere se formam um build completo e coerente."""
+    parts, headers = [], []
+    for index in range(1, count + 1):
+        path = shard_part_path(index, count)
+        if not os.path.exists(path):
+            raise SystemExit(f"❌ Falta a lista do shard {index}/{count}: {path}")
+        f = open(path, encoding="utf-8")
+        parts.append(f)
+        headers.append(json.loads(f.readline())["_shard"])
+
+    if any(h["template"] != template for h in headers):
+        raise SystemExit("❌ Shards gerados com outro template (ou outro --minify) — rode-os de novo.")
+    totals = {h["routes"] for h in headers}
+    if len(totals) != 1 or sum(h["entries"] for h in headers) != totals.pop():
+        raise SystemExit("❌ As listas dos shards não batem (planilha mudou entre os shards?).")
+    return parts
+
+def merge_blocks(parts: list, manifest: dict, stats: dict, seen: set):
+    """
+    Junta as listas parciais na ordem original (merge por índice, em
+    streaming) e atualiza o manifesto principal como um build normal faria:
+    lastmod só muda quando o hash do HTML muda; "published" é preservado.
+    """
+    try:
+        merged = heapq.merge(*(map(json.loads, f) for f in parts), key=lambda item: item[0])
+        for block in _batched(merged, RENDER_BLOCK):
+            items = []
+            with METRICS.stage("merge"):
+                for index, slug, origin, destination, animal, req, entry in block:
+                    old = manifest["routes"].get(slug)
+                    entry["published"] = old["published"] if old else None
+                    if old and old["hash"] == entry["hash"] and old.get("lastmod"):
+                        entry["lastmod"] = old["lastmod"]
+                    manifest["routes"][slug] = entry
+                    seen.add(slug)
+                    stats["routes"] += 1
+                    if not all(map(os.path.exists, route_files(slug))):
+                        stats["missing"] += 1
+                    items.append((index, slug, origin, destination, animal, req, entry))
+            yield items
+    finally:
+        for f in parts:
+            f.close()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# MODO WATCH E PREVIEW LOCAL
+# ══════════════════════════════════════════════════════════════════════════════
+# --watch substitui o cron: a cada ciclo consulta só a versão da fonte
+# (source.version(), poucos bytes) e roda o build incremental + push quando
+# ela muda. Erros de rede ou de build não derrubam o processo: o ciclo
+# seguinte tenta de novo. --serve sobe um servidor local que entrega as
+# páginas recém-geradas a partir da memória.
+WATCH_INTERVAL = 60     # segundos entre consultas da versão
+PREVIEW_PORT   = 8000
+# O preview só entrega o que é site: a home, as pastas geradas e os arquivos
+# da raiz que o build escreve. Dotfiles e outros .json (credenciais da service
+# account, manifesto) ficam de fora.
+PREVIEW_DIRS  = (OUTPUT_DIR, HUB_DIR, ASSETS_DIR, SEARCH_DIR)
+PREVIEW_FILES = re.compile(r"index\.html|routes\.json|robots\.txt|sitemap[\w-]*\.xml(\.gz)?")
+
+def preview_allowed(path: str) -> bool:
+    """True se o caminho relativo (com "/") é parte do site publicado."""
+    parts = path.split("/")
+    if any(not part or part.startswith(".") for part in parts):
+        return False
+    if len(parts) == 1:
+        return PREVIEW_FILES.fullmatch(path) is not None
+    return parts[0] in PREVIEW_DIRS and (parts[0] == SEARCH_DIR or not path.endswith(".json"))
+
+class PreviewServer:
+    """
+    Servidor HTTP de pré-visualização (só 127.0.0.1) numa thread em segundo
+    plano. Cada arquivo é lido do disco uma vez e servido da memória até o
+    próximo build, que chama invalidate(). Não é servidor de produção.
+    """
+
+    def __init__(self, port: int = PREVIEW_PORT, root: str = "."):
+        import threading
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        self.root  = os.path.abspath(root)
+        self.cache = {}   # caminho relativo → bytes
+        self._lock = threading.Lock()
+        preview    = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                preview._serve(self, body=True)
+
+            def do_HEAD(self):
+                preview._serve(self, body=False)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd   = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.port    = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _load(self, path: str) -> bytes | None:
+        with self._lock:
+            data = self.cache.get(path)
+        if data is not None:
+            return data
+        if not preview_allowed(path):
+            return None
+        full = os.path.normpath(os.path.join(self.root, path))
+        if not full.startswith(self.root + os.sep) or not os.path.isfile(full):
+            return None
+        with open(full, "rb") as f:
+            data = f.read()
+        with self._lock:
+            self.cache[path] = data
+        return data
+
+    def _serve(self, handler, body: bool):
+        import mimetypes
+        import urllib.parse
+        path = urllib.parse.unquote(handler.path.split("?", 1)[0]).lstrip("/")
+        if not path or path.endswith("/"):
+            path += "index.html"
+        data = self._load(path)
+        if data is None:
+            handler.send_error(404)
+            return
+        ctype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if ctype.startswith("text/") or ctype in ("application/json", "application/xml"):
+            ctype += "; charset=utf-8"
+        handler.send_response(200)
+        handler.send_header("Content-Type", ctype)
+        handler.send_header("Content-Length", str(len(data)))
+        # Nomes com hash em assets/ (CSS, fontes) nunca mudam de conteúdo
+        immutable = path.startswith(f"{ASSETS_DIR}/")
+        handler.send_header("Cache-Control", "public, max-age=31536000, immutable" if immutable else "no-cache")
+        handler.end_headers()
+        if body:
+            handler.wfile.write(data)
+
+    def invalidate(self):
+        with self._lock:
+            self.cache.clear()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def watch(args, jobs: int, argv: list[str], cycles: int | None = None):
+    """
+    Loop do --watch. `cycles` limita o número de consultas (testes); None =
+    até Ctrl+C. A última versão construída vem do manifesto, então reiniciar
+    o processo não dispara um build se nada mudou.
+    """
+    source  = open_source(args.source, args.snapshot)
+    built   = load_manifest().get("source_version")
+    preview = PreviewServer(args.serve) if args.serve is not None else None
+    if preview:
+        print(f"👀 Preview em http://127.0.0.1:{preview.port}/")
+    print(f"⏳ Observando {source.describe()} a cada {args.watch}s (Ctrl+C para sair)")
+    try:
+        for cycle in itertools.count(1):
+            try:
+                current = source.version()
+            except Exception as e:
+                print(f"⚠️  Não foi possível consultar a versão de {source.describe()}: {e}")
+            else:
+                if current != built:
+                    print(f"\n🔔 Fonte mudou (versão {current}) — reconstruindo...")
+                    try:
+                        build(args, jobs, argv, version=current)
+                    except Exception as e:
+                        print(f"❌ Build falhou: {e!r} — nova tentativa no próximo ciclo")
+                    else:
+                        built = current
+                        if preview:
+                            preview.invalidate()
+            if cycles is not None and cycle >= cycles:
+                break
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        print("\n👋 Watch encerrado.")
+    finally:
+        if preview:
+            preview.close()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ══════════════════════════════════════════════════════════════════════════════
+# Sem comando: o build completo (planilha → páginas → sitemap/índice → push),
+# como sempre. Os comandos rodam uma etapa só e importam só o que ela usa:
+#   fetch   planilha → snapshot local (única etapa que fala com o Google)
+#   render  snapshot → páginas, hubs e routes.json (sem push)
+#   sitemap routes.json + manifesto → sitemap.xml (sem ler linhas)
+#   index   snapshot → search/*.json
+#   publish manifesto → GitHub
+# As opções valem antes ou depois do COMANDO ("-j 4 render" = "render -j 4").
+# Só o parser principal tem padrões: nas cópias dos subcomandos eles são
+# SUPPRESS, senão o subparser gravaria os seus por cima do que veio antes.
+# --source fica None quando ninguém passou e é resolvido em parse_args()
+# (snapshot para render/index, planilha para o resto).
+SOURCE_DEFAULTS = {"render": "snapshot", "index": "snapshot"}
+
+def _default(value, suppress: bool):
+    return argparse.SUPPRESS if suppress else value
+
+def _source_options(suppress: bool = False) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--source", choices=["sheets", "snapshot"], default=_default(None, suppress),
+                        help="de onde ler as linhas: planilha (rede) ou snapshot local "
+                             "(padrão: sheets; snapshot nos comandos render e index)")
+    parser.add_argument("--snapshot", default=_default(SNAPSHOT_FILE, suppress), metavar="ARQUIVO",
+                        help=f"snapshot local .jsonl/.csv (padrão: {SNAPSHOT_FILE})")
+    return parser
+
+def _render_options(suppress: bool = False) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--jobs", "-j", type=int, default=_default(1, suppress),
+                        help="processos para renderizar em paralelo (0 = todos os núcleos)")
+    parser.add_argument("--minify", action=argparse.BooleanOptionalAction, default=_default(MINIFY_HTML, suppress),
+                        help="minifica o HTML das páginas")
+    parser.add_argument("--precompress", action=argparse.BooleanOptionalAction,
+                        default=_default(PRECOMPRESS, suppress),
+                        help="grava .html.gz/.html.br ao lado de cada página alterada")
+    parser.add_argument("--report", default=_default(BUILD_REPORT, suppress), metavar="ARQUIVO",
+                        help=f"relatório JSON com as métricas do build (padrão: {BUILD_REPORT})")
+    parser.add_argument("--profile", action="append", default=_default([], suppress), metavar="ETAPA",
+                        help="perfila a etapa com cProfile (fetch, plan, render, cleanup, precompress, "
+                             f"index, routes_json, sitemap, search_index, hubs, shard_part, merge, push ou all); salva em {PROFILE_DIR}/. "
+                             "Com --jobs > 1 só o processo principal é perfilado")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--shard", type=parse_shard, default=_default(None, suppress), metavar="i/N",
+                      help=f"renderiza só o shard i de N (por hash do slug) e grava a lista parcial em {SHARD_DIR}/")
+    mode.add_argument("--merge", type=int, default=_default(None, suppress), metavar="N",
+                      help="junta as N listas parciais: routes.json, sitemap, índice e push, sem renderizar")
+    return parser
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Gera as páginas de rotas a partir da planilha. Sem COMANDO, roda o build "
+                    "completo; as opções abaixo valem para ele (cada comando tem as suas).",
+        parents=[_source_options(), _render_options()])
+    parser.add_argument("--save-snapshot", action="store_true",
+                        help="ao ler da planilha, salva também um snapshot local")
+    parser.add_argument("--watch", type=int, nargs="?", const=WATCH_INTERVAL, metavar="SEGUNDOS",
+                        help="fica rodando: consulta a versão da fonte a cada SEGUNDOS "
+                             f"(padrão: {WATCH_INTERVAL}) e só reconstrói e publica quando ela muda")
+    parser.add_argument("--serve", type=int, nargs="?", const=PREVIEW_PORT, metavar="PORTA",
+                        help=f"com --watch, serve o site em http://127.0.0.1:PORTA/ (padrão: {PREVIEW_PORT})")
+
+    commands = parser.add_subparsers(dest="command", metavar="COMANDO")
+    fetch = commands.add_parser("fetch", help="baixa a planilha para o snapshot local")
+    fetch.add_argument("--snapshot", default=argparse.SUPPRESS, metavar="ARQUIVO",
+                       help=f"snapshot a gravar, .jsonl ou .csv (padrão: {SNAPSHOT_FILE})")
+    commands.add_parser("render", parents=[_source_options(suppress=True), _render_options(suppress=True)],
+                        help="gera páginas, hubs e routes.json (sem sitemap, índice nem push)")
+    commands.add_parser("sitemap", help="regera o sitemap.xml a partir de routes.json e do manifesto")
+    commands.add_parser("index", parents=[_source_options(suppress=True)],
+                        help="regera o índice de busca da home (search/*.json)")
+    commands.add_parser("publish", help="envia ao GitHub o que mudou desde o último push")
+
+    args = parser.parse_args(argv)
+    if args.source is None:
+        args.source = SOURCE_DEFAULTS.get(args.command, "sheets")
+    if args.watch is not None and (args.command or args.shard or args.merge):
+        parser.error("--watch não combina com comandos nem com --shard/--merge")
+    if args.serve is not None and args.watch is None:
+        parser.error("--serve só funciona junto com --watch")
+    return args
+
+def cmd_fetch(args, jobs: int, argv: list[str]):
+    source = SheetsSource()
+    print(f"📥 Lendo linhas de {source.describe()}...")
+    revision = save_snapshot(source.iter_rows(), args.snapshot, source.describe())
+    print(f"💾 Snapshot salvo em {args.snapshot} (revisão {revision})")
+
+def cmd_sitemap(args, jobs: int, argv: list[str]):
+    try:
+        with open("routes.json", encoding="utf-8") as f:
+            slugs = json.load(f)
+    except FileNotFoundError:
+        raise SystemExit("❌ routes.json não existe — rode o render antes.")
+    manifest = load_manifest()
+    lastmods = {slug: entry.get("lastmod") for slug, entry in manifest["routes"].items()}
+    hubs     = {slug: entry["lastmod"] for slug, entry in manifest.get("hubs", {}).items()}
+    record_outputs(manifest, generate_sitemap(slugs, lastmods, hubs, record_home(manifest)), "sitemap")
+    save_manifest(manifest)
+
+def cmd_index(args, jobs: int, argv: list[str]):
+    source = open_source(args.source, args.snapshot)
+    print(f"📥 Lendo linhas de {source.describe()}...")
+    routes = (parse_route(row, slug, hashed=False) for row in source.iter_rows()
+              if (slug := row_slug(row)) is not None)
+    written = generate_search_index((r.slug, r.origin, r.destination, r.animal, r.requirements)
+                                    for r in routes)
+    manifest = load_manifest()
+    record_outputs(manifest, written, f"{SEARCH_DIR}/")
+    save_manifest(manifest)
+
+def cmd_publish(args, jobs: int, argv: list[str]):
+    manifest = load_manifest()
+    push_all_to_github(manifest["routes"], manifest)
+    save_manifest(manifest)
+
+def build(args, jobs: int, argv: list[str], version: str | None = None):
+    """
+    Um build completo: fonte → páginas → saídas → manifesto → push.
+    Com o comando render, só páginas, hubs e routes.json.
+    `version` é a versão da fonte que disparou o build no --watch; fica no
+    manifesto para um watch reiniciado não reconstruir o que já está no ar.
+    """
+    global METRICS
+    METRICS = BuildMetrics()
+    METRICS.profile = set(args.profile)
+    started = datetime.now(timezone.utc)
+    full    = args.command is None
+    prefill_registry()
+
+    make_output_dirs()
+    manifest_path = shard_manifest_path(*args.shard) if args.shard else BUILD_MANIFEST
+    with METRICS.stage("plan"):
+        manifest = load_manifest(manifest_path)
+        template = template_version(args.minify)
+    stats = {"rows": 0, "routes": 0, "rendered": 0, "missing": 0}
+    seen  = set()   # slugs desta execução, para achar as rotas removidas
+
+    # Nada de conteúdo fica acumulado na memória: os blocos saem do pipeline
+    # direto para os arquivos. Por rota sobram só a entrada do manifesto e o slug.
+    snapshot = source = spool = routes_index = None
+    if args.merge:
+        parts  = open_shard_parts(args.merge, template)
+        blocks = merge_blocks(parts, manifest, stats, seen)
+        print(f"🧩 Juntando {args.merge} shards de {SHARD_DIR}/...")
+    else:
+        source = open_source(args.source, args.snapshot)
+        rows   = source.iter_rows()
+        print(f"📥 Lendo linhas de {source.describe()}...")
+        if args.save_snapshot and args.source == "sheets":
+            snapshot = SnapshotWriter(args.snapshot, source.describe())
+            rows = snapshot.tee(rows)
+        # Duas passadas: o índice invertido precisa de todas as linhas antes da
+        # primeira página (rotas relacionadas). A planilha é lida uma vez só;
+        # a segunda passada relê o spool local.
+        if args.source == "sheets":
+            spool = RowSpool()
+            rows  = spool.tee(rows)
+        routes_index = index_routes(rows)
+        print(f"🧭 Índice: {len(routes_index.table)} rotas, {len(routes_index.countries)} países")
+        rows   = spool.iter_rows() if spool else source.iter_rows()
+        blocks = build_blocks(rows, manifest, template, stats, seen, jobs, args.minify, args.shard,
+                              routes_index)
+
+    home_lastmod = None if args.shard else record_home(manifest)
+
+    sink = (ShardPartWriter(*args.shard, template) if args.shard
+            else RouteOutputs(routes_index, args.minify, sitemap=full, search=full, home_lastmod=home_lastmod,
+                              precompress=args.precompress))
+    for items in blocks:
+        sink.add_block(items)
+
+    if spool is not None:
+        spool.close()
+    if source is not None:
+        print(f"📥 {stats['rows']} linhas lidas de {source.describe()}")
+    if snapshot is not None:
+        revision = snapshot.close()
+        print(f"💾 Snapshot salvo em {args.snapshot} (revisão {revision})")
+    if stats["missing"]:
+        print(f"⚠️  {stats['missing']} páginas listadas pelos shards não estão em ./{OUTPUT_DIR}/ "
+              "(faltou copiar os artefatos de algum shard?)")
+
+    with METRICS.stage("cleanup"):
+        removed = remove_stale_routes(manifest, seen)
+    for slug in removed:
+        print(f"🗑️  {route_file(slug)} (rota removida da planilha)")
+
+    # .html.gz / .html.br: refeitos para as páginas reescritas, ou apagados sem
+    # --precompress (no --merge as páginas já vêm dos shards como estão)
+    if not args.merge:
+        with METRICS.stage("precompress"):
+            compressed, gz_bytes, dropped = sync_precompressed(manifest, args.precompress, jobs)
+        if compressed:
+            print(f"🗜️  {compressed} páginas pré-comprimidas ({gz_bytes / compressed / 1024:.1f} KB .gz em média)")
+        if dropped:
+            print(f"🗑️  {dropped} variantes .gz/.br apagadas (build sem --precompress)")
+
+    # assets/: CSS compartilhado e fontes (no shard, quem grava é o --merge)
+    if not args.shard:
+        with METRICS.stage("assets"):
+            created = write_assets(manifest, args.precompress)
+            METRICS.count("bytes.assets", files_size(created))
+        for path in created:
+            print(f"🎨 {path} gravado")
+        home = home_stylesheet()
+        if home and index_stylesheet_link() != f"{ASSETS_DIR}/{home[0]}":
+            print(f"⚠️  {INDEX_HTML} não aponta para o preflight atual: use "
+                  f'<link rel="stylesheet" href="{ASSETS_DIR}/{home[0]}"/>')
+        if not font_faces():
+            print("🔤 Fontes pelo Google Fonts (para auto-hospedar: fonttools + brotli e os "
+                  f"arquivos de {FONTS_DIR}/)")
+        for name in undefined_classes(page_markup(), template_css(PAGE_TEMPLATE) + ROUTE_CSS):
+            print(f"⚠️  Classe {name!r} usada nas páginas sem regra no CSS")
+
+    sink.close(manifest, stats)
+    manifest["source_version"] = version
+    save_manifest(manifest, manifest_path)
+
+    rendered = stats["rendered"]
+    print(f"\n🎉 {rendered} páginas geradas em ./{OUTPUT_DIR}/ "
+          f"({sink.count - rendered} inalteradas, {len(removed)} removidas)")
+    fragments = fragment_cache_stats()
+    if rendered:
+        print("🧩 Cache de fragmentos: " + " · ".join(
+            f"{name} {st['hits']} hits / {st['misses']} misses" for name, st in fragments.items()))
+
+    # Auto-push para o GitHub (num build em shards, só depois do --merge)
+    if args.shard:
+        print(f"\n📦 Shard pronto. Publique com --merge {args.shard[1]} depois que todos terminarem.")
+    elif not full:
+        print("\n📦 Render pronto. Próximos passos: sitemap, index e publish.")
+    else:
+        with METRICS.stage("push"):
+            push_all_to_github(manifest["routes"], manifest)
+            save_manifest(manifest, manifest_path)
+
+    METRICS.save_profiles()
+    save_report(METRICS.report(
+        started_at=started.isoformat(timespec="seconds"),
+        finished_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        argv=argv,
+        jobs=jobs,
+        source=source.describe() if source else f"merge de {args.merge} shards",
+        shard="/".join(map(str, args.shard)) if args.shard else None,
+        pages={"rows": stats["rows"], "routes": sink.count, "rendered": rendered,
+               "unchanged": sink.count - rendered, "removed": len(removed)},
+        fragment_cache=fragments,
+    ), args.report)
+    print(f"⏱️  {METRICS.summary()}")
+    print(f"📊 Relatório do build salvo em {args.report}")
+
+COMMANDS = {
+    None:      build,
+    "fetch":   cmd_fetch,
+    "render":  build,
+    "sitemap": cmd_sitemap,
+    "index":   cmd_index,
+    "publish": cmd_publish,
+}
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = args.jobs or os.cpu_count() or 1
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if args.watch is not None:
+        watch(args, jobs, argv)
+    else:
+        COMMANDS[args.command](args, jobs, argv)
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pet_routes as gr   # noqa: E402
+from fake_github import FakeGitHub   # noqa: E402
+
+
+@pytest.fixture
+def github(monkeypatch, tmp_path):
+    """GitHub falso em 127.0.0.1, com o push apontado para ele e cwd em tmp_path."""
+    server = FakeGitHub()
+    monkeypatch.setattr(gr, "GITHUB_API", server.url)
+    monkeypatch.setattr(gr, "GITHUB_TOKEN", "test-token")
+    monkeypatch.setattr(gr, "GITHUB_REPO", server.repo)
+    monkeypatch.setattr(gr, "GITHUB_BRANCH", server.branch)
+    monkeypatch.chdir(tmp_path)
+    yield server
+    gr.github_client().close()
+    server.close()
+
+
+def write(path: str, text: str) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+ROWS = [
+    {"Origin": "Brazil", "Destination": "Portugal", "Animal": "Dog",
+     "Requirements (Breve)": "Microchip ISO · EU Passport · FAVN test", "Detailed_Requirements": "Bring docs", "Slug": ""},
+    {"Origin": "Brazil", "Destination": "USA", "Animal": "Cat",
+     "Requirements (Breve)": "Microchip ISO · Rabies 28+ days", "Detailed_Requirements": "Bring docs", "Slug": ""},
+    {"Origin": "Portugal", "Destination": "Brazil", "Animal": "Dog",
+     "Requirements (Breve)": "Microchip ISO · CZI", "Detailed_Requirements": "Bring docs", "Slug": ""},
+]
+
+
+def write_snapshot(rows: list[dict], path: str = gr.SNAPSHOT_FILE) -> str:
+    import json
+    return write(path, "".join(json.dumps(row) + "\n" for row in rows))
+
+
+@pytest.fixture
+def site(monkeypatch, tmp_path):
+    """Diretório de build vazio (cwd) com um snapshot de ROWS."""
+    monkeypatch.chdir(tmp_path)
+    write_snapshot(ROWS)
+    return tmp_path
@@ -0,0 +1,184 @@
+"""
+Servidor local que imita a parte da GitHub API usada pelo push (Git Data
+API + Contents API). Guarda o repositório em memória; cada tree é um dict
+caminho → sha do blob, e as subpastas viram trees próprias quando listadas.
+
+    server = FakeGitHub()          # já escutando em 127.0.0.1:<porta>
+    gr.GITHUB_API = server.url
+    ...
+    server.files()                 # arquivos na branch depois do push
+    server.close()
+
+`server.hook(method, path)` pode devolver (status, json, headers) para
+injetar uma resposta (rate limit, 5xx...) antes do comportamento normal.
+`server.truncate_after` corta a listagem recursiva como o GitHub faz com
+repositórios grandes; `server.delay` atrasa cada resposta.
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class FakeGitHub:
+    def __init__(self, repo: str = "owner/repo", branch: str = "main"):
+        self.repo    = repo
+        self.branch  = branch
+        self.blobs   = {}
+        self.trees   = {}     # sha → {caminho: sha do blob}
+        self.commits = {}     # sha → {"tree", "parents", "message"}
+        self.calls   = []     # (método, caminho sem /repos/<repo>/)
+        self.clients = set()  # conexões distintas (endereço do cliente)
+        self.hook    = lambda method, path: None
+        self.truncate_after = None
+        self.delay   = 0.0    # segundos de "latência" por requisição
+        self._lock   = threading.Lock()
+        self.ref     = self._commit(self._tree({}), [], "init")
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _any(self):
+                size = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(size)) if size else None
+                time.sleep(fake.delay)
+                with fake._lock:
+                    fake.clients.add(self.client_address)
+                    status, payload, headers = fake.handle(self.command, self.path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _any
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url   = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    # ── estado ───────────────────────────────────────────────────────────────
+    def _sha(self, obj) -> str:
+        return hashlib.sha1(json.dumps(obj, sort_keys=True).encode()).hexdigest()
+
+    def _tree(self, files: dict) -> str:
+        sha = self._sha(sorted(files.items()))
+        self.trees[sha] = dict(files)
+        return sha
+
+    def _commit(self, tree: str, parents: list, message: str) -> str:
+        sha = self._sha([tree, parents, message])
+        self.commits[sha] = {"tree": tree, "parents": parents, "message": message}
+        return sha
+
+    def files(self) -> dict:
+        """Arquivos na ponta da branch: caminho → conteúdo."""
+        tree = self.trees[self.commits[self.ref]["tree"]]
+        return {path: self.blobs[sha] for path, sha in tree.items()}
+
+    def put_files(self, files: dict):
+        """Cria um commit com estes arquivos (caminho → bytes) sobre a branch."""
+        tree = dict(self.trees[self.commits[self.ref]["tree"]])
+        for path, data in files.items():
+            self.blobs[blob_sha(data)] = data
+            tree[path] = blob_sha(data)
+        self.ref = self._commit(self._tree(tree), [self.ref], "seed")
+
+    def _listing(self, sha: str, recursive: bool) -> dict:
+        files = self.trees[sha]
+        if recursive:
+            entries = [{"path": p, "sha": s, "type": "blob", "mode": "100644"} for p, s in sorted(files.items())]
+            truncated = self.truncate_after is not None and len(entries) > self.truncate_after
+            return {"sha": sha, "tree": entries[:self.truncate_after] if truncated else entries,
+                    "truncated": truncated}
+        entries, subdirs = [], {}
+        for path, blob in sorted(files.items()):
+            name, sep, rest = path.partition("/")
+            if sep:
+                subdirs.setdefault(name, {})[rest] = blob
+            else:
+                entries.append({"path": name, "sha": blob, "type": "blob", "mode": "100644"})
+        entries += [{"path": name, "sha": self._tree(sub), "type": "tree", "mode": "040000"}
+                    for name, sub in subdirs.items()]
+        return {"sha": sha, "tree": entries, "truncated": False}
+
+    # ── rotas da API ─────────────────────────────────────────────────────────
+    def handle(self, method: str, url: str, body):
+        prefix = f"/repos/{self.repo}/"
+        if not url.startswith(prefix):
+            return 404, {"message": "Not Found"}, None
+        path = url[len(prefix):]
+        self.calls.append((method, path))
+        injected = self.hook(method, path)
+        if injected:
+            return injected
+        path, _, query = path.partition("?")
+
+        if method == "GET" and path == f"git/ref/heads/{self.branch}":
+            return 200, {"object": {"sha": self.ref}}, None
+        if method == "GET" and path.startswith("git/commits/"):
+            commit = self.commits.get(path.rsplit("/", 1)[1])
+            return (200, {"tree": {"sha": commit["tree"]}}, None) if commit else (404, {"message": "Not Found"}, None)
+        if method == "GET" and path.startswith("git/trees/"):
+            sha = path.rsplit("/", 1)[1]
+            if sha not in self.trees:
+                return 404, {"message": "Not Found"}, None
+            return 200, self._listing(sha, "recursive=1" in query), None
+        if method == "POST" and path == "git/blobs":
+            data = base64.b64decode(body["content"])
+            self.blobs[blob_sha(data)] = data
+            return 201, {"sha": blob_sha(data)}, None
+        if method == "POST" and path == "git/trees":
+            files = dict(self.trees[body["base_tree"]])
+            for entry in body["tree"]:
+                if entry["sha"] is None:
+                    files.pop(entry["path"], None)
+                else:
+                    files[entry["path"]] = entry["sha"]
+            return 201, {"sha": self._tree(files)}, None
+        if method == "POST" and path == "git/commits":
+            return 201, {"sha": self._commit(body["tree"], body["parents"], body["message"])}, None
+        if method == "PATCH" and path == f"git/refs/heads/{self.branch}":
+            self.ref = body["sha"]
+            return 200, {"object": {"sha": self.ref}}, None
+        if path.startswith("contents/"):
+            return self._contents(method, path[len("contents/"):], body)
+        return 404, {"message": f"Not Found: {method} {path}"}, None
+
+    def _contents(self, method: str, filepath: str, body):
+        tree = dict(self.trees[self.commits[self.ref]["tree"]])
+        if method == "GET":
+            if filepath not in tree:
+                return 404, {"message": "Not Found"}, None
+            return 200, {"sha": tree[filepath]}, None
+        if method == "PUT":
+            if filepath in tree and body.get("sha") != tree[filepath]:
+                return 409, {"message": "sha mismatch"}, None
+            data = base64.b64decode(body["content"])
+            self.blobs[blob_sha(data)] = data
+            tree[filepath] = blob_sha(data)
+            self.ref = self._commit(self._tree(tree), [self.ref], body["message"])
+            return 200, {"content": {"sha": blob_sha(data)}}, None
+        if method == "DELETE":
+            tree.pop(filepath, None)
+            self.ref = self._commit(self._tree(tree), [self.ref], body["message"])
+            return 200, {"commit": {}}, None
+        return 405, {"message": "Method Not Allowed"}, None
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
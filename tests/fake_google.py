@@ -0,0 +1,107 @@
+"""
+Servidor local com o pedaço das APIs do Google usado pelo SheetsSource:
+valores de uma aba (Sheets v4), a versão do arquivo (Drive v3) e a troca do
+JWT da service account por um token (server.token_uri).
+
+    server = FakeGoogle({"Routes": [["Origin", ...], ["Brazil", ...]]})
+    gr.SHEETS_API, gr.DRIVE_API = server.sheets_api, server.drive_api
+"""
+import json
+import re
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_A1 = re.compile(r"^(?:([A-Z]+)?(\d+)):(?:([A-Z]+)?(\d+))$")
+
+
+def _column(letters: str) -> int:
+    col = 0
+    for ch in letters:
+        col = col * 26 + ord(ch) - ord("A") + 1
+    return col
+
+
+def _trim(row: list) -> list:
+    while row and row[-1] == "":
+        row = row[:-1]
+    return row
+
+
+class FakeGoogle:
+    def __init__(self, sheets: dict, spreadsheet_id: str = "sheet-id", version: str = "1",
+                 token: str = "test-token"):
+        self.sheets     = sheets        # aba → linhas (listas de strings)
+        self.id         = spreadsheet_id
+        self.version    = version
+        self.token      = token
+        self.calls      = []            # caminhos decodificados
+        self.assertions = []            # JWTs recebidos em /token
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._reply(*fake.handle(self.path, self.headers.get("Authorization")))
+
+            def do_POST(self):
+                size = int(self.headers.get("Content-Length") or 0)
+                self._reply(*fake.grant(self.path, self.rfile.read(size).decode()))
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        base = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.sheets_api = base + "/v4"
+        self.drive_api  = base + "/drive/v3"
+        self.token_uri  = base + "/token"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def handle(self, url: str, auth: str | None):
+        path = urllib.parse.unquote(url.partition("?")[0])
+        self.calls.append(path)
+        if auth != f"Bearer {self.token}":
+            return 401, {"error": {"message": "unauthenticated"}}
+        if path == f"/drive/v3/files/{self.id}":
+            return 200, {"version": self.version, "modifiedTime": "2026-01-01T00:00:00Z"}
+        prefix = f"/v4/spreadsheets/{self.id}/values/"
+        if not path.startswith(prefix):
+            return 404, {"error": {"message": "not found"}}
+        sheet, _, cells = path[len(prefix):].rpartition("!")
+        if sheet.startswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+        rows = self.sheets.get(sheet)
+        m = _A1.match(cells)
+        if rows is None or not m:
+            return 400, {"error": {"message": f"bad range {path}"}}
+        c1, r1, c2, r2 = m.groups()
+        first, last = int(r1), int(r2)
+        left, right = _column(c1) if c1 else 1, _column(c2) if c2 else None
+        values = [row[left - 1:right] for row in rows[first - 1:last]]
+        # Como a API real: linhas vazias no fim e células vazias no fim da linha somem
+        values = [_trim(row) for row in values]
+        while values and not values[-1]:
+            values.pop()
+        return 200, {"range": path, "majorDimension": "ROWS", "values": values}
+
+    def grant(self, url: str, body: str):
+        """POST /token: JWT assinado da service account → access token."""
+        form = urllib.parse.parse_qs(body)
+        self.calls.append(url)
+        if url != "/token" or "assertion" not in form:
+            return 400, {"error": "invalid_grant"}
+        self.assertions.append(form["assertion"][0])
+        return 200, {"access_token": self.token, "expires_in": 3600, "token_type": "Bearer"}
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
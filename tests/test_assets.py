@@ -0,0 +1,126 @@
+"""assets/: CSS com hash, preflight purgado e fontes auto-hospedadas."""
+import pytest
+
+from conftest import gr, write, ROWS
+
+
+def test_cleanup_keeps_foreign_assets(site):
+    foreign = [write("assets/logo.png", "png"), write("assets/js/app.js", "js"),
+               write("assets/fonts/readme.txt", "txt")]
+    old = [write("assets/route.000000000000.css", "old"), write("assets/route.000000000000.css.gz", "old"),
+           write("assets/fonts/old-400.woff2", "old")]
+    manifest = gr.load_manifest()
+    gr.write_assets(manifest)
+
+    names = [gr.route_stylesheet()[0], gr.base_stylesheet()[0]]
+    assert all((site / "assets" / name).exists() for name in names)
+    assert all((site / path).exists() for path in foreign)
+    assert not any((site / path).exists() for path in old)
+    assert set(manifest["files"]) == {f"assets/{name}" for name in names}
+
+
+REPO_INDEX = gr.os.path.join(gr.os.path.dirname(gr.__file__), "index.html")
+
+
+def test_repo_index_links_current_home_preflight():
+    name, data = gr.home_stylesheet(REPO_INDEX)
+    assert gr.index_stylesheet_link(REPO_INDEX) == f"assets/{name}"
+    with open(gr.os.path.join(gr.os.path.dirname(REPO_INDEX), "assets", name), "rb") as f:
+        assert f.read() == data   # publicado junto com o index.html
+
+
+def test_home_preflight_is_an_asset_and_index_is_never_rewritten(site, capsys):
+    page = ('<html><head>\n  <link rel="stylesheet" href="assets/home.000000000000.css"/>\n</head>'
+            "<body><p>x</p><script>list.innerHTML = '<ul><li>a</li></ul>'</script></body></html>")
+    write("index.html", page)
+    write("assets/home.000000000000.css", "old")
+    write("assets/home.111111111111.css", "older")
+
+    gr.main(["render"])
+    with open("index.html", encoding="utf-8") as f:
+        assert f.read() == page
+    name, data = gr.home_stylesheet()
+    assert (site / "assets" / name).read_bytes() == data
+    assert b"ul{list-style:none;margin:0;padding:0}" in data and b"h1" not in data
+    # o arquivo para onde o index.html aponta fica até o <link> ser trocado
+    assert (site / "assets/home.000000000000.css").exists()
+    assert not (site / "assets/home.111111111111.css").exists()
+    assert f'href="assets/{name}"' in capsys.readouterr().out
+
+    write("index.html", page.replace("home.000000000000.css", name))
+    gr.main(["render"])
+    assert not (site / "assets/home.000000000000.css").exists()
+    assert "não aponta para o preflight" not in capsys.readouterr().out
+
+
+def test_route_pages_link_base_preflight(site):
+    gr.main(["render"])
+    name, data = gr.base_stylesheet()
+    html = (site / gr.route_file(gr.row_slug(ROWS[0]))).read_text(encoding="utf-8")
+    assert f'<link rel="stylesheet" href="../assets/{name}"/>' in html
+    assert "<style id=\"preflight\">" not in html and "cdn.tailwindcss.com" not in html
+    assert (site / "assets" / name).read_bytes() == data
+
+
+def test_google_fonts_fallback_does_not_block_render(site):
+    html = gr.fonts_fragment("route")
+    assert 'media="print" onload="this.media=\'all\'"' in html and "<noscript>" in html
+
+
+# ── Fontes auto-hospedadas ──────────────────────────────────────────────────
+def tiny_variable_font(path: str, family: str):
+    """TTF variável (eixo wght) mínimo, no lugar dos arquivos do google/fonts."""
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+    glyphs = [".notdef", "A", "B"]
+    pen = TTGlyphPen(None)
+    pen.moveTo((0, 0))
+    pen.lineTo((500, 0))
+    pen.lineTo((500, 700))
+    pen.closePath()
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyphs)
+    fb.setupCharacterMap({ord("A"): "A", ord("B"): "B"})
+    fb.setupGlyf({name: pen.glyph() for name in glyphs})
+    fb.setupHorizontalMetrics({name: (600, 0) for name in glyphs})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": family, "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost()
+    fb.setupFvar(axes=[("wght", 100, 400, 900, "Weight")], instances=[])
+    fb.save(path)
+
+
+def _clear_font_caches():
+    for fn in (gr._font_tools, gr.font_faces, gr.fonts_fragment, gr.template_fonts):
+        fn.cache_clear()
+
+
+@pytest.fixture
+def fonts(site, monkeypatch):
+    pytest.importorskip("fontTools")
+    pytest.importorskip("brotli")
+    (site / "fonts").mkdir()
+    for family, filename in gr.FONT_SOURCES.items():
+        tiny_variable_font(str(site / "fonts" / filename), family)
+    _clear_font_caches()
+    yield site
+    _clear_font_caches()
+
+
+def test_self_hosted_fonts(fonts):
+    faces = gr.font_faces()
+    assert {face.family for face in faces} == set(gr.FONT_SOURCES)
+    gr.main(["render"])
+
+    for face in faces:
+        assert (fonts / "assets/fonts" / face.name).read_bytes()[:4] == b"wOF2"
+    html = (fonts / gr.route_file(gr.row_slug(ROWS[0]))).read_text(encoding="utf-8")
+    assert "fonts.googleapis.com" not in html
+    critical = gr.template_fonts("route")[1]
+    for face in faces:
+        url = f"../assets/fonts/{face.name}"
+        assert f"src:url({url}) format('woff2')" in html
+        assert (f'<link rel="preload" href="{url}" as="font"' in html) == ((face.family, face.weight) in critical)
+    manifest = gr.load_manifest()
+    assert {f"assets/fonts/{face.name}" for face in faces} <= set(manifest["files"])
@@ -0,0 +1,10 @@
+"""bench_routes.py pipeline roda o build de verdade, mas nunca publica."""
+import bench_routes
+
+
+def test_pipeline_never_pushes(github):
+    report = bench_routes.bench_pipeline([30])
+    stages = {st["stage"] for st in report["30"]}
+    assert {"render", "routes_json", "sitemap", "total", "incremental"} <= stages
+    assert "push" not in stages
+    assert github.calls == []
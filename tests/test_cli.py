@@ -0,0 +1,38 @@
+"""Opções da linha de comando valem antes e depois do COMANDO."""
+import pytest
+
+from conftest import gr
+
+
+@pytest.mark.parametrize("argv, expected", [
+    ([],                                 {"source": "sheets", "jobs": 1, "snapshot": gr.SNAPSHOT_FILE}),
+    (["render"],                         {"source": "snapshot", "jobs": 1}),
+    (["index"],                          {"source": "snapshot"}),
+    (["-j", "4", "render"],              {"jobs": 4, "source": "snapshot"}),
+    (["render", "-j", "4"],              {"jobs": 4}),
+    (["-j", "4", "render", "-j", "2"],   {"jobs": 2}),
+    (["--source", "sheets", "render"],   {"source": "sheets"}),
+    (["--source", "sheets", "index"],    {"source": "sheets"}),
+    (["--no-minify", "--report", "r.json", "render"], {"minify": False, "report": "r.json"}),
+    (["--shard", "1/2", "render"],       {"shard": (1, 2)}),
+    (["--snapshot", "s.csv", "fetch"],   {"snapshot": "s.csv"}),
+    (["fetch"],                          {"snapshot": gr.SNAPSHOT_FILE}),
+])
+def test_options_before_or_after_command(argv, expected):
+    args = vars(gr.parse_args(argv))
+    assert {key: args[key] for key in expected} == expected
+
+
+@pytest.mark.parametrize("argv", [["render"], ["index"], ["--source", "snapshot"],
+                                  ["--watch", "1", "--source", "snapshot"]])
+def test_missing_snapshot_exits_cleanly(tmp_path, monkeypatch, argv):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit) as exc:
+        gr.main(argv)
+    assert str(exc.value) == f"❌ {gr.SNAPSHOT_FILE} não existe — rode o fetch antes (ou use --source sheets)."
+
+
+def test_missing_token_points_at_config(site, monkeypatch, capsys):
+    monkeypatch.setattr(gr, "GITHUB_TOKEN", "cole-seu-novo-token-aqui")
+    gr.push_all_to_github([])
+    assert "GITHUB_TOKEN nas CONFIGURAÇÕES de pet_routes.py" in capsys.readouterr().out
@@ -0,0 +1,98 @@
+"""GitHubClient contra o GitHub falso: novas tentativas, Retry-After e rate limit."""
+import time
+
+import pytest
+
+from conftest import gr
+
+COMMIT = {"tree": "t", "parents": [], "message": "m"}
+
+
+@pytest.fixture
+def client(github, monkeypatch):
+    monkeypatch.setattr(gr, "METRICS", gr.BuildMetrics())
+    sleeps = []
+    client = gr.GitHubClient(github.url, "test-token", sleep=sleeps.append)
+    client.sleeps = sleeps
+    yield client
+    client.close()
+
+
+def fail_first(github, n: int, status: int, headers=None, message="boom", path=None):
+    """Injeta `n` respostas de erro (na rota `path`, ou em todas) antes das normais."""
+    left = [n]
+
+    def hook(method, url):
+        if left[0] and (path is None or url.startswith(path)):
+            left[0] -= 1
+            return status, {"message": message}, headers
+    github.hook = hook
+
+
+def api(github, path: str) -> str:
+    return f"/repos/{github.repo}/{path}"
+
+
+def posts(github, path: str) -> int:
+    return sum(call == ("POST", path) for call in github.calls)
+
+
+def test_get_retries_5xx_with_backoff(github, client):
+    fail_first(github, 2, 502)
+    res = client.request("GET", api(github, f"git/ref/heads/{github.branch}"))
+    assert res["object"]["sha"] == github.ref
+    assert len(client.sleeps) == 2 and not client.take_failures()
+    assert gr.METRICS.counters["http.retries"] == 2
+
+
+def test_get_honours_retry_after_on_503(github, client):
+    fail_first(github, 1, 503, {"Retry-After": "7"})
+    client.request("GET", api(github, f"git/ref/heads/{github.branch}"))
+    assert client.sleeps == [7.0]
+
+
+def test_post_not_retried_on_503_with_retry_after(github, client):
+    fail_first(github, 1, 503, {"Retry-After": "1"})
+    res = client.request("POST", api(github, "git/commits"), COMMIT)
+    assert res["status"] == 503
+    assert posts(github, "git/commits") == 1
+    [(method, path, status, _)] = client.take_failures()
+    assert (method, status) == ("POST", 503)
+
+
+@pytest.mark.parametrize("status, headers, message", [
+    (429, {"Retry-After": "3"}, "Too Many Requests"),
+    (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 5)}, "API rate limit exceeded"),
+    (403, None, "You have exceeded a secondary rate limit."),
+])
+def test_post_retried_on_rate_limit(github, client, status, headers, message):
+    fail_first(github, 1, status, headers, message)
+    res = client.request("POST", api(github, "git/trees"),
+                         {"base_tree": github.commits[github.ref]["tree"], "tree": []})
+    assert "sha" in res and not client.take_failures()
+    assert posts(github, "git/trees") == 2
+    # Rate limit pausa o cliente todo: a espera vem de _wait_pause na tentativa seguinte
+    assert client._paused > time.time() + 1
+
+
+def test_forbidden_is_not_retried(github, client):
+    fail_first(github, 1, 403, None, "Resource not accessible by integration")
+    client.request("POST", api(github, "git/commits"), COMMIT)
+    assert posts(github, "git/commits") == 1 and not client.sleeps
+
+
+def test_rate_limit_beyond_max_wait_gives_up(github, client):
+    fail_first(github, 1, 429, {"Retry-After": str(gr.GITHUB_MAX_WAIT + 60)})
+    res = client.request("GET", api(github, f"git/ref/heads/{github.branch}"))
+    assert res["status"] == 429 and not client.sleeps
+
+
+def test_http_seconds_is_wall_time(github, client):
+    github.delay = 0.05
+    start = time.perf_counter()
+    client.map(lambda _: client.request("GET", api(github, f"git/ref/heads/{github.branch}")), range(16))
+    wall = time.perf_counter() - start
+    seconds = gr.METRICS.counters["http.seconds"]
+    assert seconds <= wall
+    assert seconds < 16 * github.delay / 2   # a soma das threads daria ~0.8 s
+    assert len(github.clients) <= client.concurrency
@@ -0,0 +1,61 @@
+"""Páginas em português: contrações com o artigo do país, UI_STRINGS em dia e robots.txt."""
+import re
+
+import pytest
+
+from conftest import gr
+
+
+def page(origin: str, destination: str, lang: str = "pt") -> str:
+    route = gr.parse_route({"Origin": origin, "Destination": destination, "Animal": "Dog",
+                            "Requirements (Breve)": "Microchip ISO · Rabies vaccine",
+                            "Detailed_Requirements": "", "Slug": ""})
+    return gr.generate_html(route, "https://a.example", "https://b.example", lang=lang)
+
+
+@pytest.mark.parametrize("raw, preposition, expected", [
+    ("USA", "de", "dos Estados Unidos"),
+    ("USA", "em", "nos Estados Unidos"),
+    ("Brazil", "de", "do Brasil"),
+    ("Spain", "para", "para a Espanha"),
+    ("Spain", "em", "na Espanha"),
+    ("Portugal", "em", "em Portugal"),
+    ("Atlantis", "de", "de Atlantis"),
+])
+def test_country_phrase(raw, preposition, expected):
+    assert gr.country_phrase(raw, "pt", preposition) == expected
+
+
+def test_portuguese_page_uses_contractions():
+    html = page("Brazil", "USA")
+    assert "<h1>Levando seu cachorro do Brasil para os Estados Unidos" in html
+    assert "para entrar nos Estados Unidos com um cachorro" in html
+    assert not re.search(r"\b(de|em|para) Estados Unidos", html)
+    assert "{" not in re.sub(r"<style>.*?</style>|<script.*?</script>", "", html, flags=re.S)
+
+
+def test_english_page_unchanged_by_portuguese_slots():
+    html = page("Brazil", "USA", lang=None)
+    assert "Bringing your dog from Brazil to USA" in html
+
+
+def test_every_ui_string_is_found():
+    for lang in gr.UI_STRINGS:
+        gr.localize(gr.PAGE_TEMPLATE, lang)   # não levanta
+
+
+def test_stale_ui_string_fails(monkeypatch):
+    strings = dict(gr.UI_STRINGS["pt"], **{"Text that is no longer in the template": "Texto"})
+    monkeypatch.setitem(gr.UI_STRINGS, "pt", strings)
+    with pytest.raises(ValueError, match="no longer in the template"):
+        gr.localize(gr.PAGE_TEMPLATE, "pt")
+
+
+def test_robots_lists_every_locale_sitemap(site):
+    written = gr.generate_sitemap(["brazil-to-usa-dog"])
+    assert "robots.txt" in written
+    with open("robots.txt", encoding="utf-8") as f:
+        robots = f.read()
+    for lang in gr.LOCALES:
+        name = "sitemap.xml" if lang == gr.DEFAULT_LOCALE else f"sitemap-{lang}.xml"
+        assert f"Sitemap: {gr.SITE_DOMAIN}/{name}\n" in robots
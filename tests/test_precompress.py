@@ -0,0 +1,56 @@
+"""Variantes .gz/.br das páginas acompanham o HTML entre builds."""
+import gzip
+import json
+
+from conftest import ROWS, gr, write_snapshot
+
+PAGE = "routes/brazil-to-portugal-dog.html"
+
+
+def manifest() -> dict:
+    with open(gr.BUILD_MANIFEST, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_rerender_refreshes_gz(site):
+    gr.main(["render", "--precompress"])
+    rows = [dict(ROWS[0], **{"Detailed_Requirements": "New paperwork"})] + ROWS[1:]
+    write_snapshot(rows)
+    gr.main(["render", "--precompress"])
+    with open(PAGE, "rb") as f, gzip.open(PAGE + ".gz") as gz:
+        assert gz.read() == f.read()
+
+
+def test_build_without_precompress_drops_variants(site):
+    gr.main(["render", "--precompress"])
+    assert (site / (PAGE + ".gz")).exists()
+
+    gr.main(["render"])
+    assert not list(site.glob("routes/**/*.gz")) and not list(site.glob("assets/*.gz"))
+    deleted = manifest()["deleted"]
+    assert PAGE + ".gz" in deleted
+    assert not [path for path in manifest()["files"] if path.endswith(".gz")]
+
+    # De volta ao --precompress: variantes regeradas, fora da lista de remoção e pendentes de push
+    gr.main(["render", "--precompress"])
+    state = manifest()
+    assert (site / (PAGE + ".gz")).exists()
+    assert not [path for path in state["deleted"] if path.endswith(".gz")]
+    assert state["routes"]["brazil-to-portugal-dog"]["published"] is None
+
+
+def test_hubs_follow_precompress(site):
+    gr.main(["render", "--precompress"])
+    hubs = sorted(site.glob(f"{gr.HUB_DIR}/*.html"))
+    assert hubs
+    state = manifest()
+    for hub in hubs:
+        with open(hub, "rb") as f, gzip.open(f"{hub}.gz") as gz:
+            assert gz.read() == f.read()
+        assert f"{gr.HUB_DIR}/{hub.name}.gz" in state["files"]
+
+    gr.main(["render"])
+    assert not list(site.glob(f"{gr.HUB_DIR}/*.gz")) and not list(site.glob(f"{gr.HUB_DIR}/*.br"))
+    state = manifest()
+    assert f"{gr.HUB_DIR}/{hubs[0].name}.gz" in state["deleted"]
+    assert not [path for path in state["files"] if path.startswith(gr.HUB_DIR) and path.endswith(".gz")]
@@ -0,0 +1,40 @@
+"""PreviewServer entrega só os arquivos do site."""
+import urllib.error
+import urllib.request
+
+import pytest
+
+from conftest import gr, write
+
+SITE = ["index.html", "routes.json", "robots.txt", "sitemap.xml", "sitemap-pt.xml", "sitemap-1.xml.gz",
+        "routes/a.html", "routes/pt/a.html", "countries/brazil.html",
+        "assets/route.abc.css", "assets/fonts/x.woff2", "search/brazil.json"]
+PRIVATE = ["service_account.json", ".build-manifest.json", "build-report.json", "snapshot.jsonl",
+           "generate_routes.py", "pet_routes.py", ".git/config", "routes/.hidden.html", "routes/creds.json",
+           "shards/part-1-of-2.jsonl", "fonts/Lato.ttf", "search/../service_account.json"]
+
+
+@pytest.fixture
+def preview(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for path in SITE + PRIVATE[:-1]:
+        write(path, path)
+    server = gr.PreviewServer(port=0, root=str(tmp_path))
+    yield server
+    server.close()
+
+
+def status(server, path: str) -> int:
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/{path}") as res:
+            return res.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_serves_site_files(preview):
+    assert {path: status(preview, path) for path in SITE + [""]} == {path: 200 for path in SITE + [""]}
+
+
+def test_refuses_everything_else(preview):
+    assert {path: status(preview, path) for path in PRIVATE} == {path: 404 for path in PRIVATE}
@@ -0,0 +1,93 @@
+"""Push via Git Data API contra o GitHub falso (tests/fake_github.py)."""
+import pytest
+
+from conftest import gr, write
+
+
+def blob_posts(server) -> int:
+    return sum(call == ("POST", "git/blobs") for call in server.calls)
+
+
+def test_publish_tree_one_commit_and_blob_dedup(github):
+    files = [(write(f"routes/r{i}.html", f"<p>{i}</p>"), f"routes/r{i}.html") for i in range(5)]
+    files.append((write("sitemap.xml", "<urlset/>"), "sitemap.xml"))
+    start = github.ref
+
+    assert gr.publish_tree(files, [], "primeiro") == []
+    assert github.files() == {repo: open(local, "rb").read() for local, repo in files}
+    assert github.commits[github.ref]["parents"] == [start]
+    assert blob_posts(github) == 6
+
+    # Só o arquivo alterado sobe de novo; o resto é reconhecido pelo sha do blob
+    write("routes/r0.html", "<p>novo</p>")
+    github.calls.clear()
+    assert gr.publish_tree(files, [], "segundo") == []
+    assert blob_posts(github) == 1
+    assert github.files()["routes/r0.html"] == b"<p>novo</p>"
+
+    # Nada mudou: nenhum commit novo
+    ref = github.ref
+    assert gr.publish_tree(files, [], "terceiro") == []
+    assert github.ref == ref
+
+
+def test_publish_tree_deletes(github):
+    github.put_files({"routes/old.html": b"old", "routes/keep.html": b"keep"})
+    settled = gr.publish_tree([], ["routes/old.html", "routes/never.html"], "remove")
+    assert sorted(settled) == ["routes/never.html", "routes/old.html"]
+    assert set(github.files()) == {"routes/keep.html"}
+
+
+def test_truncated_tree_walks_directories(github):
+    github.put_files({f"routes/r{i:03}.html": b"x" for i in range(50)})
+    github.put_files({"routes/pt/zz.html": b"pt", "zz/last.html": b"z"})
+    github.truncate_after = 10   # listagem recursiva cobre só routes/r000..r009
+
+    local = write("routes/r040.html", "x")   # igual ao remoto: não deve subir
+    settled = gr.publish_tree([(local, "routes/r040.html")],
+                              ["routes/r045.html", "routes/pt/zz.html", "routes/gone.html"], "trunc")
+    assert sorted(settled) == ["routes/gone.html", "routes/pt/zz.html", "routes/r045.html"]
+    assert blob_posts(github) == 0
+    remote = github.files()
+    assert "routes/r045.html" not in remote and "routes/pt/zz.html" not in remote
+    assert "routes/r044.html" in remote
+
+
+def test_unconfirmed_deletions_stay_pending(github, monkeypatch):
+    github.put_files({f"routes/r{i:03}.html": b"x" for i in range(20)})
+    github.truncate_after = 5
+    # A listagem da pasta também falha: a remoção não pode ser confirmada
+    monkeypatch.setattr(gr, "_remote_dirs", lambda base, dirs: ({}, set()))
+    manifest = {"version": gr.MANIFEST_VERSION, "routes": {}, "files": {},
+                "deleted": ["routes/r015.html"]}
+    gr.push_all_to_github([], manifest)
+    assert manifest["deleted"] == ["routes/r015.html"]
+    assert "routes/r015.html" in github.files()
+
+
+def test_push_all_marks_published_and_clears_deleted(github):
+    github.put_files({"routes/gone.html": b"bye"})
+    write("routes.json", "[]")
+    manifest = {"version": gr.MANIFEST_VERSION, "routes": {}, "files": {}, "deleted": ["routes/gone.html"]}
+    gr.record_file(manifest, "routes.json")
+    gr.push_all_to_github([], manifest)
+    assert manifest["files"]["routes.json"]["published"] == manifest["files"]["routes.json"]["hash"]
+    assert manifest["deleted"] == []
+    assert set(github.files()) == {"routes.json"}
+
+
+@pytest.mark.parametrize("failing", ["git/ref/", "git/commits/", "git/trees/"])
+def test_failed_remote_read_aborts_push(github, monkeypatch, failing):
+    # 503 em toda leitura de ref/commit/tree (sem esperar o backoff)
+    monkeypatch.setattr(gr.github_client(), "sleep", lambda seconds: None)
+    github.hook = lambda method, path: (503, {"message": "down"}, None) if path.startswith(failing) else None
+    write("routes.json", "[]")
+    manifest = {"version": gr.MANIFEST_VERSION, "routes": {}, "files": {}, "deleted": ["routes/gone.html"]}
+    gr.record_file(manifest, "routes.json")
+    start = github.ref
+
+    assert gr.publish_tree([("routes.json", "routes.json")], [], "falha") is None
+    gr.push_all_to_github([], manifest)
+    assert manifest["files"]["routes.json"]["published"] != manifest["files"]["routes.json"]["hash"]
+    assert manifest["deleted"] == ["routes/gone.html"]
+    assert github.ref == start
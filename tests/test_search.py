@@ -0,0 +1,34 @@
+"""Índice de busca da home: um shard por origem e um por destino."""
+import json
+
+from conftest import ROWS, gr, write_snapshot
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_destination_shards_answer_any_origin(site):
+    gr.main(["index"])
+    index = load(f"{gr.SEARCH_DIR}/index.json")
+    assert [d["name"] for d in index["destinations"]] == ["Brazil", "Portugal", "USA"]
+
+    usa = next(d for d in index["destinations"] if d["name"] == "USA")
+    assert usa["shard"] == f"{gr.SEARCH_DIR}/{gr.SEARCH_TO_DIR}/usa.json" and usa["count"] == 1
+    shard = load(usa["shard"])
+    assert shard["destination"] == "USA"
+    assert shard["routes"] == [["brazil-to-usa-cat", "Brazil", "Cat", gr.get_flag("Brazil"),
+                                "Microchip ISO · Rabies 28+ days"]]
+
+    files = load(gr.BUILD_MANIFEST)["files"]
+    assert all(d["shard"] in files for d in index["destinations"])
+
+
+def test_stale_destination_shard_removed(site):
+    gr.main(["index"])
+    write_snapshot(ROWS[:1] + ROWS[2:])   # USA sai da planilha
+    gr.main(["index"])
+    path = f"{gr.SEARCH_DIR}/{gr.SEARCH_TO_DIR}/usa.json"
+    assert not (site / path).exists()
+    assert path in load(gr.BUILD_MANIFEST)["deleted"]
@@ -0,0 +1,119 @@
+"""SheetsSource contra o stub local das APIs do Sheets/Drive, e snapshots dela."""
+import json
+import sys
+
+import pytest
+
+from conftest import gr
+from fake_google import FakeGoogle
+
+HEADER = ["Origin", "Destination", "Animal", "Requirements (Breve)", "Price", "Slug"]
+ROWS = [
+    ["Brazil", "Portugal", "Dog", "Microchip", "12", ""],
+    ["Brazil", "USA", "Cat", "Rabies", "1.5", "custom-slug"],
+    ["UK", "Spain", "Dog", "", "", ""],
+    ["UK", "France", "Dog", "EU passport", "abc", ""],
+    ["India", "UK", "Dog", "Titre", "3", ""],
+]
+
+
+@pytest.fixture
+def google(monkeypatch):
+    server = FakeGoogle({"Routes 'v2'": [HEADER] + ROWS})
+    monkeypatch.setattr(gr, "SHEETS_API", server.sheets_api)
+    monkeypatch.setattr(gr, "DRIVE_API", server.drive_api)
+    monkeypatch.setenv("GOOGLE_ACCESS_TOKEN", server.token)
+    yield server
+    server.close()
+
+
+def source(google, page_rows: int = 2) -> gr.SheetsSource:
+    return gr.SheetsSource(google.id, "Routes 'v2'", "unused.json", page_rows)
+
+
+def test_rows_paged_like_get_all_records(google):
+    rows = source(google).rows()
+    assert [row["Origin"] for row in rows] == ["Brazil", "Brazil", "UK", "UK", "India"]
+    assert rows[0]["Price"] == 12 and rows[1]["Price"] == 1.5 and rows[3]["Price"] == "abc"
+    assert rows[2] == dict(zip(HEADER, ["UK", "Spain", "Dog", "", "", ""]))
+    # cabeçalho + 3 páginas de 2 linhas + a página vazia que encerra a leitura
+    assert len([call for call in google.calls if "/values/" in call]) == 5
+    assert google.calls[1].endswith("!A2:F3")
+
+
+def test_exact_multiple_of_page_reads_one_empty_page(google):
+    assert len(source(google, page_rows=5).rows()) == 5
+    assert google.calls[-1].endswith("!A7:F11")
+
+
+def test_blank_gap_across_page_boundary(monkeypatch):
+    # Linhas 4–6 em branco: a página A2:F4 volta curta (a API corta o branco
+    # do fim); nem as linhas depois do trecho em branco nem o próprio branco
+    # podem sumir (como no get_all_records)
+    rows = ROWS[:2] + [[""] * 6] * 3 + ROWS[2:]
+    server = FakeGoogle({"Routes": [HEADER] + rows})
+    monkeypatch.setattr(gr, "SHEETS_API", server.sheets_api)
+    monkeypatch.setenv("GOOGLE_ACCESS_TOKEN", server.token)
+    try:
+        got = gr.SheetsSource(server.id, "Routes", "unused.json", page_rows=3).rows()
+    finally:
+        server.close()
+    assert [row["Origin"] for row in got] == ["Brazil", "Brazil", "", "", "", "UK", "UK", "India"]
+
+
+def test_service_account_token_without_requests(google, monkeypatch, tmp_path):
+    pytest.importorskip("google.oauth2.service_account")
+    rsa = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.rsa")
+    from cryptography.hazmat.primitives import serialization
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode()
+    account = tmp_path / "service_account.json"
+    account.write_text(json.dumps({
+        "type": "service_account", "project_id": "p", "private_key_id": "k", "private_key": pem,
+        "client_email": "bot@p.iam.gserviceaccount.com", "client_id": "1",
+        "token_uri": google.token_uri,
+    }))
+    monkeypatch.delenv("GOOGLE_ACCESS_TOKEN")
+    # O transporte do google-auth baseado em requests não pode ser usado
+    monkeypatch.setitem(sys.modules, "requests", None)
+
+    src = gr.SheetsSource(google.id, "Routes 'v2'", str(account))
+    assert len(src.rows()) == 5
+    assert len(google.assertions) == 1   # token reaproveitado entre as páginas
+
+
+def test_version_from_drive(google):
+    google.version = "42"
+    assert source(google).version() == "42"
+
+
+@pytest.mark.parametrize("ext", ["csv", "jsonl"])
+def test_snapshot_rows_hash_like_sheet(google, tmp_path, ext):
+    sheet_rows = source(google).rows()
+    path = str(tmp_path / f"snapshot.{ext}")
+    revision = gr.save_snapshot(source(google).iter_rows(), path)
+
+    snap = gr.SnapshotSource(path)
+    assert snap.rows() == sheet_rows
+    assert [gr.row_hash(r) for r in snap.rows()] == [gr.row_hash(r) for r in sheet_rows]
+    assert gr.rows_revision(snap.rows()) == revision
+
+
+def test_numericise():
+    values = ["12", "-3", "1.5", " 7", "", "abc", "12 kg", "1_000", "nan", "Infinity", 4]
+    assert list(map(gr.numericise, values)) == [12, -3, 1.5, 7, "", "abc", "12 kg", "1_000", "nan", "Infinity", 4]
+
+
+@pytest.mark.parametrize("ext", ["csv", "jsonl"])
+def test_snapshot_revision_before_reading(google, tmp_path, ext):
+    path = str(tmp_path / f"snapshot.{ext}")
+    revision = gr.save_snapshot(source(google).iter_rows(), path)
+
+    snap = gr.SnapshotSource(path)
+    assert snap.describe() == f"snapshot {path} (revisão {revision})"
+    assert snap.version() == revision
+
+
+def test_a1_column():
+    assert [gr._a1_column(n) for n in (1, 26, 27, 52, 703)] == ["A", "Z", "AA", "AZ", "AAA"]
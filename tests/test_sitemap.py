@@ -0,0 +1,37 @@
+"""lastmod da home no sitemap vem do hash do index.html guardado no manifesto."""
+import json
+import os
+import re
+from datetime import date
+
+from conftest import gr, write
+
+
+def home_lastmod() -> str:
+    with open("sitemap.xml", encoding="utf-8") as f:
+        return re.search(r"<loc>[^<]*/</loc>\s*<lastmod>([^<]+)</lastmod>", f.read()).group(1)
+
+
+def set_home_lastmod(value: str):
+    with open(gr.BUILD_MANIFEST, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["home"]["lastmod"] = value
+    with open(gr.BUILD_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def test_home_lastmod_follows_content_not_mtime(site):
+    write("index.html", "<html><body><h1>Home</h1></body></html>")
+    gr.main(["--source", "snapshot"])
+    assert home_lastmod() == date.today().isoformat()
+
+    set_home_lastmod("2020-01-01")
+    os.utime("index.html")   # checkout/touch: mesmo conteúdo, mtime novo
+    gr.main(["--source", "snapshot"])
+    assert home_lastmod() == "2020-01-01"
+    gr.main(["sitemap"])
+    assert home_lastmod() == "2020-01-01"
+
+    write("index.html", "<html><body><h1>Home v2</h1></body></html>")
+    gr.main(["--source", "snapshot"])
+    assert home_lastmod() == date.today().isoformat()